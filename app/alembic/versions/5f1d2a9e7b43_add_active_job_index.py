@@ -0,0 +1,32 @@
+"""add active job index
+
+Revision ID: 5f1d2a9e7b43
+Revises: c27138a33d2c
+Create Date: 2026-10-18 11:02:51.504118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1d2a9e7b43'
+down_revision: Union[str, None] = 'c27138a33d2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_job_sotw_id_job_type_active',
+        'job',
+        ['sotw_id', 'job_type'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_sotw_id_job_type_active', table_name='job')
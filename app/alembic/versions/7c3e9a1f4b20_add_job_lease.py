@@ -0,0 +1,26 @@
+"""add job lease
+
+Revision ID: 7c3e9a1f4b20
+Revises: b83f5c1e6a27
+Create Date: 2026-10-18 18:21:37.604915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a1f4b20'
+down_revision: Union[str, None] = 'b83f5c1e6a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('lease', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('job', 'lease')
@@ -0,0 +1,28 @@
+"""add spotify token expiry to user
+
+Revision ID: a4c8e61f02d9
+Revises: 5f1d2a9e7b43
+Create Date: 2026-10-18 11:40:13.882610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c8e61f02d9'
+down_revision: Union[str, None] = '5f1d2a9e7b43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('spotify_accessed_date', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('user', sa.Column('spotify_token_expires_in', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'spotify_token_expires_in')
+    op.drop_column('user', 'spotify_accessed_date')
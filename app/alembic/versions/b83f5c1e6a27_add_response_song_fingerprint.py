@@ -0,0 +1,64 @@
+"""add response song fingerprint
+
+Revision ID: b83f5c1e6a27
+Revises: e2b7d4a9c153
+Create Date: 2026-10-18 16:12:48.507219
+
+"""
+import re
+from typing import Sequence, Union
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83f5c1e6a27'
+down_revision: Union[str, None] = 'e2b7d4a9c153'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _get_song_fingerprint(name: str) -> str:
+    # frozen copy of app.shared.utils.get_song_fingerprint as of this revision, so replaying the migration
+    # always stores the same fingerprints
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    words = re.sub(r"[^\w]+", " ", stripped.casefold().replace("&", " and "))
+    return " ".join(words.split())
+
+
+def upgrade() -> None:
+    op.add_column('response', sa.Column('next_song_spotify_id', sa.String(), nullable=True))
+    op.add_column('response', sa.Column('next_song_fingerprint', sa.String(), nullable=True))
+
+    # index the songs of the responses already submitted
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text(
+            "SELECT response.id, song.spotify_id, song.name FROM response "
+            "JOIN song ON song.id = response.next_song_id"
+        )
+    ).all()
+    if rows:
+        connection.execute(
+            sa.text(
+                "UPDATE response SET next_song_spotify_id = :spotify_id, "
+                "next_song_fingerprint = :fingerprint WHERE id = :id"
+            ),
+            [
+                {"id": id, "spotify_id": spotify_id, "fingerprint": _get_song_fingerprint(name)}
+                for id, spotify_id, name in rows
+            ],
+        )
+
+    op.create_index('ix_response_sotw_id_next_song_spotify_id', 'response', ['sotw_id', 'next_song_spotify_id'])
+    op.create_index('ix_response_sotw_id_next_song_fingerprint', 'response', ['sotw_id', 'next_song_fingerprint'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_response_sotw_id_next_song_fingerprint', table_name='response')
+    op.drop_index('ix_response_sotw_id_next_song_spotify_id', table_name='response')
+    op.drop_column('response', 'next_song_fingerprint')
+    op.drop_column('response', 'next_song_spotify_id')
@@ -0,0 +1,49 @@
+"""create job table
+
+Revision ID: c27138a33d2c
+Revises: 3cdc47c4eb91
+Create Date: 2026-10-18 10:12:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27138a33d2c'
+down_revision: Union[str, None] = '3cdc47c4eb91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_type', sa.String(), nullable=False),
+    sa.Column('sotw_id', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['sotw_id'], ['sotw.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # schedule the rollover of every sotw's current week
+    op.execute(
+        """
+        INSERT INTO job (job_type, sotw_id, run_at, status, attempts, created_at, updated_at)
+        SELECT 'week_rollover', week.sotw_id, week.next_results_release, 'pending', 0, now(), now()
+        FROM week
+        WHERE week.week_num = (
+            SELECT max(current_week.week_num) FROM week AS current_week WHERE current_week.sotw_id = week.sotw_id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job')
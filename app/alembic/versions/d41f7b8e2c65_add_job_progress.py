@@ -0,0 +1,26 @@
+"""add job progress
+
+Revision ID: d41f7b8e2c65
+Revises: 7c3e9a1f4b20
+Create Date: 2026-10-18 19:04:12.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7b8e2c65'
+down_revision: Union[str, None] = '7c3e9a1f4b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job', sa.Column('progress', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('job', 'progress')
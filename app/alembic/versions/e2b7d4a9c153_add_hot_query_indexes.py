@@ -0,0 +1,40 @@
+"""add hot query indexes
+
+Revision ID: e2b7d4a9c153
+Revises: a4c8e61f02d9
+Create Date: 2026-10-18 13:05:27.310944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7d4a9c153'
+down_revision: Union[str, None] = 'a4c8e61f02d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_unique_constraint('uq_week_sotw_id_week_num', 'week', ['sotw_id', 'week_num'])
+    op.create_index('ix_response_week_id_sotw_id_submitter_id', 'response', ['week_id', 'sotw_id', 'submitter_id'])
+    op.create_index('ix_response_submitter_id', 'response', ['submitter_id'])
+    op.create_index('ix_response_next_song_id', 'response', ['next_song_id'])
+    op.create_index('ix_userplaylist_user_id_sotw_id', 'userplaylist', ['user_id', 'sotw_id'])
+    op.create_index('ix_results_week_id_sotw_id', 'results', ['week_id', 'sotw_id'])
+    op.create_index('ix_user_email', 'user', ['email'])
+    op.create_index('ix_song_name', 'song', ['name'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_song_name', table_name='song')
+    op.drop_index('ix_user_email', table_name='user')
+    op.drop_index('ix_results_week_id_sotw_id', table_name='results')
+    op.drop_index('ix_userplaylist_user_id_sotw_id', table_name='userplaylist')
+    op.drop_index('ix_response_next_song_id', table_name='response')
+    op.drop_index('ix_response_submitter_id', table_name='response')
+    op.drop_index('ix_response_week_id_sotw_id_submitter_id', table_name='response')
+    op.drop_constraint('uq_week_sotw_id_week_num', 'week', type_='unique')
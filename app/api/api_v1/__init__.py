@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from app.api.api_v1.endpoints import admin
 from app.api.api_v1.endpoints import auth
 from app.api.api_v1.endpoints import user
 from app.api.api_v1.endpoints import sotw
@@ -15,3 +16,4 @@ api_router.include_router(sotw.router, prefix="/sotw", tags=["sotw"])
 api_router.include_router(week.router, prefix="/week", tags=["week"])
 api_router.include_router(response.router, prefix="/response", tags=["response"])
 api_router.include_router(results.router, prefix="/results", tags=["results"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,135 @@
+from typing import Dict
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.api import deps
+from app.clients.http import http_client_metrics
+from app.clients.rate_limit import spotify_rate_limiter
+from app.core.scheduler import retry_failed_rollover
+from app.db.pool import get_pool_status
+from app.db.session import async_engine
+from app.db.session import engine
+from app.models.user import User
+
+
+router = APIRouter()
+
+
+@router.get("/db-pool", status_code=200)
+async def get_db_pool(
+    *,
+    current_user: User = Depends(deps.get_current_user),
+) -> Dict:
+    """
+    Report the state and usage of the database connection pools.
+
+    Args:
+        current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
+
+    Raises:
+        HTTPException: 403 for users who are not superusers.
+
+    Returns:
+        Dict: The pool status of the synchronous and asynchronous engines.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail=f"Not authorized.")
+
+    return {
+        "sync": get_pool_status(engine),
+        "async": get_pool_status(async_engine),
+    }
+
+
+@router.get("/spotify-rate-limit", status_code=200)
+async def get_spotify_rate_limit(
+    *,
+    current_user: User = Depends(deps.get_current_user),
+) -> Dict:
+    """
+    Report how the requests to the spotify api are being paced.
+
+    Args:
+        current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
+
+    Raises:
+        HTTPException: 403 for users who are not superusers.
+
+    Returns:
+        Dict: The number of queued requests, delayed requests, 429s received and retries.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail=f"Not authorized.")
+
+    return spotify_rate_limiter.snapshot()
+
+
+@router.get("/http-client", status_code=200)
+async def get_http_client_metrics(
+    *,
+    current_user: User = Depends(deps.get_current_user),
+) -> Dict:
+    """
+    Report how many requests the shared HTTP clients sent and how many reused a kept-alive connection.
+
+    Args:
+        current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
+
+    Raises:
+        HTTPException: 403 for users who are not superusers.
+
+    Returns:
+        Dict: The number of requests sent, connections opened and connections reused.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail=f"Not authorized.")
+
+    return http_client_metrics.snapshot()
+
+
+@router.post("/sotw/{sotw_id}/rollover", status_code=202, response_model=schemas.Job)
+async def retry_rollover(
+    session: AsyncSession = Depends(deps.get_async_session),
+    *,
+    sotw_id: int,
+    current_user: User = Depends(deps.get_current_user),
+) -> schemas.Job:
+    """
+    Retry the rollover of a sotw's current week after the scheduler gave up on it.
+
+    Args:
+        sotw_id (int): ID of the sotw to roll over.
+        current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
+
+    Raises:
+        HTTPException: 403 for users who are not superusers.
+        HTTPException: 409 when the sotw's latest rollover did not fail.
+
+    Returns:
+        schemas.Job: The rollover job that was scheduled.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail=f"Not authorized.")
+
+    job = await session.run_sync(
+        lambda sync_session: retry_failed_rollover(sync_session, sotw_id)
+    )
+    if job is None:
+        raise HTTPException(
+            status_code=409,
+            detail=f"The rollover of sotw with id {sotw_id} has not failed.",
+        )
+
+    return schemas.Job(
+        id=str(job.id),
+        job_type=job.job_type,
+        sotw_id=str(job.sotw_id),
+        run_at=job.run_at,
+        status=job.status,
+        attempts=job.attempts,
+        last_error=job.last_error,
+    )
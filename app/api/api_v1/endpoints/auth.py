@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 from typing import Any, Dict, Union
 from jose import JWTError, jwt
@@ -10,9 +10,10 @@ from sqlalchemy.orm.session import Session
 from app import crud
 from app import schemas
 from app.api import deps
+from app.api.serializers import serialize_user
 
 from app.clients.email import EmailClient
-from app.clients.spotify import SpotifyClient
+from app.clients.spotify import AsyncSpotifyClient
 from app.core.auth import authenticate
 from app.core.auth import create_access_token
 from app.models.user import User
@@ -61,38 +62,7 @@ async def login(
         secure=cfg.COOKIE_SECURE_SETTING,
     )
 
-    return schemas.User(
-        id=str(user.id),
-        email=user.email,
-        name=user.name,
-        is_superuser=user.is_superuser,
-        spotify_linked=user.spotify_linked,
-        playlists=[
-            schemas.UserPlaylist(
-                id=str(playlist.id),
-                playlist_id=playlist.playlist_id,
-                playlist_link=playlist.playlist_link,
-                sotw_id=str(playlist.sotw_id),
-                user_id=str(playlist.user_id),
-            )
-            for playlist in user.playlists
-        ],
-        sotw_list=[
-            schemas.Sotw(
-                created_at=sotw.created_at,
-                id=str(sotw.id),
-                master_playlist_id=sotw.master_playlist_id,
-                master_playlist_link=sotw.master_playlist_link,
-                name=sotw.name,
-                owner_id=str(sotw.owner_id),
-                results_datetime=sotw.results_datetime,
-                results_timezone=sotw.results_timezone,
-                soty_playlist_id=sotw.soty_playlist_id,
-                soty_playlist_link=sotw.soty_playlist_link,
-            )
-            for sotw in user.sotw_list
-        ],
-    )
+    return serialize_user(user)
 
 
 @router.get("/logout")
@@ -112,49 +82,18 @@ async def logout(*, response: Response) -> Dict:
 
 @router.get("/current_user", response_model=schemas.User)
 async def get_current_user(
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_with_memberships),
 ) -> schemas.User:
     """
     Fetch the currently logged in user.
 
     Args:
-        current_user (User, optional): A dependency to get the authenticated user. Defaults to Depends(deps.get_current_user).
+        current_user (User, optional): A dependency to get the authenticated user. Defaults to Depends(deps.get_current_user_with_memberships).
 
     Returns:
         schemas.User: The currently logged in user
     """
-    return schemas.User(
-        id=str(current_user.id),
-        email=current_user.email,
-        name=current_user.name,
-        is_superuser=current_user.is_superuser,
-        spotify_linked=current_user.spotify_linked,
-        playlists=[
-            schemas.UserPlaylist(
-                id=str(playlist.id),
-                playlist_id=playlist.playlist_id,
-                playlist_link=playlist.playlist_link,
-                sotw_id=str(playlist.sotw_id),
-                user_id=str(playlist.user_id),
-            )
-            for playlist in current_user.playlists
-        ],
-        sotw_list=[
-            schemas.Sotw(
-                created_at=sotw.created_at,
-                id=str(sotw.id),
-                master_playlist_id=sotw.master_playlist_id,
-                master_playlist_link=sotw.master_playlist_link,
-                name=sotw.name,
-                owner_id=str(sotw.owner_id),
-                results_datetime=sotw.results_datetime,
-                results_timezone=sotw.results_timezone,
-                soty_playlist_id=sotw.soty_playlist_id,
-                soty_playlist_link=sotw.soty_playlist_link,
-            )
-            for sotw in current_user.sotw_list
-        ],
-    )
+    return serialize_user(current_user)
 
 
 @router.post("/register", status_code=200, response_model=Union[Any, schemas.User])
@@ -212,38 +151,7 @@ async def register(
         secure=cfg.COOKIE_SECURE_SETTING,
     )
 
-    return schemas.User(
-        id=str(user.id),
-        email=user.email,
-        name=user.name,
-        is_superuser=user.is_superuser,
-        spotify_linked=user.spotify_linked,
-        playlists=[
-            schemas.UserPlaylist(
-                id=str(playlist.id),
-                playlist_id=playlist.playlist_id,
-                playlist_link=playlist.playlist_link,
-                sotw_id=str(playlist.sotw_id),
-                user_id=str(playlist.user_id),
-            )
-            for playlist in user.playlists
-        ],
-        sotw_list=[
-            schemas.Sotw(
-                created_at=sotw.created_at,
-                id=str(sotw.id),
-                master_playlist_id=sotw.master_playlist_id,
-                master_playlist_link=sotw.master_playlist_link,
-                name=sotw.name,
-                owner_id=str(sotw.owner_id),
-                results_datetime=sotw.results_datetime,
-                results_timezone=sotw.results_timezone,
-                soty_playlist_id=sotw.soty_playlist_id,
-                soty_playlist_link=sotw.soty_playlist_link,
-            )
-            for sotw in user.sotw_list
-        ],
-    )
+    return serialize_user(user)
 
 
 @router.get(
@@ -293,38 +201,7 @@ async def verify(
         secure=cfg.COOKIE_SECURE_SETTING,
     )
 
-    return schemas.User(
-        id=str(user.id),
-        email=user.email,
-        name=user.name,
-        is_superuser=user.is_superuser,
-        spotify_linked=user.spotify_linked,
-        playlists=[
-            schemas.UserPlaylist(
-                id=str(playlist.id),
-                playlist_id=playlist.playlist_id,
-                playlist_link=playlist.playlist_link,
-                sotw_id=str(playlist.sotw_id),
-                user_id=str(playlist.user_id),
-            )
-            for playlist in user.playlists
-        ],
-        sotw_list=[
-            schemas.Sotw(
-                created_at=sotw.created_at,
-                id=str(sotw.id),
-                master_playlist_id=sotw.master_playlist_id,
-                master_playlist_link=sotw.master_playlist_link,
-                name=sotw.name,
-                owner_id=str(sotw.owner_id),
-                results_datetime=sotw.results_datetime,
-                results_timezone=sotw.results_timezone,
-                soty_playlist_id=sotw.soty_playlist_id,
-                soty_playlist_link=sotw.soty_playlist_link,
-            )
-            for sotw in user.sotw_list
-        ],
-    )
+    return serialize_user(user)
 
 
 @router.get("/spotify-client-id")
@@ -343,8 +220,8 @@ async def spotify_client_id() -> Dict:
 async def spotify_access_token(
     session: Session = Depends(deps.get_session),
     *,
-    current_user: User = Depends(deps.get_current_user),
-    spotify_client: SpotifyClient = Depends(deps.get_spotify_client),
+    current_user: User = Depends(deps.get_current_user_with_memberships),
+    spotify_client: AsyncSpotifyClient = Depends(deps.get_async_spotify_client),
     payload: schemas.UserSpotifyAuth,
 ) -> schemas.User:
     """
@@ -353,8 +230,8 @@ async def spotify_access_token(
     Args:
         payload (schemas.UserSpotifyAuth): A payload with the authorization code for spotify for the user.
         session (Session, optional): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
-        current_user (User, optional): The currently logged in user making the request. Defaults to Depends(deps.get_current_user).
-        spotify_client (SpotifyClient, optional): Client for Spotify interactions. Defaults to Depends(deps.get_spotify_client).
+        current_user (User, optional): The currently logged in user making the request. Defaults to Depends(deps.get_current_user_with_memberships).
+        spotify_client (AsyncSpotifyClient, optional): Client for Spotify interactions. Defaults to Depends(deps.get_async_spotify_client).
 
     Raises:
         HTTPException: 401 if the request body state does not match the current user's info
@@ -374,50 +251,20 @@ async def spotify_access_token(
         )
 
     if payload.code:
-        access_token, refresh_token, spotify_user_id = (
-            spotify_client.get_access_refresh_tokens(payload.code)
+        access_token, refresh_token, spotify_user_id, expires_in = (
+            await spotify_client.get_access_refresh_tokens(payload.code)
         )
         object_in = schemas.UserUpdate(
             spotify_linked=True,
             spotify_access_token=access_token,
             spotify_refresh_token=refresh_token,
             spotify_user_id=spotify_user_id,
-            spotify_accessed_date=datetime.utcnow(),
+            spotify_accessed_date=datetime.now(timezone.utc),
+            spotify_token_expires_in=expires_in,
         )
 
         current_user = crud.user.update(
             session=session, db_object=current_user, object_in=object_in
         )
 
-    return schemas.User(
-        id=str(current_user.id),
-        email=current_user.email,
-        name=current_user.name,
-        is_superuser=current_user.is_superuser,
-        spotify_linked=current_user.spotify_linked,
-        playlists=[
-            schemas.UserPlaylist(
-                id=str(playlist.id),
-                playlist_id=playlist.playlist_id,
-                playlist_link=playlist.playlist_link,
-                sotw_id=str(playlist.sotw_id),
-                user_id=str(playlist.user_id),
-            )
-            for playlist in current_user.playlists
-        ],
-        sotw_list=[
-            schemas.Sotw(
-                created_at=sotw.created_at,
-                id=str(sotw.id),
-                master_playlist_id=sotw.master_playlist_id,
-                master_playlist_link=sotw.master_playlist_link,
-                name=sotw.name,
-                owner_id=str(sotw.owner_id),
-                results_datetime=sotw.results_datetime,
-                results_timezone=sotw.results_timezone,
-                soty_playlist_id=sotw.soty_playlist_id,
-                soty_playlist_link=sotw.soty_playlist_link,
-            )
-            for sotw in current_user.sotw_list
-        ],
-    )
+    return serialize_user(current_user)
@@ -1,18 +1,22 @@
-import re
 from typing import Union
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
-from requests import HTTPError
-import requests
+from httpx import HTTPError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.session import Session
 from loguru import logger
 
 from app import crud
 from app import schemas
 from app.api import deps
-from app.clients.spotify import SpotifyClient
+from app.clients.spotify import AsyncSpotifyClient
+from app.clients.spotify_link import is_short_link
+from app.clients.spotify_link import spotify_link_resolver
+from app.core.survey import get_user_song_matches
+from app.models.sotw import Sotw
 from app.models.user import User
+from app.shared.utils import get_spotify_track_id
 
 
 router = APIRouter()
@@ -30,7 +34,8 @@ async def post_survey_response(
     week_num: int,
     payload: schemas.ResponsePost,
     current_user: User = Depends(deps.get_current_user),
-    spotify_client: SpotifyClient = Depends(deps.get_spotify_client),
+    sotw: Sotw = Depends(deps.get_member_sotw),
+    spotify_client: AsyncSpotifyClient = Depends(deps.get_async_spotify_client),
 ) -> schemas.ResponseResponse:
     """
     Receive and process a survey response from the front end.
@@ -41,7 +46,8 @@ async def post_survey_response(
         payload (schemas.ResponsePost): The answers to the survey.
         session (Session, optional): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
         current_user (User, optional): Currently authenticated user. Defaults to Depends(deps.get_current_user).
-        spotify_client (SpotifyClient, optional): Client for Spotify interactions. Defaults to Depends(deps.get_spotify_client).
+        sotw (Sotw, optional): The sotw being requested. Dependency ensures the current user is one of its members.
+        spotify_client (AsyncSpotifyClient, optional): Client for Spotify interactions. Defaults to Depends(deps.get_async_spotify_client).
 
     Raises:
         HTTPException: 404 - sotw not found
@@ -53,16 +59,6 @@ async def post_survey_response(
     Returns:
         schemas.ResponseResponse: A response telling the front end if the song submitted is a repeat.s
     """
-    # get the sotw and check permissions
-    sotw = crud.sotw.get(session=session, id=sotw_id)
-
-    if sotw is None:
-        raise HTTPException(
-            status_code=404, detail=f"Sotw with given id {sotw_id} not found."
-        )
-    if current_user not in sotw.user_list:
-        raise HTTPException(status_code=403, detail=f"Not authorized.")
-
     # query to find out what the current week is
     current_week = crud.week.get_current_week(session=session, sotw_id=sotw.id)
 
@@ -79,34 +75,25 @@ async def post_survey_response(
         )
 
     # validate the spotify link
-    next_song_track_id = payload.next_song.split("/")[-1].split("?")[0]
     try:
-        if "//spotify.link/" in payload.next_song:
-            response = requests.get(payload.next_song)
-            html_str = str(response.content)
-            match = re.search(
-                r"https://open.spotify.com/track/([a-zA-Z0-9]+)", html_str
-            )
-            if match:
-                next_song_track_id = match.group(1)
-            else:
-                next_song_track_id = None
-        song = spotify_client.get_track_info(
+        if is_short_link(payload.next_song):
+            next_song_track_id = await spotify_link_resolver.resolve(payload.next_song)
+            if next_song_track_id is None:
+                return schemas.ResponseResponse(repeat=False, valid=False)
+        else:
+            next_song_track_id = get_spotify_track_id(payload.next_song)
+        song = await spotify_client.get_track_info(
             next_song_track_id, session, current_user.id
         )
     except HTTPError:
         return schemas.ResponseResponse(repeat=False, valid=False)
 
-    # check to see if current_user has submitted a response already and delete that response if so
+    # a response the current_user already submitted this week is replaced by this one
+    previous_response = None
     for response in current_week.responses:
         if current_user.id == response.submitter_id:
-            # delete the song from this response
-            crud.song.delete(session=session, id=response.next_song_id)
-            # delete all the user song matches
-            for match in response.user_song_matches:
-                crud.user_song_match.delete(session=session, id=match.id)
-            # delete the response
-            crud.response.delete(session=session, id=response.id)
+            previous_response = response
+            break
 
     theme = None
     theme_description = None
@@ -119,135 +106,66 @@ async def post_survey_response(
             )
         theme = payload.theme
         theme_description = payload.theme_description
-    if week_num == 0:
-        # get song info and create the song in the db
-        song_name = f"{song['name']} - {song['artists'][0]['name']}"
-        for artist in song["artists"][1:]:
-            song_name = song_name + f", {artist['name']}"
 
-        song_in = schemas.SongCreate(
-            spotify_id=next_song_track_id,
-            spotify_link=payload.next_song,
-            name=song_name,
-            submitter_id=current_user.id,
-        )
-
-        next_song_obj = crud.song.create(session=session, object_in=song_in)
-
-        # create response object in db
-        response_in = schemas.ResponseCreate(
-            next_song_id=next_song_obj.id,
-            sotw_id=current_week.sotw_id,
-            week_id=current_week.id,
-            submitter_id=current_user.id,
-            theme=theme,
-            theme_description=theme_description,
-        )
-        response = crud.response.create(session=session, object_in=response_in)
-
-        # add response to week
-        crud.week.add_response_to_week(
-            session=session, db_object=current_week, object_in=response
-        )
-
-        # return a response with the current week
-        return schemas.ResponseResponse(repeat=False, valid=True)
-    else:
-        song_name = f"{song['name']} - {song['artists'][0]['name']}"
-        for artist in song["artists"][1:]:
-            song_name = song_name + f", {artist['name']}"
+    # get song info for the song being submitted
+    song_name = f"{song['name']} - {song['artists'][0]['name']}"
+    for artist in song["artists"][1:]:
+        song_name = song_name + f", {artist['name']}"
 
+    song_in = schemas.SongCreate(
+        spotify_id=next_song_track_id,
+        spotify_link=payload.next_song,
+        name=song_name,
+        submitter_id=current_user.id,
+    )
+    response_data = {
+        "sotw_id": current_week.sotw_id,
+        "week_id": current_week.id,
+        "submitter_id": current_user.id,
+        "theme": theme,
+        "theme_description": theme_description,
+    }
+    user_song_matches = []
+
+    if week_num != 0:
         # determine if this song has been submitted before:
-        if (
-            len(
-                crud.song.get_songs_by_name(
-                    session=session,
-                    name=song_name,
-                    sotw_id=sotw.id,
-                    week_id=current_week.id,
-                )
-            )
-            and not payload.repeat_approved
+        if not payload.repeat_approved and crud.response.is_repeat(
+            session=session,
+            sotw_id=sotw.id,
+            week_id=current_week.id,
+            spotify_id=next_song_track_id,
+            name=song_name,
         ):
             return schemas.ResponseResponse(repeat=True, valid=True)
 
-        song_in = schemas.SongCreate(
-            spotify_id=next_song_track_id,
-            spotify_link=payload.next_song,
-            name=song_name,
-            submitter_id=current_user.id,
+        user_song_matches = get_user_song_matches(
+            payload, sotw.id, current_week.week_num, session
         )
-
-        next_song_obj = crud.song.create(session=session, object_in=song_in)
-
-        # create response object in db
-        response_in = schemas.ResponseCreate(
-            next_song_id=next_song_obj.id,
-            sotw_id=current_week.sotw_id,
-            week_id=current_week.id,
-            submitter_id=current_user.id,
-            picked_song_1_id=payload.picked_song_1,
-            picked_song_2_id=payload.picked_song_2,
-            theme=theme,
-            theme_description=theme_description,
+        response_data["picked_song_1_id"] = payload.picked_song_1
+        response_data["picked_song_2_id"] = payload.picked_song_2
+        response_data["number_correct_matches"] = sum(
+            1 for match in user_song_matches if match["correct_guess"]
         )
-        response = crud.response.create(session=session, object_in=response_in)
 
-        # create user song matches
-        number_correct_matches = 0
-        for match in payload.user_song_matches:
-            song = crud.song.get(session=session, id=int(match.song_id))
-            # the payload has some sort of error if the song can't be found
-            if not song:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"There's something wrong with your request. A song with the given id {match.song_id} does not exist.",
-                )
-
-            previous_week = crud.week.get_week_by_number(
-                session=session, week_num=current_week.week_num - 1, sotw_id=sotw.id
-            )
-            songs = crud.song.get_songs_by_name(
-                session=session,
-                name=song.name,
-                sotw_id=sotw.id,
-                week_id=previous_week.id,
-                this_week=True,
-            )
-            song_submitter_ids = [song.submitter_id for song in songs]
-            user_song_match_in = schemas.UserSongMatchCreate(
-                song_id=int(match.song_id),
-                user_id=int(match.user_id),
-                correct_guess=match.user_id in song_submitter_ids,
-                response_id=response.id,
-            )
-            number_correct_matches += 1 if user_song_match_in.correct_guess else 0
-            crud.user_song_match.create(session=session, object_in=user_song_match_in)
+    # store the song, the response and its matches in one transaction
+    crud.response.create_submission(
+        session=session,
+        song_in=song_in,
+        response_data=response_data,
+        user_song_matches=user_song_matches,
+        replaces=previous_response,
+    )
 
-        # update the response
-        session.refresh(response)
-        response = crud.response.update(
-            session=session,
-            db_object=response,
-            object_in=schemas.ResponseUpdate(
-                number_correct_matches=number_correct_matches
-            ),
-        )
+    # return a response with the current week
+    return schemas.ResponseResponse(repeat=False, valid=True)
 
-        # add response to week
-        crud.week.add_response_to_week(
-            session=session, db_object=current_week, object_in=response
-        )
 
-        # return a response with the current week
-        return schemas.ResponseResponse(repeat=False, valid=True)
-    
 @router.get(
     "/{sotw_id}/{user_id}",
     response_model=schemas.Response,
 )
 async def get_survey_response(
-    session: Session = Depends(deps.get_session),
+    session: AsyncSession = Depends(deps.get_async_session),
     *,
     sotw_id: int,
     user_id: int,
@@ -257,7 +175,7 @@ async def get_survey_response(
     Get the response for the given user and SOTW for the current week.
 
     Args:
-        session (Session, optional): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
+        session (AsyncSession, optional): A SQLAlchemy AsyncSession object that is connected to the database. Defaults to Depends(deps.get_async_session).
         sotw_id (int): ID of the sotw to query
         user_id (int): ID of the user to query
         current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
@@ -270,9 +188,11 @@ async def get_survey_response(
     """
     if user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view this response")
-    current_week = crud.week.get_current_week(session=session, sotw_id=sotw_id)
+    current_week = await crud.async_week.get_current_week(
+        session=session, sotw_id=sotw_id
+    )
 
-    response = crud.response.get_by_sotw_and_submitter(
+    response = await crud.async_response.get_by_sotw_and_submitter(
         sotw_id=sotw_id, submitter_id=user_id, week_id=current_week.id, session=session
     )
 
@@ -3,12 +3,18 @@ from typing import Any, Union
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Request
+from fastapi import Response
 from sqlalchemy.orm.session import Session
 
 from app import crud
 from app import schemas
 from app.api import deps
+from app.core.results_cache import results_cache
+from app.models.sotw import Sotw
 from app.models.user import User
+from app.shared.config import cfg
+from app.shared.utils import etag_matches
 
 
 router = APIRouter()
@@ -23,16 +29,24 @@ async def get_results(
     *,
     sotw_id: int,
     week_num: int,
+    request: Request,
     current_user: User = Depends(deps.get_current_user),
+    sotw: Sotw = Depends(deps.get_member_sotw),
 ) -> schemas.Results:
     """
     Get the results for the given week of the given sotw.
 
+    Results never change once a week is over, so they are served from the in-process results cache once read,
+    sent with a strong ETag and may be kept by the browser for `cfg.RESULTS_CACHE_MAX_AGE_SECONDS`. A request
+    whose `If-None-Match` names the current ETag is answered with an empty 304.
+
     Args:
         sotw_id (int): ID of the sotw to query
         week_num (int): Number of the week for which the results are sought.
+        request (Request): The incoming request.
         session (Session, optional): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
         current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
+        sotw (Sotw, optional): The sotw being requested. Dependency ensures the current user is one of its members.
 
     Raises:
         HTTPException: 403 for unauthorized users
@@ -40,46 +54,39 @@ async def get_results(
     Returns:
         schemas.Results: The results for the given sotw and week num.
     """
-    # get the sotw and check permissions
-    sotw = crud.sotw.get(session=session, id=sotw_id)
-
-    if sotw is None:
-        raise HTTPException(
-            status_code=404, detail=f"Sotw with given id {sotw_id} not found."
+    cached = results_cache.get(sotw.id, week_num)
+    if cached is None:
+        # get the results from the given week and sotw
+        results = crud.results.get_results_by_week_num(
+            session=session, week_num=week_num, sotw_id=sotw.id
         )
-    if current_user not in sotw.user_list:
-        raise HTTPException(status_code=403, detail=f"Not authorized.")
 
-    # get the week from the number given
-    week = crud.week.get_week_by_number(
-        session=session, week_num=week_num, sotw_id=sotw.id
-    )
+        if results is None:
+            # get the week from the number given
+            week = crud.week.get_week_by_number(
+                session=session, week_num=week_num, sotw_id=sotw.id
+            )
 
-    if week is None:
-        raise HTTPException(
-            status_code=404,
-            detail=f"Week {week_num} not found for sotw {sotw.id}.",
-        )
+            if week is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Week {week_num} not found for sotw {sotw.id}.",
+                )
 
-    # get the results from the given week and sotw
-    results = crud.results.get_results_by_week(
-        session=session, week_id=week.id, sotw_id=sotw.id
-    )
+            return schemas.ResultsErrorResponse(
+                message=f"Results for week {week_num} for {sotw.name} not yet available.",
+                release_time=week.next_results_release,
+            )
 
-    if results is None:
-        return schemas.ResultsErrorResponse(
-            message=f"Results for week {week_num} for {sotw.name} not yet available.",
-            release_time=week.next_results_release,
-        )
+        cached = results_cache.set(sotw.id, week_num, results)
+
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"private, max-age={cfg.RESULTS_CACHE_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
 
-    return schemas.Results(
-        id=str(results.id),
-        sotw_id=str(sotw.id),
-        week_id=week.id,
-        first_place=results.first_place,
-        second_place=results.second_place,
-        all_songs=results.all_songs,
-        guessing_data=results.guessing_data,
-        theme=results.theme,
-        theme_description=results.theme_description,
+    return Response(
+        content=cached.body, media_type="application/json", headers=headers
     )
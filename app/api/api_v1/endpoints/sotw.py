@@ -1,15 +1,26 @@
+import asyncio
+from datetime import datetime
+from typing import Callable
+
 from fastapi import APIRouter
+from fastapi import BackgroundTasks
 from fastapi import Depends
 from fastapi import HTTPException
 from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.session import Session
 from jose import JWTError, jwt
 
 from app import crud
 from app import schemas
 from app.api import deps
-from app.clients.spotify import SpotifyClient
+from app.api.serializers import serialize_sotw
+from app.api.serializers import serialize_user
+from app.clients.spotify import AsyncSpotifyClient
 from app.core.auth import create_access_token
+from app.core.membership import is_sotw_member
+from app.core.playlist_rename import run_playlist_rename_job
+from app.crud.crud_job import PLAYLIST_RENAME
 from app.models.sotw import Sotw
 from app.models.user import User
 from app.shared.config import cfg
@@ -23,7 +34,7 @@ async def create_sotw(
     session: Session = Depends(deps.get_session),
     *,
     payload: schemas.SotwCreate,
-    spotify_client: SpotifyClient = Depends(deps.get_spotify_client),
+    spotify_client: AsyncSpotifyClient = Depends(deps.get_async_spotify_client),
     current_user: User = Depends(deps.get_current_user),
 ) -> schemas.Sotw:
     """
@@ -32,7 +43,7 @@ async def create_sotw(
     Args:
         payload (schemas.SotwCreate): The details to create the sotw object with.
         session (Session, optional): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
-        spotify_client (SpotifyClient, optional): Client for Spotify interactions. Defaults to Depends(deps.get_spotify_client).
+        spotify_client (AsyncSpotifyClient, optional): Client for Spotify interactions. Defaults to Depends(deps.get_async_spotify_client).
         current_user (User, optional): Currently authenticcated user making the request. Defaults to Depends(deps.get_current_user).
 
     Raises:
@@ -47,41 +58,40 @@ async def create_sotw(
             detail=f"You must link your spotify account from your profile page in order to create a Song of the Week competition.",
         )
 
-    # create the master playlist
+    # create the master, song of the year and user playlists at once
     master_playlist_name = f"{payload.name} Master Playlist"
     master_playlist_description = (
         f"All the songs contained in every week of the {payload.name} song of the week."
     )
-    master_playlist = spotify_client.create_playlist(
-        master_playlist_name, master_playlist_description, session, current_user.id
-    )
-    payload.master_playlist_link = master_playlist["external_urls"]["spotify"]
-    payload.master_playlist_id = master_playlist["id"]
-
-    # create the song of the year playlist
     soty_playlist_name = f"{payload.name} Song of the Year Playlist"
     soty_playlist_description = f"The winners from each week so far of the {payload.name} Song of the Week for this year."
-    soty_playlist = spotify_client.create_playlist(
-        soty_playlist_name, soty_playlist_description, session, current_user.id
+    user_playlist_name = (
+        f"{current_user.name}'s {payload.name} Song of the Week Playlist"
     )
+    user_playlist_description = f"All songs submitted for the {payload.name} Song of the Week for this year by {current_user.name}."
+    # make sure the user's access token is fresh first so it is refreshed at most once
+    await spotify_client.get_user_access_token(session, current_user.id)
+    master_playlist, soty_playlist, user_playlist = await asyncio.gather(
+        spotify_client.create_playlist(
+            master_playlist_name, master_playlist_description, session, current_user.id
+        ),
+        spotify_client.create_playlist(
+            soty_playlist_name, soty_playlist_description, session, current_user.id
+        ),
+        spotify_client.create_playlist(
+            user_playlist_name, user_playlist_description, session, current_user.id
+        ),
+    )
+    payload.master_playlist_link = master_playlist["external_urls"]["spotify"]
+    payload.master_playlist_id = master_playlist["id"]
     payload.soty_playlist_link = soty_playlist["external_urls"]["spotify"]
     payload.soty_playlist_id = soty_playlist["id"]
-
     payload.owner_id = current_user.id
 
-    # create the new sotw
-    sotw = crud.sotw.create(session=session, object_in=payload)
-
-    # add current user to the sotw
-    crud.user.add_user_to_sotw(session=session, db_object=current_user, object_in=sotw)
-
-    # create the user's playlist for this sotw
-    user_playlist_name = (
-        f"{current_user.name}'s {payload.name} Song of the Week Playlist"
-    )
-    user_playlist_description = f"All songs submitted for the {payload.name} Song of the Week for this year by {current_user.name}."
-    user_playlist = spotify_client.create_playlist(
-        user_playlist_name, user_playlist_description, session, current_user.id
+    # create the new sotw, add the current user to it and store their playlist in one transaction
+    sotw = crud.sotw.create(session=session, object_in=payload, commit=False)
+    crud.user.add_user_to_sotw(
+        session=session, db_object=current_user, object_in=sotw, commit=False
     )
     user_playlist_create = schemas.UserPlaylistCreate(
         playlist_id=user_playlist["id"],
@@ -89,20 +99,10 @@ async def create_sotw(
         sotw_id=sotw.id,
         user_id=current_user.id,
     )
-    crud.user_playlist.create(session, object_in=user_playlist_create)
-
-    return schemas.Sotw(
-        created_at=sotw.created_at,
-        id=str(sotw.id),
-        master_playlist_id=sotw.master_playlist_id,
-        master_playlist_link=sotw.master_playlist_link,
-        name=sotw.name,
-        owner_id=str(sotw.owner_id),
-        results_datetime=sotw.results_datetime,
-        results_timezone=sotw.results_timezone,
-        soty_playlist_id=sotw.soty_playlist_id,
-        soty_playlist_link=sotw.soty_playlist_link,
-    )
+    crud.user_playlist.create(session, object_in=user_playlist_create, commit=False)
+    session.commit()
+
+    return serialize_sotw(sotw)
 
 
 @router.put("/{sotw_id}", response_model=schemas.Sotw)
@@ -110,17 +110,24 @@ async def update_sotw(
     session: Session = Depends(deps.get_session),
     *,
     sotw_id: int,
-    spotify_client: SpotifyClient = Depends(deps.get_spotify_client),
+    spotify_client: AsyncSpotifyClient = Depends(deps.get_async_spotify_client),
+    session_factory: Callable[[], Session] = Depends(deps.get_session_factory),
+    background_tasks: BackgroundTasks,
     payload: schemas.SotwUpdate,
     current_user: User = Depends(deps.get_current_user),
 ) -> schemas.Sotw:
     """
     Update the sotw object in the db and any related playlists.
 
+    Renaming a sotw renames all of its spotify playlists in a background job, the progress of which can be
+    followed with the playlist rename status endpoint.
+
     Args:
         session (Session, optional): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
         sotw_id (int): ID of the sotw to update
-        spotify_client (SpotifyClient, optional): Client for Spotify interactions. Defaults to Depends(deps.get_spotify_client).
+        spotify_client (AsyncSpotifyClient, optional): Client for Spotify interactions. Defaults to Depends(deps.get_async_spotify_client).
+        session_factory (Callable[[], Session], optional): Creates the session the playlist rename job works in. Defaults to Depends(deps.get_session_factory).
+        background_tasks (BackgroundTasks): Tasks to run after the response is sent.
         payload (schemas.SotwUpdate): Data to update sotw with.
         current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
 
@@ -141,146 +148,85 @@ async def update_sotw(
 
     if payload.name:
         # update playlist names
-        update_master_playlist_name(session, sotw, current_user.id, spotify_client)
-        update_soty_playlist_name(session, sotw, current_user.id, spotify_client)
-        update_all_sotw_weeks_playlist_names(
-            session, sotw, current_user.id, spotify_client
+        job = crud.job.schedule(
+            session=session,
+            sotw_id=sotw.id,
+            job_type=PLAYLIST_RENAME,
+            run_at=datetime.now().timestamp() * 1000,
+        )
+        background_tasks.add_task(
+            run_playlist_rename_job, job.id, session_factory, spotify_client
         )
-        update_all_sotw_user_playlist_names(session, sotw, spotify_client)
-
-    return schemas.Sotw(
-        created_at=sotw.created_at,
-        id=str(sotw.id),
-        master_playlist_id=sotw.master_playlist_id,
-        master_playlist_link=sotw.master_playlist_link,
-        name=sotw.name,
-        owner_id=str(sotw.owner_id),
-        results_datetime=sotw.results_datetime,
-        results_timezone=sotw.results_timezone,
-        soty_playlist_id=sotw.soty_playlist_id,
-        soty_playlist_link=sotw.soty_playlist_link,
-    )
-
-
-def update_master_playlist_name(
-    session: Session, sotw: Sotw, user_id: int, spotify_client: SpotifyClient
-):
-    """
-    Update the master playlist name for a sotw.
 
-    Args:
-        session (Session): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
-        sotw (Sotw): The sotw with the playlist to be updated.
-        user_id (int): ID of the sotw owner.
-        spotify_client (SpotifyClient): Client for Spotify interactions. Defaults to Depends(deps.get_spotify_client).
-    """
-    new_master_playlist_name = f"{sotw.name} Master Playlist"
-    new_master_playlist_description = (
-        f"All the songs contained in every week of the {sotw.name} song of the week."
-    )
-    spotify_client.update_playlist_details(
-        sotw.master_playlist_id,
-        new_master_playlist_name,
-        new_master_playlist_description,
-        session,
-        user_id,
-    )
+    return serialize_sotw(sotw)
 
 
-def update_soty_playlist_name(
-    session: Session, sotw: Sotw, user_id: int, spotify_client: SpotifyClient
-):
+@router.get("/{sotw_id}/playlist-rename", response_model=schemas.Job)
+async def get_playlist_rename_status(
+    session: Session = Depends(deps.get_session),
+    *,
+    sotw_id: int,
+    current_user: User = Depends(deps.get_current_user),
+) -> schemas.Job:
     """
-    Update the soty playlist name for a sotw.
+    Retrieve the status of the latest playlist rename job for a sotw.
 
     Args:
-        session (Session): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
-        sotw (Sotw): The sotw with the playlist to be updated.
-        user_id (int): ID of the sotw owner.
-        spotify_client (SpotifyClient): Client for Spotify interactions. Defaults to Depends(deps.get_spotify_client).
-    """
-    new_soty_playlist_name = f"{sotw.name} Song of the Year Playlist"
-    new_soty_playlist_description = f"The winners from each week so far of the {sotw.name} Song of the Week for this year."
-    spotify_client.update_playlist_details(
-        sotw.soty_playlist_id,
-        new_soty_playlist_name,
-        new_soty_playlist_description,
-        session,
-        user_id,
-    )
+        session (Session, optional): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
+        sotw_id (int): ID of the sotw whose playlists are being renamed.
+        current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
 
+    Raises:
+        HTTPException: 404 if the sotw or a rename job for it does not exist, 403 for unauthorized users.
 
-def update_all_sotw_weeks_playlist_names(
-    session: Session, sotw: Sotw, user_id: int, spotify_client: SpotifyClient
-):
+    Returns:
+        schemas.Job: The playlist rename job.
     """
-    Update all the week playlist names for a sotw.
+    sotw = crud.sotw.get(session=session, id=sotw_id)
 
-    Args:
-        session (Session): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
-        sotw (Sotw): The sotw with the weeks to be updated.
-        user_id (int): ID of the sotw owner.
-        spotify_client (SpotifyClient): Client for Spotify interactions. Defaults to Depends(deps.get_spotify_client).
-    """
-    all_weeks = crud.week.get_all_weeks_in_sotw(session=session, sotw_id=sotw.id)
-    for week in all_weeks:
-        if week.week_num == 0:
-            continue
-        new_week_playlist_name = f"{sotw.name} SOTW #{week.week_num}"
-        new_week_playlist_desciption = (
-            f"Week {week.week_num} for {sotw.name} Song of the Week."
-        )
-        week_playlist_id = week.playlist_link.split("/")[-1]
-        spotify_client.update_playlist_details(
-            week_playlist_id,
-            new_week_playlist_name,
-            new_week_playlist_desciption,
-            session,
-            user_id,
+    if sotw is None:
+        raise HTTPException(
+            status_code=404, detail=f"Sotw with given id {sotw_id} not found."
         )
+    if current_user.id != sotw.owner_id:
+        raise HTTPException(status_code=403, detail=f"Not authorized.")
 
-
-def update_all_sotw_user_playlist_names(
-    session: Session, sotw: Sotw, spotify_client: SpotifyClient
-):
-    """
-    Update all the user playlist names for a sotw's users.
-
-    Args:
-        session (Session): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
-        sotw (Sotw): The sotw with the users playlists to be updated.
-        spotify_client (SpotifyClient): Client for Spotify interactions. Defaults to Depends(deps.get_spotify_client).
-    """
-    for user in sotw.user_list:
-        # get the user's playlist
-        user_playlist = crud.user_playlist.get_playlist_for_user_for_sotw(
-            session=session, user_id=user.id, sotw_id=sotw.id
-        )
-        new_user_playlist_name = f"{user.name}'s {sotw.name} Song of the Week Playlist"
-        new_user_playlist_description = f"All songs submitted for the {sotw.name} Song of the Week for this year by {user.name}."
-        spotify_client.update_playlist_details(
-            user_playlist.playlist_id,
-            new_user_playlist_name,
-            new_user_playlist_description,
-            session,
-            user.id,
+    job = crud.job.get_latest_job_for_sotw(
+        session=session, sotw_id=sotw.id, job_type=PLAYLIST_RENAME
+    )
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No playlist rename found for sotw with id {sotw_id}.",
         )
 
+    return schemas.Job(
+        id=str(job.id),
+        job_type=job.job_type,
+        sotw_id=str(job.sotw_id),
+        run_at=job.run_at,
+        status=job.status,
+        attempts=job.attempts,
+        last_error=job.last_error,
+    )
+
 
 @router.get("/{sotw_id}", response_model=schemas.Sotw)
 async def get_sotw(
-    session: Session = Depends(deps.get_session),
+    session: AsyncSession = Depends(deps.get_async_session),
     *,
     sotw_id: int,
     current_user: User = Depends(deps.get_current_user),
+    sotw: Sotw = Depends(deps.get_async_member_sotw),
 ) -> schemas.Sotw:
     """
     Retrieve a sotw object from the database.
 
     Args:
         sotw_id (int): ID of the sotw to retreive.
-        session (Session, optional): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
+        session (AsyncSession, optional): A SQLAlchemy AsyncSession object that is connected to the database. Defaults to Depends(deps.get_async_session).
         current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
+        sotw (Sotw, optional): The sotw being requested. Dependency ensures the current user is one of its members.
 
     Raises:
         HTTPException: 403 for unauthorized users.
@@ -288,27 +234,7 @@ async def get_sotw(
     Returns:
         schemas.Sotw: The sotw object retreived.
     """
-    sotw = crud.sotw.get(session=session, id=sotw_id)
-
-    if sotw is None:
-        raise HTTPException(
-            status_code=404, detail=f"Sotw with given id {sotw_id} not found."
-        )
-    if current_user not in sotw.user_list:
-        raise HTTPException(status_code=403, detail=f"Not authorized.")
-
-    return schemas.Sotw(
-        created_at=sotw.created_at,
-        id=str(sotw.id),
-        master_playlist_id=sotw.master_playlist_id,
-        master_playlist_link=sotw.master_playlist_link,
-        name=sotw.name,
-        owner_id=str(sotw.owner_id),
-        results_datetime=sotw.results_datetime,
-        results_timezone=sotw.results_timezone,
-        soty_playlist_id=sotw.soty_playlist_id,
-        soty_playlist_link=sotw.soty_playlist_link,
-    )
+    return serialize_sotw(sotw)
 
 
 @router.get("/{sotw_id}/invite", response_model=schemas.SotwInvite)
@@ -317,6 +243,7 @@ async def get_sotw_invite_link(
     *,
     sotw_id: int,
     current_user: User = Depends(deps.get_current_user),
+    sotw: Sotw = Depends(deps.get_member_sotw),
 ) -> schemas.SotwInvite:
     """
     Generate a link for sharing the sotw.
@@ -325,6 +252,7 @@ async def get_sotw_invite_link(
         sotw_id (int): ID of the sotw to share.
         session (Session, optional): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
         current_user (User, optional): Currently logged in user. Dependency ensures they are logged in.
+        sotw (Sotw, optional): The sotw being requested. Dependency ensures the current user is one of its members.
 
     Raises:
         HTTPException: 403 for unauthorized users.
@@ -332,15 +260,6 @@ async def get_sotw_invite_link(
     Returns:
         schemas.SotwInvite: The share link for the sotw.
     """
-    sotw = crud.sotw.get(session=session, id=sotw_id)
-
-    if sotw is None:
-        raise HTTPException(
-            status_code=404, detail=f"Sotw with given id {sotw_id} not found."
-        )
-    if current_user not in sotw.user_list:
-        raise HTTPException(status_code=403, detail=f"Not authorized.")
-
     # create token for sharing
     share_token = create_access_token(
         sub=sotw.id, lifetime=cfg.SHARE_TOKEN_EXPIRE_MINUTES
@@ -394,7 +313,7 @@ async def get_sotw_invite_pending(
             status_code=404, detail=f"Sotw with given id {sotw_id} not found."
         )
     # don't worry about if the user's already in the sotw
-    if current_user in sotw.user_list:
+    if is_sotw_member(session, user_id=current_user.id, sotw_id=sotw.id):
         return schemas.SotwInfo(id=str(sotw.id), name=sotw.name, already_in=True)
 
     return schemas.SotwInfo(id=str(sotw.id), name=sotw.name)
@@ -405,7 +324,7 @@ async def get_sotw_invite_join(
     session: Session = Depends(deps.get_session),
     *,
     share_token: str,
-    spotify_client: SpotifyClient = Depends(deps.get_spotify_client),
+    spotify_client: AsyncSpotifyClient = Depends(deps.get_async_spotify_client),
     current_user: User = Depends(deps.get_current_user),
 ) -> schemas.SotwInfo:
     """
@@ -451,11 +370,7 @@ async def get_sotw_invite_join(
         )
 
     try:
-        # add current user to the sotw
-        crud.user.add_user_to_sotw(
-            session=session, db_object=current_user, object_in=sotw
-        )
-
+        user_playlist = None
         if not crud.user_playlist.get_playlist_for_user_for_sotw(
             session=session, user_id=current_user.id, sotw_id=sotw.id
         ):
@@ -464,23 +379,30 @@ async def get_sotw_invite_join(
                 f"{current_user.name}'s {sotw.name} Song of the Week Playlist"
             )
             user_playlist_description = f"All songs submitted for the {sotw.name} Song of the Week for this year by {current_user.name}."
-            user_playlist = spotify_client.create_playlist(
+            user_playlist = await spotify_client.create_playlist(
                 user_playlist_name,
                 user_playlist_description,
                 session,
                 current_user.id,
             )
+
+        # add current user to the sotw and store their playlist in one transaction
+        crud.user.add_user_to_sotw(
+            session=session, db_object=current_user, object_in=sotw, commit=False
+        )
+        if user_playlist is not None:
             user_playlist_create = schemas.UserPlaylistCreate(
                 playlist_id=user_playlist["id"],
                 playlist_link=user_playlist["external_urls"]["spotify"],
                 sotw_id=sotw.id,
                 user_id=current_user.id,
             )
-            crud.user_playlist.create(session, object_in=user_playlist_create)
+            crud.user_playlist.create(
+                session, object_in=user_playlist_create, commit=False
+            )
+        session.commit()
     except Exception as e:
-        crud.user.remove_user_from_sotw(
-            session=session, db_object=current_user, object_in=sotw
-        )
+        session.rollback()
         raise HTTPException(status_code=400, detail=f"An error occurred: '{str(e)}'")
 
     return schemas.SotwInfo(id=str(sotw.id))
@@ -492,6 +414,7 @@ async def get_sotw_members(
     *,
     sotw_id: int,
     current_user: User = Depends(deps.get_current_user),
+    sotw: Sotw = Depends(deps.get_member_sotw),
 ) -> list[schemas.User]:
     """
     Get the list of members for a specific SOTW.
@@ -500,6 +423,7 @@ async def get_sotw_members(
         sotw_id (int): ID of the sotw to get members from
         session (Session): Database session
         current_user (User): Currently authenticated user
+        sotw (Sotw, optional): The sotw being requested. Dependency ensures the current user is one of its members.
 
     Raises:
         HTTPException: 404 if SOTW not found, 403 if user not authorized
@@ -507,39 +431,8 @@ async def get_sotw_members(
     Returns:
         list[schemas.User]: List of users in the SOTW
     """
-    sotw = crud.sotw.get(session=session, id=sotw_id)
-
-    if sotw is None:
-        raise HTTPException(
-            status_code=404, detail=f"Sotw with given id {sotw_id} not found."
-        )
-    if current_user not in sotw.user_list:
-        raise HTTPException(status_code=403, detail=f"Not authorized.")
-
-    users = [
-        schemas.User(
-            id=str(user.id),
-            email=user.email,
-            name=user.name,
-            is_superuser=user.is_superuser,
-            spotify_linked=user.spotify_linked,
-            playlists=[
-                schemas.UserPlaylist(
-                    id=str(playlist.id),
-                    playlist_id=playlist.playlist_id,
-                    playlist_link=playlist.playlist_link,
-                    sotw_id=str(playlist.sotw_id),
-                    user_id=str(playlist.user_id),
-                )
-                # make sure we're only returning the playlists for this competition
-                for playlist in user.playlists
-                if playlist.sotw_id == sotw_id
-            ],
-            # we don't need the sotw_list for members at this time
-            sotw_list=[],
-        )
-        for user in sotw.user_list
-    ]
+    # members only come with their playlist for this competition
+    users = [serialize_user(user, sotw_id=sotw_id) for user in sotw.user_list]
     return users
 
 
@@ -548,7 +441,7 @@ async def get_leave_sotw(
     session: Session = Depends(deps.get_session),
     *,
     sotw_id: int,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_with_memberships),
 ) -> schemas.User:
     """
     Retrieve a sotw object from the database.
@@ -570,39 +463,8 @@ async def get_leave_sotw(
         raise HTTPException(
             status_code=404, detail=f"Sotw with given id {sotw_id} not found."
         )
-    if current_user not in sotw.user_list:
-        return schemas.User(
-            id=str(current_user.id),
-            email=current_user.email,
-            name=current_user.name,
-            is_superuser=current_user.is_superuser,
-            spotify_linked=current_user.spotify_linked,
-            playlists=[
-                schemas.UserPlaylist(
-                    id=str(playlist.id),
-                    playlist_id=playlist.playlist_id,
-                    playlist_link=playlist.playlist_link,
-                    sotw_id=str(playlist.sotw_id),
-                    user_id=str(playlist.user_id),
-                )
-                for playlist in current_user.playlists
-            ],
-            sotw_list=[
-                schemas.Sotw(
-                    created_at=sotw.created_at,
-                    id=str(sotw.id),
-                    master_playlist_id=sotw.master_playlist_id,
-                    master_playlist_link=sotw.master_playlist_link,
-                    name=sotw.name,
-                    owner_id=str(sotw.owner_id),
-                    results_datetime=sotw.results_datetime,
-                    results_timezone=sotw.results_timezone,
-                    soty_playlist_id=sotw.soty_playlist_id,
-                    soty_playlist_link=sotw.soty_playlist_link,
-                )
-                for sotw in current_user.sotw_list
-            ],
-        )
+    if not is_sotw_member(session, user_id=current_user.id, sotw_id=sotw.id):
+        return serialize_user(current_user)
 
     # remove user from sotw
     crud.user.remove_user_from_sotw(
@@ -610,35 +472,4 @@ async def get_leave_sotw(
     )
 
     session.refresh(current_user)
-    return schemas.User(
-        id=str(current_user.id),
-        email=current_user.email,
-        name=current_user.name,
-        is_superuser=current_user.is_superuser,
-        spotify_linked=current_user.spotify_linked,
-        playlists=[
-            schemas.UserPlaylist(
-                id=str(playlist.id),
-                playlist_id=playlist.playlist_id,
-                playlist_link=playlist.playlist_link,
-                sotw_id=str(playlist.sotw_id),
-                user_id=str(playlist.user_id),
-            )
-            for playlist in current_user.playlists
-        ],
-        sotw_list=[
-            schemas.Sotw(
-                created_at=sotw.created_at,
-                id=str(sotw.id),
-                master_playlist_id=sotw.master_playlist_id,
-                master_playlist_link=sotw.master_playlist_link,
-                name=sotw.name,
-                owner_id=str(sotw.owner_id),
-                results_datetime=sotw.results_datetime,
-                results_timezone=sotw.results_timezone,
-                soty_playlist_id=sotw.soty_playlist_id,
-                soty_playlist_link=sotw.soty_playlist_link,
-            )
-            for sotw in current_user.sotw_list
-        ],
-    )
+    return serialize_user(current_user)
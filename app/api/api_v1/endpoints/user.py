@@ -9,7 +9,9 @@ from sqlalchemy.orm.session import Session
 from app import crud
 from app import schemas
 from app.api import deps
+from app.api.serializers import serialize_user
 from app.clients.email import EmailClient
+from app.clients.spotify import spotify_token_cache
 from app.core.auth import authenticate, create_access_token
 from app.core.security import get_password_hash
 from app.models.user import User
@@ -27,7 +29,7 @@ async def update_user(
     email_client: EmailClient = Depends(deps.get_email_client),
     background_tasks: BackgroundTasks,
     payload: schemas.UserUpdate,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_with_memberships),
 ) -> Any:
     """
     Update the user object in the db.
@@ -61,7 +63,10 @@ async def update_user(
             spotify_linked=False,
             spotify_access_token=None,
             spotify_refresh_token=None,
+            spotify_accessed_date=None,
+            spotify_token_expires_in=None,
         )
+        spotify_token_cache.invalidate(current_user.id)
     elif payload.email is not None and cfg.SEND_REGISTRATION_EMAILS:
         # create an email verification token
         verification_token = create_access_token(
@@ -74,73 +79,11 @@ async def update_user(
             to=payload.email,
             to_name=current_user.name,
         )
-        return schemas.User(
-            id=str(current_user.id),
-            email=current_user.email,
-            name=current_user.name,
-            is_superuser=current_user.is_superuser,
-            spotify_linked=current_user.spotify_linked,
-            playlists=[
-                schemas.UserPlaylist(
-                    id=str(playlist.id),
-                    playlist_id=playlist.playlist_id,
-                    playlist_link=playlist.playlist_link,
-                    sotw_id=str(playlist.sotw_id),
-                    user_id=str(playlist.user_id),
-                )
-                for playlist in current_user.playlists
-            ],
-            sotw_list=[
-                schemas.Sotw(
-                    created_at=sotw.created_at,
-                    id=str(sotw.id),
-                    master_playlist_id=sotw.master_playlist_id,
-                    master_playlist_link=sotw.master_playlist_link,
-                    name=sotw.name,
-                    owner_id=str(sotw.owner_id),
-                    results_datetime=sotw.results_datetime,
-                    results_timezone=sotw.results_timezone,
-                    soty_playlist_id=sotw.soty_playlist_id,
-                    soty_playlist_link=sotw.soty_playlist_link,
-                )
-                for sotw in current_user.sotw_list
-            ],
-        )
+        return serialize_user(current_user)
 
     user = crud.user.update(session=session, db_object=current_user, object_in=payload)
 
-    return schemas.User(
-        id=str(user.id),
-        email=user.email,
-        name=user.name,
-        is_superuser=user.is_superuser,
-        spotify_linked=user.spotify_linked,
-        playlists=[
-            schemas.UserPlaylist(
-                id=str(playlist.id),
-                playlist_id=playlist.playlist_id,
-                playlist_link=playlist.playlist_link,
-                sotw_id=str(playlist.sotw_id),
-                user_id=str(playlist.user_id),
-            )
-            for playlist in user.playlists
-        ],
-        sotw_list=[
-            schemas.Sotw(
-                created_at=sotw.created_at,
-                id=str(sotw.id),
-                master_playlist_id=sotw.master_playlist_id,
-                master_playlist_link=sotw.master_playlist_link,
-                name=sotw.name,
-                owner_id=str(sotw.owner_id),
-                results_datetime=sotw.results_datetime,
-                results_timezone=sotw.results_timezone,
-                soty_playlist_id=sotw.soty_playlist_id,
-                soty_playlist_link=sotw.soty_playlist_link,
-            )
-            for sotw in user.sotw_list
-        ],
-    )
+    return serialize_user(user)
 
 
 @router.get("/verify/{verification_token}", response_model=schemas.User)
@@ -181,38 +124,7 @@ async def verify_email_change(
 
     user = crud.user.update(session=session, db_object=current_user, object_in=user_in)
 
-    return schemas.User(
-        id=str(user.id),
-        email=user.email,
-        name=user.name,
-        is_superuser=user.is_superuser,
-        spotify_linked=user.spotify_linked,
-        playlists=[
-            schemas.UserPlaylist(
-                id=str(playlist.id),
-                playlist_id=playlist.playlist_id,
-                playlist_link=playlist.playlist_link,
-                sotw_id=str(playlist.sotw_id),
-                user_id=str(playlist.user_id),
-            )
-            for playlist in user.playlists
-        ],
-        sotw_list=[
-            schemas.Sotw(
-                created_at=sotw.created_at,
-                id=str(sotw.id),
-                master_playlist_id=sotw.master_playlist_id,
-                master_playlist_link=sotw.master_playlist_link,
-                name=sotw.name,
-                owner_id=str(sotw.owner_id),
-                results_datetime=sotw.results_datetime,
-                results_timezone=sotw.results_timezone,
-                soty_playlist_id=sotw.soty_playlist_id,
-                soty_playlist_link=sotw.soty_playlist_link,
-            )
-            for sotw in user.sotw_list
-        ],
-    )
+    return serialize_user(user)
 
 
 @router.post("/reset-password")
@@ -327,7 +239,7 @@ async def delete_user(
     session: Session = Depends(deps.get_session),
     *,
     user_id: int,
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_with_memberships),
 ) -> Any:
     """
     Delete specified user.
@@ -348,35 +260,4 @@ async def delete_user(
 
     user = crud.user.delete(session=session, id=user_id)
 
-    return schemas.User(
-        id=str(user.id),
-        email=user.email,
-        name=user.name,
-        is_superuser=user.is_superuser,
-        spotify_linked=user.spotify_linked,
-        playlists=[
-            schemas.UserPlaylist(
-                id=str(playlist.id),
-                playlist_id=playlist.playlist_id,
-                playlist_link=playlist.playlist_link,
-                sotw_id=str(playlist.sotw_id),
-                user_id=str(playlist.user_id),
-            )
-            for playlist in user.playlists
-        ],
-        sotw_list=[
-            schemas.Sotw(
-                created_at=sotw.created_at,
-                id=str(sotw.id),
-                master_playlist_id=sotw.master_playlist_id,
-                master_playlist_link=sotw.master_playlist_link,
-                name=sotw.name,
-                owner_id=str(sotw.owner_id),
-                results_datetime=sotw.results_datetime,
-                results_timezone=sotw.results_timezone,
-                soty_playlist_id=sotw.soty_playlist_id,
-                soty_playlist_link=sotw.soty_playlist_link,
-            )
-            for sotw in user.sotw_list
-        ],
-    )
+    return serialize_user(user)
@@ -1,3 +1,5 @@
+from functools import lru_cache
+from typing import Callable
 from typing import Optional
 from typing import AsyncGenerator
 from typing import Generator
@@ -9,10 +11,17 @@ from fastapi import Depends, HTTPException, status
 from jose import jwt, JWTError
 from sqlalchemy.orm.session import Session
 
+from app import crud
+from app.clients.spotify import AsyncSpotifyClient
 from app.clients.spotify import SpotifyClient
 from app.clients.email import EmailClient
+from app.core.auth_cache import token_cache
+from app.core.auth_cache import user_cache
+from app.core.membership import is_sotw_member
+from app.core.membership import is_sotw_member_async
 from app.db.session import SessionLocal
 from app.db.session import AsyncSessionLocal
+from app.models.sotw import Sotw
 from app.models.user import User
 from app.core.auth import oauth2_scheme
 from app.shared.config import cfg
@@ -31,28 +40,36 @@ def get_session() -> Generator[Session, None, None]:
         session.close()
 
 
-# synchronous orm session
-def get_async_session() -> AsyncGenerator[AsyncSession, None]:  # type: ignore
-    session = AsyncSessionLocal()
-    try:
+# creates sessions for work that outlives the request, e.g. background tasks
+def get_session_factory() -> Callable[[], Session]:
+    return SessionLocal
+
+
+# asynchronous orm session
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as session:
         yield session
-    finally:
-        session.close()
 
 
-async def get_current_user(
-    session: Session = Depends(get_session), token: str = Depends(oauth2_scheme)
-) -> User:
-    """
-    Get the user that corresponds to the JWT given
-    :session: a SQLAlchemy Session object that is connected to the database
-    :token: a JWT with the id of the user being requested
-    """
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _get_user_id_from_token(token: str) -> str:
+    """
+    Read the id of the user a JWT was issued to, raising a 401 when the token is invalid
+    Tokens that were verified recently are read from the token cache instead of being decoded again
+    :token: a JWT with the id of the user being requested
+    """
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
+    credentials_exception = _credentials_exception()
     try:
         payload = jwt.decode(
             token,
@@ -66,20 +83,120 @@ async def get_current_user(
         token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
+    if payload.get("exp") is not None:
+        token_cache.set(token, token_data.username, payload["exp"])
+    return token_data.username
 
-    user = session.query(User).filter(User.id == token_data.username).first()
+
+def get_current_user(
+    session: Session = Depends(get_session), token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Get the user that corresponds to the JWT given
+    Users authenticated recently are rebuilt from the user cache without a query
+    Not a coroutine so FastAPI runs it, and its query, in the threadpool instead of on the event loop
+    :session: a SQLAlchemy Session object that is connected to the database
+    :token: a JWT with the id of the user being requested
+    """
+    user_id = _get_user_id_from_token(token)
+    user = user_cache.get(session, user_id)
+    if user is not None:
+        return user
+
+    user = session.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    user_cache.set(user)
+    return user
+
+
+def get_current_user_with_memberships(
+    session: Session = Depends(get_session), token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Get the user that corresponds to the JWT given, with the playlists and sotws its payload includes loaded
+    :session: a SQLAlchemy Session object that is connected to the database
+    :token: a JWT with the id of the user being requested
+    """
+    user_id = _get_user_id_from_token(token)
+    user = crud.user.get_with_memberships(session=session, id=user_id)
+    if user is None:
+        raise _credentials_exception()
     return user
 
 
+def get_member_sotw(
+    sotw_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> Sotw:
+    """
+    Get the sotw in the path, making sure the current user is one of its members
+    :sotw_id: the id of the sotw being requested
+    :session: a SQLAlchemy Session object that is connected to the database
+    :current_user: the user making the request
+    """
+    sotw = crud.sotw.get(session=session, id=sotw_id)
+    if sotw is None:
+        raise HTTPException(
+            status_code=404, detail=f"Sotw with given id {sotw_id} not found."
+        )
+    if not is_sotw_member(session, user_id=current_user.id, sotw_id=sotw_id):
+        raise HTTPException(status_code=403, detail=f"Not authorized.")
+    return sotw
+
+
+async def get_async_member_sotw(
+    sotw_id: int,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> Sotw:
+    """
+    Get the sotw in the path through the async session, making sure the current user is one of its members
+    :sotw_id: the id of the sotw being requested
+    :session: a SQLAlchemy AsyncSession object that is connected to the database
+    :current_user: the user making the request
+    """
+    sotw = await crud.async_sotw.get(session=session, id=sotw_id)
+    if sotw is None:
+        raise HTTPException(
+            status_code=404, detail=f"Sotw with given id {sotw_id} not found."
+        )
+    if not await is_sotw_member_async(
+        session, user_id=current_user.id, sotw_id=sotw_id
+    ):
+        raise HTTPException(status_code=403, detail=f"Not authorized.")
+    return sotw
+
+
 def get_spotify_client():
     client_id = cfg.SPOTIFY_CLIENT_ID
     client_secret = cfg.SPOTIFY_CLIENT_SECRET
     if not client_id or not client_secret:
         raise Exception("Spotify credentials are not set in environment variables")
+    return _get_shared_spotify_client(client_id, client_secret)
+
+
+def get_async_spotify_client():
+    client_id = cfg.SPOTIFY_CLIENT_ID
+    client_secret = cfg.SPOTIFY_CLIENT_SECRET
+    if not client_id or not client_secret:
+        raise Exception("Spotify credentials are not set in environment variables")
+    return _get_shared_async_spotify_client(client_id, client_secret)
+
+
+# one spotify client per process so every request shares its connection pool
+@lru_cache(maxsize=1)
+def _get_shared_spotify_client(client_id: str, client_secret: str) -> SpotifyClient:
     return SpotifyClient(client_id, client_secret)
 
 
+@lru_cache(maxsize=1)
+def _get_shared_async_spotify_client(
+    client_id: str, client_secret: str
+) -> AsyncSpotifyClient:
+    return AsyncSpotifyClient(client_id, client_secret)
+
+
 def get_email_client():
     return EmailClient()
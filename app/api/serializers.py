@@ -0,0 +1,138 @@
+import hashlib
+from typing import Optional
+
+from app import schemas
+from app.models.results import Results
+from app.models.sotw import Sotw
+from app.models.user import User
+from app.models.user_playlist import UserPlaylist
+
+
+def serialize_user_playlist(playlist: UserPlaylist) -> schemas.UserPlaylist:
+    """
+    Build the API representation of a user playlist.
+
+    Args:
+        playlist (UserPlaylist): A user playlist model object.
+
+    Returns:
+        schemas.UserPlaylist: The user playlist payload.
+    """
+    return schemas.UserPlaylist(
+        id=str(playlist.id),
+        playlist_id=playlist.playlist_id,
+        playlist_link=playlist.playlist_link,
+        sotw_id=str(playlist.sotw_id),
+        user_id=str(playlist.user_id),
+    )
+
+
+def serialize_sotw(sotw: Sotw) -> schemas.Sotw:
+    """
+    Build the API representation of a sotw.
+
+    Args:
+        sotw (Sotw): A sotw model object.
+
+    Returns:
+        schemas.Sotw: The sotw payload.
+    """
+    return schemas.Sotw(
+        created_at=sotw.created_at,
+        id=str(sotw.id),
+        master_playlist_id=sotw.master_playlist_id,
+        master_playlist_link=sotw.master_playlist_link,
+        name=sotw.name,
+        owner_id=str(sotw.owner_id),
+        results_datetime=sotw.results_datetime,
+        results_timezone=sotw.results_timezone,
+        soty_playlist_id=sotw.soty_playlist_id,
+        soty_playlist_link=sotw.soty_playlist_link,
+    )
+
+
+def serialize_user(user: User, sotw_id: Optional[int] = None) -> schemas.User:
+    """
+    Build the API representation of a user with their playlists and sotws.
+
+    Load the user with `crud.user.get_with_memberships` (or `deps.get_current_user_with_memberships`) so the
+    playlists and sotws do not each cost a lazy load.
+
+    Args:
+        user (User): A user model object.
+        sotw_id (Optional[int], optional): When given only the user's playlist for this sotw is included and their
+            sotw list is left out, as it is for the members of a sotw. Defaults to None.
+
+    Returns:
+        schemas.User: The user payload.
+    """
+    if sotw_id is not None:
+        playlists = [
+            serialize_user_playlist(playlist)
+            for playlist in user.playlists
+            if playlist.sotw_id == sotw_id
+        ]
+        sotw_list = []
+    else:
+        playlists = [serialize_user_playlist(playlist) for playlist in user.playlists]
+        sotw_list = [serialize_sotw(sotw) for sotw in user.sotw_list]
+
+    return schemas.User(
+        id=str(user.id),
+        email=user.email,
+        name=user.name,
+        is_superuser=user.is_superuser,
+        spotify_linked=user.spotify_linked,
+        playlists=playlists,
+        sotw_list=sotw_list,
+    )
+
+
+def serialize_results(results: Results) -> schemas.Results:
+    """
+    Build the API representation of a week's results.
+
+    Args:
+        results (Results): A results model object.
+
+    Returns:
+        schemas.Results: The results payload.
+    """
+    return schemas.Results(
+        id=str(results.id),
+        sotw_id=str(results.sotw_id),
+        week_id=results.week_id,
+        first_place=results.first_place,
+        second_place=results.second_place,
+        all_songs=results.all_songs,
+        guessing_data=results.guessing_data,
+        theme=results.theme,
+        theme_description=results.theme_description,
+    )
+
+
+def get_results_etag(results: Results) -> str:
+    """
+    Build a strong ETag for a week's results from the columns that make up their payload.
+
+    Args:
+        results (Results): A results model object.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    digest = hashlib.sha256()
+    for value in (
+        results.id,
+        results.sotw_id,
+        results.week_id,
+        results.first_place,
+        results.second_place,
+        results.all_songs,
+        results.guessing_data,
+        results.theme,
+        results.theme_description,
+    ):
+        digest.update(repr(value).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
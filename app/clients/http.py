@@ -0,0 +1,156 @@
+from threading import Lock
+from typing import Dict, Optional
+
+import httpx
+from loguru import logger
+
+from app.shared.config import cfg
+
+
+class HTTPClientMetrics:
+    def __init__(self):
+        """
+        Counts the requests sent through the shared HTTP client and how many of them had to open a new connection.
+        """
+        self.requests = 0
+        self.new_connections = 0
+        self._lock = Lock()
+
+    def on_request(self, request: httpx.Request) -> None:
+        """
+        Event hook that counts a request and asks the transport to report the connections it opens for it.
+
+        Args:
+            request (httpx.Request): The request about to be sent.
+        """
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def on_async_request(self, request: httpx.Request) -> None:
+        """
+        Async version of `on_request` for the shared async HTTP client.
+
+        Args:
+            request (httpx.Request): The request about to be sent.
+        """
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._async_trace
+
+    def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.new_connections += 1
+
+    async def _async_trace(self, event_name: str, info: dict) -> None:
+        self._trace(event_name, info)
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Retrieve the current counts.
+
+        Returns:
+            Dict[str, int]: The number of requests sent, connections opened and connections reused.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.requests - self.new_connections,
+            }
+
+
+http_client_metrics = HTTPClientMetrics()
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = Lock()
+_async_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Retrieve the process-wide HTTP client, creating it on first use.
+
+    The client keeps connections alive between requests so that calls to the same host (e.g. api.spotify.com)
+    skip the TCP and TLS handshakes. HTTP/2 is used when the `h2` package is installed.
+
+    Returns:
+        httpx.Client: The shared HTTP client.
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    http2=_http2_available(),
+                    limits=_limits(),
+                    timeout=_timeout(),
+                    event_hooks={"request": [http_client_metrics.on_request]},
+                )
+    return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Retrieve the process-wide async HTTP client, creating it on first use.
+
+    Must be called from the event loop the client is used on. It is configured the same way as the client from
+    `get_http_client`.
+
+    Returns:
+        httpx.AsyncClient: The shared async HTTP client.
+    """
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = httpx.AsyncClient(
+            http2=_http2_available(),
+            limits=_limits(),
+            timeout=_timeout(),
+            event_hooks={"request": [http_client_metrics.on_async_request]},
+        )
+    return _async_http_client
+
+
+def close_http_client() -> None:
+    """
+    Close the process-wide HTTP client and the connections it holds.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            logger.info(f"Closing HTTP client: {http_client_metrics.snapshot()}")
+            _http_client.close()
+            _http_client = None
+
+
+async def close_async_http_client() -> None:
+    """
+    Close the process-wide async HTTP client and the connections it holds.
+    """
+    global _async_http_client
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=cfg.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=cfg.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=cfg.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        cfg.HTTP_TIMEOUT_SECONDS, connect=cfg.HTTP_CONNECT_TIMEOUT_SECONDS
+    )
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
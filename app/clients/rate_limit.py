@@ -0,0 +1,195 @@
+import asyncio
+from email.utils import parsedate_to_datetime
+import random
+from threading import Lock
+import time
+from typing import Dict, Optional, Union
+
+from cachetools import TTLCache
+
+from app.shared.config import cfg
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        """
+        Token bucket that allows bursts of up to `capacity` requests and `rate` requests per second after that.
+
+        Args:
+            rate (float): Tokens added to the bucket per second.
+            capacity (int): Maximum number of tokens the bucket holds.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """
+        Take a token from the bucket, borrowing against future refills if it is empty.
+
+        Not thread safe, the caller holds the limiter's lock.
+
+        Args:
+            now (float): The current monotonic time.
+
+        Returns:
+            float: Seconds to wait before the reserved token may be used.
+        """
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class SpotifyRateLimiter:
+    def __init__(self):
+        """
+        Paces requests to the spotify api with an app wide budget and a budget for each user, and stops all
+        requests for as long as spotify asks to when it responds with 429 Too Many Requests.
+        """
+        self._app_bucket = TokenBucket(
+            cfg.SPOTIFY_APP_REQUESTS_PER_SECOND, cfg.SPOTIFY_APP_BURST
+        )
+        self._user_buckets: TTLCache = TTLCache(maxsize=10000, ttl=3600)
+        self._blocked_until = 0.0
+        self._lock = Lock()
+        self.queue_depth = 0
+        self.throttled = 0
+        self.retries = 0
+        self.delayed = 0
+
+    def _reserve(self, user_id: Optional[int]) -> float:
+        with self._lock:
+            now = time.monotonic()
+            delay = max(self._app_bucket.reserve(now), self._blocked_until - now)
+            if user_id is not None:
+                user_bucket = self._user_buckets.get(user_id)
+                if user_bucket is None:
+                    user_bucket = TokenBucket(
+                        cfg.SPOTIFY_USER_REQUESTS_PER_SECOND, cfg.SPOTIFY_USER_BURST
+                    )
+                    self._user_buckets[user_id] = user_bucket
+                delay = max(delay, user_bucket.reserve(now))
+            if delay > 0:
+                self.delayed += 1
+                self.queue_depth += 1
+            return delay
+
+    def _release(self, delay: float) -> None:
+        if delay > 0:
+            with self._lock:
+                self.queue_depth -= 1
+
+    def wait(self, user_id: Optional[int] = None) -> None:
+        """
+        Block until a request may be sent.
+
+        Args:
+            user_id (Optional[int], optional): ID of the user the request is made for. Defaults to None.
+        """
+        delay = self._reserve(user_id)
+        try:
+            if delay > 0:
+                time.sleep(delay)
+        finally:
+            self._release(delay)
+
+    async def wait_async(self, user_id: Optional[int] = None) -> None:
+        """
+        Wait, without blocking the event loop, until a request may be sent.
+
+        Args:
+            user_id (Optional[int], optional): ID of the user the request is made for. Defaults to None.
+        """
+        delay = self._reserve(user_id)
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+        finally:
+            self._release(delay)
+
+    def throttle(self, retry_after: Optional[str], attempt: int) -> float:
+        """
+        Record a 429 from spotify and hold back every request until spotify accepts requests again.
+
+        Args:
+            retry_after (Optional[str]): The Retry-After header of the 429 response.
+            attempt (int): The number of times the request has been tried so far.
+
+        Returns:
+            float: Seconds to wait before retrying the request.
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff(attempt)
+        with self._lock:
+            self.throttled += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        return delay
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Work out how long to wait before retrying a failed request, with full jitter.
+
+        Args:
+            attempt (int): The number of times the request has been tried so far.
+
+        Returns:
+            float: Seconds to wait before retrying the request.
+        """
+        with self._lock:
+            self.retries += 1
+        ceiling = min(
+            cfg.SPOTIFY_BACKOFF_MAX_SECONDS,
+            cfg.SPOTIFY_BACKOFF_BASE_SECONDS * 2**attempt,
+        )
+        return random.uniform(0, ceiling)
+
+    def snapshot(self) -> Dict[str, Union[int, float]]:
+        """
+        Retrieve the current counts.
+
+        Returns:
+            Dict[str, Union[int, float]]: The number of requests waiting, requests delayed, 429s received, retries
+                and seconds until spotify accepts requests again.
+        """
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "delayed": self.delayed,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "blocked_for_seconds": max(
+                    0.0, self._blocked_until - time.monotonic()
+                ),
+            }
+
+
+def parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, which is either a number of seconds or an HTTP date.
+
+    Args:
+        retry_after (Optional[str]): The header value.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+spotify_rate_limiter = SpotifyRateLimiter()
@@ -1,18 +1,158 @@
-from datetime import datetime
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timezone
 import json
-import requests
 import base64
-from typing import Dict, List
+from threading import Lock, RLock
+import time
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakValueDictionary
+import httpx
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm.session import Session
 from app import crud, schemas
+from app.clients.http import get_async_http_client
+from app.clients.http import get_http_client
+from app.clients.rate_limit import spotify_rate_limiter
 from app.models.user import User
 from app.shared.config import cfg
 
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+
+class SpotifyTokenCache:
+    def __init__(self):
+        """
+        In-process cache of spotify access tokens keyed by user id, shared by every SpotifyClient.
+        """
+        self._tokens: Dict[int, Tuple[str, float]] = {}
+        self._lock = Lock()
+
+    def get(self, user_id: int) -> Optional[str]:
+        """
+        Retrieve a user's access token if it is not about to expire.
+
+        Args:
+            user_id (int): ID of a user.
+
+        Returns:
+            Optional[str]: The cached access token, or None if there is none or it is due to be refreshed.
+        """
+        with self._lock:
+            cached = self._tokens.get(user_id)
+        if cached is None:
+            return None
+        access_token, expires_at = cached
+        refresh_at = expires_at - cfg.SPOTIFY_TOKEN_REFRESH_MARGIN_SECONDS
+        if refresh_at <= datetime.now(timezone.utc).timestamp():
+            return None
+        return access_token
+
+    def set(self, user_id: int, access_token: str, expires_at: float) -> None:
+        """
+        Cache a user's access token.
+
+        Args:
+            user_id (int): ID of a user.
+            access_token (str): The user's spotify access token.
+            expires_at (float): Timestamp in seconds at which spotify stops accepting the token.
+        """
+        with self._lock:
+            self._tokens[user_id] = (access_token, expires_at)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drop a user's access token from the cache.
+
+        Args:
+            user_id (int): ID of a user.
+        """
+        with self._lock:
+            self._tokens.pop(user_id, None)
+
+
+spotify_token_cache = SpotifyTokenCache()
+
+
+@dataclass
+class PlaylistWrite:
+    added: int
+    snapshot_id: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+def get_token_expires_at(user: User) -> Optional[float]:
+    """
+    Work out when the user's stored access token expires.
+
+    Args:
+        user (User): A user model object.
+
+    Returns:
+        Optional[float]: Timestamp in seconds at which the token expires, or None when it is not known.
+    """
+    if user.spotify_accessed_date is None or user.spotify_token_expires_in is None:
+        return None
+    accessed_date = user.spotify_accessed_date
+    if accessed_date.tzinfo is None:
+        accessed_date = accessed_date.replace(tzinfo=timezone.utc)
+    return accessed_date.timestamp() + user.spotify_token_expires_in
+
+
+def has_fresh_access_token(user: User) -> bool:
+    """
+    Check whether the user's stored access token can be used without refreshing it first.
+
+    The token's expiry is tracked from when it was issued rather than by asking spotify, so a token is only
+    considered stale once it is within `cfg.SPOTIFY_TOKEN_REFRESH_MARGIN_SECONDS` of expiring.
+
+    Args:
+        user (User): A user model object.
+
+    Returns:
+        bool: True if the access token is not about to expire.
+    """
+    cached_access_token = spotify_token_cache.get(user.id)
+    if (
+        cached_access_token is not None
+        and cached_access_token == user.spotify_access_token
+    ):
+        return True
+
+    expires_at = get_token_expires_at(user)
+    if expires_at is None:
+        return False
+    spotify_token_cache.set(user.id, user.spotify_access_token, expires_at)
+    return spotify_token_cache.get(user.id) is not None
+
+
+def get_basic_auth(client_id: str, client_secret: str) -> str:
+    """
+    Build the Authorization header value for requests to the spotify accounts service.
+
+    Args:
+        client_id (str): The app's spotify client ID.
+        client_secret (str): The app's spotify client secret.
+
+    Returns:
+        str: The basic auth header value.
+    """
+    return f"Basic {base64.urlsafe_b64encode((client_id + ':' + client_secret).encode()).decode()}"
+
 
 class SpotifyClient:
     def __init__(self, client_id: str, client_secret: str):
         self.client_id = client_id
         self.client_secret = client_secret
+        # the client can be shared by worker threads, which take turns using the caller's session
+        self._session_lock = RLock()
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """
+        The process-wide HTTP client, so that every SpotifyClient shares one pool of keep-alive connections.
+        """
+        return get_http_client()
 
     def get_access_refresh_tokens(self, code) -> Dict:
         """
@@ -22,10 +162,11 @@ class SpotifyClient:
             code (str): an authorization code returned from spotify.
 
         Returns:
-            Dict: the json data response from the access token request.
+            Tuple[str, str, str, int]: the access token, refresh token, spotify user id and the number of seconds
+                the access token is valid for.
         """
         # get access token
-        response = requests.post(
+        response = self.http_client.post(
             "https://accounts.spotify.com/api/token",
             data={
                 "grant_type": "authorization_code",
@@ -34,7 +175,7 @@ class SpotifyClient:
             },
             headers={
                 "Content-Type": "application/x-www-form-urlencoded",
-                "Authorization": f"Basic {base64.urlsafe_b64encode((self.client_id + ':' + self.client_secret).encode()).decode()}",
+                "Authorization": get_basic_auth(self.client_id, self.client_secret),
             },
         )
 
@@ -44,9 +185,10 @@ class SpotifyClient:
         data = response.json()
         access_token = data["access_token"]
         refresh_token = data["refresh_token"]
+        expires_in = data.get("expires_in", 3600)
 
         # get user id
-        response = requests.get(
+        response = self.http_client.get(
             "https://api.spotify.com/v1/me",
             headers={
                 "Content-Type": "application/x-www-form-urlencoded",
@@ -60,39 +202,42 @@ class SpotifyClient:
         data = response.json()
         spotify_user_id = data["id"]
 
-        return access_token, refresh_token, spotify_user_id
+        return access_token, refresh_token, spotify_user_id, expires_in
 
     def get_user_access_token(self, session: Session, user_id: int) -> User:
         """
-        Retrieve the access token for a user given their ID.
+        Retrieve the user given their ID with an access token that is not about to expire.
 
         Args:
             session (Session): A SQLAlchemy Session object that is connected to the database.
             user_id (int): ID of a user.
 
         Returns:
-            User: The user with an updated access token.
+            User: The user with a valid access token.
         """
-        user = crud.user.get(session=session, id=user_id)
+        with self._session_lock:
+            user = crud.user.get(session=session, id=user_id)
 
-        # check to see if the user's access token is still valid
-        response = requests.get(
-            "https://api.spotify.com/v1/me",
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded",
-                "Authorization": f"Bearer {user.spotify_access_token}",
-            },
-        )
-        # if the user's access token is not expired, return the user with current access token
-        if response.status_code == 200:
-            return user
-        elif (
-            response.status_code == 401
-            or response.status_code == 400
-            or response.status_code == 403
-        ):
-            # refresh the user's access token
-            response = requests.post(
+            if has_fresh_access_token(user):
+                return user
+
+            return self.refresh_user_access_token(session, user)
+
+    def refresh_user_access_token(self, session: Session, user: User) -> User:
+        """
+        Exchange the user's refresh token for a new access token.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user (User): The user whose access token is being refreshed.
+
+        Returns:
+            User: The user with the new access token.
+        """
+        with self._session_lock:
+            spotify_token_cache.invalidate(user.id)
+
+            response = self.http_client.post(
                 "https://accounts.spotify.com/api/token",
                 data={
                     "grant_type": "refresh_token",
@@ -100,7 +245,9 @@ class SpotifyClient:
                 },
                 headers={
                     "Content-Type": "application/x-www-form-urlencoded",
-                    "Authorization": f"Basic {base64.urlsafe_b64encode((self.client_id + ':' + self.client_secret).encode()).decode()}",
+                    "Authorization": get_basic_auth(
+                        self.client_id, self.client_secret
+                    ),
                 },
             )
 
@@ -111,14 +258,77 @@ class SpotifyClient:
             object_in = schemas.UserUpdate(
                 spotify_linked=True,
                 spotify_access_token=data["access_token"],
-                spotify_accessed_date=datetime.utcnow(),
+                spotify_accessed_date=datetime.now(timezone.utc),
+                spotify_token_expires_in=data.get("expires_in", 3600),
             )
+            # spotify may rotate the refresh token
+            if "refresh_token" in data:
+                object_in.spotify_refresh_token = data["refresh_token"]
 
-            return crud.user.update(
+            user = crud.user.update(
                 session=session, db_object=user, object_in=object_in
             )
-        else:
-            response.raise_for_status()
+            spotify_token_cache.set(
+                user.id, user.spotify_access_token, get_token_expires_at(user)
+            )
+
+            return user
+
+    def _request(
+        self, method: str, url: str, session: Session, user: User, **kwargs
+    ) -> httpx.Response:
+        """
+        Helper function to send a request to the spotify api on behalf of a user.
+
+        The request waits for the app's and the user's rate limits. The user's access token is refreshed and the
+        request sent again once if spotify rejects the token. A 429 or a 5xx from spotify is retried up to
+        `cfg.SPOTIFY_MAX_RETRIES` times, after the Retry-After or a jittered backoff.
+
+        Args:
+            method (str): HTTP method of the request.
+            url (str): URL of the request.
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user (User): The user the request is made for, as returned by `get_user_access_token`.
+            kwargs: Any other arguments to pass to the HTTP client.
+
+        Returns:
+            httpx.Response: The spotify response.
+        """
+        headers = kwargs.pop("headers", {})
+        refreshed = False
+        # read the user once, another thread committing the session would expire it
+        with self._session_lock:
+            user_id, access_token = user.id, user.spotify_access_token
+
+        for attempt in range(cfg.SPOTIFY_MAX_RETRIES + 1):
+            spotify_rate_limiter.wait(user_id)
+            response = self.http_client.request(
+                method,
+                url,
+                headers={
+                    **headers,
+                    "Authorization": f"Bearer {access_token}",
+                },
+                **kwargs,
+            )
+            if attempt == cfg.SPOTIFY_MAX_RETRIES:
+                break
+            if response.status_code == 401 and not refreshed:
+                with self._session_lock:
+                    user = self.refresh_user_access_token(session, user)
+                    access_token = user.spotify_access_token
+                refreshed = True
+            elif response.status_code == 429:
+                # the limiter holds back every request until the Retry-After has passed
+                spotify_rate_limiter.throttle(
+                    response.headers.get("Retry-After"), attempt
+                )
+            elif response.status_code in RETRY_STATUS_CODES:
+                time.sleep(spotify_rate_limiter.backoff(attempt))
+            else:
+                break
+
+        return response
 
     def create_playlist(
         self,
@@ -141,9 +351,12 @@ class SpotifyClient:
         """
         user = self.get_user_access_token(session, user_id)
 
-        response = requests.post(
+        response = self._request(
+            "POST",
             f"https://api.spotify.com/v1/users/{user.spotify_user_id}/playlists",
-            data=json.dumps(
+            session,
+            user,
+            content=json.dumps(
                 {
                     "name": playlist_name,
                     "description": playlist_description,
@@ -152,7 +365,6 @@ class SpotifyClient:
             ),
             headers={
                 "Content-Type": "application/json",
-                "Authorization": f"Bearer {user.spotify_access_token}",
             },
         )
         if response.status_code != 201:
@@ -161,32 +373,40 @@ class SpotifyClient:
         return response.json()
 
     def add_songs_to_playlist(
-        self, playlist_id: str, uris: List[str], session: Session, user_id: int
+        self,
+        playlist_id: str,
+        uris: List[str],
+        session: Session,
+        user_id: int,
+        position: Optional[int] = None,
     ) -> Dict:
         """
         Add songs to an existing Spotify playlist.
 
         Args:
             playlist_id (str): The Spotify ID of the playlist to add to.
-            uris (List[str]): A list of Spotify track URIs to be added to the playlist.
+            uris (List[str]): A list of at most 100 Spotify track URIs to be added to the playlist.
             session (Session): A SQLAlchemy Session object that is connected to the database.
             user_id (int): ID of the user who's playlist is being added to.
+            position (Optional[int], optional): Index in the playlist to insert the songs at. Defaults to None,
+                adding them to the end.
 
         Returns:
             Dict: The response from Spotify after adding the tracks.
         """
         user = self.get_user_access_token(session, user_id)
 
-        response = requests.post(
+        body = {"uris": uris}
+        if position is not None:
+            body["position"] = position
+        response = self._request(
+            "POST",
             f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks",
-            data=json.dumps(
-                {
-                    "uris": uris,
-                }
-            ),
+            session,
+            user,
+            content=json.dumps(body),
             headers={
                 "Content-Type": "application/json",
-                "Authorization": f"Bearer {user.spotify_access_token}",
             },
         )
         if response.status_code != 201:
@@ -194,6 +414,55 @@ class SpotifyClient:
 
         return response.json()
 
+    def add_songs_to_playlist_in_chunks(
+        self,
+        playlist_id: str,
+        uris: List[str],
+        session: Session,
+        user_id: int,
+        position: Optional[int] = None,
+        start: int = 0,
+    ) -> PlaylistWrite:
+        """
+        Add any number of songs to an existing Spotify playlist, `cfg.SPOTIFY_PLAYLIST_CHUNK_SIZE` at a time.
+
+        Spotify takes at most 100 songs per request. The chunks are sent one after another over the shared
+        connection pool, each inserted right after the one before it when a position is given, so the songs
+        keep their order. Sending stops at the first chunk that fails, pass the number of songs that were added
+        as `start` to carry on from there.
+
+        Args:
+            playlist_id (str): The Spotify ID of the playlist to add to.
+            uris (List[str]): A list of Spotify track URIs to be added to the playlist.
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user_id (int): ID of the user who's playlist is being added to.
+            position (Optional[int], optional): Index in the playlist to insert the first of `uris` at. Defaults to
+                None, adding the songs to the end.
+            start (int, optional): Number of songs at the start of `uris` that were already added. Defaults to 0.
+
+        Returns:
+            PlaylistWrite: The number of songs from the start of `uris` that are in the playlist, the playlist's
+                latest snapshot id and the error that stopped the rest from being added, if any.
+        """
+        write = PlaylistWrite(added=start)
+        for offset in range(start, len(uris), cfg.SPOTIFY_PLAYLIST_CHUNK_SIZE):
+            chunk = uris[offset : offset + cfg.SPOTIFY_PLAYLIST_CHUNK_SIZE]
+            try:
+                response = self.add_songs_to_playlist(
+                    playlist_id,
+                    chunk,
+                    session,
+                    user_id,
+                    position=None if position is None else position + offset,
+                )
+            except Exception as e:
+                write.error = e
+                break
+            write.added += len(chunk)
+            write.snapshot_id = response.get("snapshot_id")
+
+        return write
+
     def update_playlist_details(
         self, playlist_id, playlist_name, playlist_description, session, user_id
     ):
@@ -212,9 +481,12 @@ class SpotifyClient:
         """
         user = self.get_user_access_token(session, user_id)
 
-        response = requests.put(
+        response = self._request(
+            "PUT",
             f"https://api.spotify.com/v1/playlists/{playlist_id}",
-            data=json.dumps(
+            session,
+            user,
+            content=json.dumps(
                 {
                     "name": playlist_name,
                     "description": playlist_description,
@@ -222,7 +494,6 @@ class SpotifyClient:
             ),
             headers={
                 "Content-Type": "application/json",
-                "Authorization": f"Bearer {user.spotify_access_token}",
             },
         )
         if response.status_code != 201:
@@ -245,11 +516,439 @@ class SpotifyClient:
         user = self.get_user_access_token(session, user_id)
 
         # get track info
-        response = requests.get(
+        response = self._request(
+            "GET",
+            f"https://api.spotify.com/v1/tracks/{track_id}",
+            session,
+            user,
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+            },
+        )
+
+        if response.status_code != 200:
+            response.raise_for_status()
+
+        return response.json()
+
+
+class AsyncSpotifyClient:
+    def __init__(self, client_id: str, client_secret: str):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        # database work runs in worker threads, which take turns using the caller's session
+        self._session_lock = RLock()
+        # one token refresh at a time per user, the lock is dropped once nobody waits on it
+        self._refresh_locks: WeakValueDictionary = WeakValueDictionary()
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """
+        The process-wide async HTTP client, so that every AsyncSpotifyClient shares one pool of keep-alive connections.
+        """
+        return get_async_http_client()
+
+    async def get_access_refresh_tokens(self, code) -> Dict:
+        """
+        Retrieve the initial access and refresh tokens with the given code and then get the user info.
+
+        Args:
+            code (str): an authorization code returned from spotify.
+
+        Returns:
+            Tuple[str, str, str, int]: the access token, refresh token, spotify user id and the number of seconds
+                the access token is valid for.
+        """
+        # get access token
+        response = await self.http_client.post(
+            "https://accounts.spotify.com/api/token",
+            data={
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": cfg.SPOTIFY_CALLBACK_URI,
+            },
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Authorization": get_basic_auth(self.client_id, self.client_secret),
+            },
+        )
+
+        if response.status_code != 200:
+            response.raise_for_status()
+
+        data = response.json()
+        access_token = data["access_token"]
+        refresh_token = data["refresh_token"]
+        expires_in = data.get("expires_in", 3600)
+
+        # get user id
+        response = await self.http_client.get(
+            "https://api.spotify.com/v1/me",
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Authorization": f"Bearer {access_token}",
+            },
+        )
+
+        if response.status_code != 200:
+            response.raise_for_status()
+
+        data = response.json()
+        spotify_user_id = data["id"]
+
+        return access_token, refresh_token, spotify_user_id, expires_in
+
+    async def get_user_access_token(self, session: Session, user_id: int) -> User:
+        """
+        Retrieve the user given their ID with an access token that is not about to expire.
+
+        The database is read from a worker thread. When the token has to be refreshed, concurrent callers for the
+        same user wait for a single refresh instead of each spending the refresh token.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user_id (int): ID of a user.
+
+        Returns:
+            User: The user with a valid access token.
+        """
+        user = await run_in_threadpool(self._get_user, session, user_id)
+
+        if has_fresh_access_token(user):
+            return user
+
+        async with self._get_refresh_lock(user_id):
+            # another request may have refreshed the token while this one waited
+            user = await run_in_threadpool(self._get_user, session, user_id, True)
+            if has_fresh_access_token(user):
+                return user
+            return await self._refresh_user_access_token(session, user)
+
+    async def refresh_user_access_token(self, session: Session, user: User) -> User:
+        """
+        Exchange the user's refresh token for a new access token.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user (User): The user whose access token is being refreshed.
+
+        Returns:
+            User: The user with the new access token.
+        """
+        async with self._get_refresh_lock(user.id):
+            return await self._refresh_user_access_token(session, user)
+
+    def _get_refresh_lock(self, user_id: int) -> asyncio.Lock:
+        lock = self._refresh_locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._refresh_locks[user_id] = lock
+        return lock
+
+    def _get_user(self, session: Session, user_id: int, reload: bool = False) -> User:
+        with self._session_lock:
+            user = crud.user.get(session=session, id=user_id)
+            if reload:
+                session.refresh(user)
+            return user
+
+    def _update_user(
+        self, session: Session, user: User, object_in: schemas.UserUpdate
+    ) -> User:
+        with self._session_lock:
+            return crud.user.update(
+                session=session, db_object=user, object_in=object_in
+            )
+
+    async def _refresh_user_access_token(self, session: Session, user: User) -> User:
+        # callers hold the user's refresh lock
+        spotify_token_cache.invalidate(user.id)
+
+        response = await self.http_client.post(
+            "https://accounts.spotify.com/api/token",
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": user.spotify_refresh_token,
+            },
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Authorization": get_basic_auth(self.client_id, self.client_secret),
+            },
+        )
+
+        if response.status_code != 200:
+            response.raise_for_status()
+
+        data = response.json()
+        object_in = schemas.UserUpdate(
+            spotify_linked=True,
+            spotify_access_token=data["access_token"],
+            spotify_accessed_date=datetime.now(timezone.utc),
+            spotify_token_expires_in=data.get("expires_in", 3600),
+        )
+        # spotify may rotate the refresh token
+        if "refresh_token" in data:
+            object_in.spotify_refresh_token = data["refresh_token"]
+
+        user = await run_in_threadpool(self._update_user, session, user, object_in)
+        spotify_token_cache.set(
+            user.id, user.spotify_access_token, get_token_expires_at(user)
+        )
+
+        return user
+
+    async def _request(
+        self, method: str, url: str, session: Session, user: User, **kwargs
+    ) -> httpx.Response:
+        """
+        Helper function to send a request to the spotify api on behalf of a user.
+
+        The request waits for the app's and the user's rate limits. The user's access token is refreshed and the
+        request sent again once if spotify rejects the token, unless a concurrent request refreshed it already. A
+        429 or a 5xx from spotify is retried up to `cfg.SPOTIFY_MAX_RETRIES` times, after the Retry-After or a
+        jittered backoff.
+
+        Args:
+            method (str): HTTP method of the request.
+            url (str): URL of the request.
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user (User): The user the request is made for, as returned by `get_user_access_token`.
+            kwargs: Any other arguments to pass to the HTTP client.
+
+        Returns:
+            httpx.Response: The spotify response.
+        """
+        headers = kwargs.pop("headers", {})
+        refreshed = False
+        user_id, access_token = user.id, user.spotify_access_token
+
+        for attempt in range(cfg.SPOTIFY_MAX_RETRIES + 1):
+            await spotify_rate_limiter.wait_async(user_id)
+            response = await self.http_client.request(
+                method,
+                url,
+                headers={
+                    **headers,
+                    "Authorization": f"Bearer {access_token}",
+                },
+                **kwargs,
+            )
+            if attempt == cfg.SPOTIFY_MAX_RETRIES:
+                break
+            if response.status_code == 401 and not refreshed:
+                async with self._get_refresh_lock(user_id):
+                    user = await run_in_threadpool(
+                        self._get_user, session, user_id, True
+                    )
+                    if user.spotify_access_token == access_token:
+                        user = await self._refresh_user_access_token(session, user)
+                    access_token = user.spotify_access_token
+                refreshed = True
+            elif response.status_code == 429:
+                # the limiter holds back every request until the Retry-After has passed
+                spotify_rate_limiter.throttle(
+                    response.headers.get("Retry-After"), attempt
+                )
+            elif response.status_code in RETRY_STATUS_CODES:
+                await asyncio.sleep(spotify_rate_limiter.backoff(attempt))
+            else:
+                break
+
+        return response
+
+    async def create_playlist(
+        self,
+        playlist_name: str,
+        playlist_description: str,
+        session: Session,
+        user_id: int,
+    ) -> Dict:
+        """
+        Create a Spotify playlist for the user specified by user_id.
+
+        Args:
+            playlist_name (str): Name of the playlist to create.
+            playlist_description (str): Description of the playlist to create.
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user_id (int): ID of the user to create a playlist for.
+
+        Returns:
+            Dict: The response from Spotify with the playlist details.
+        """
+        user = await self.get_user_access_token(session, user_id)
+
+        response = await self._request(
+            "POST",
+            f"https://api.spotify.com/v1/users/{user.spotify_user_id}/playlists",
+            session,
+            user,
+            content=json.dumps(
+                {
+                    "name": playlist_name,
+                    "description": playlist_description,
+                    "public": True,
+                }
+            ),
+            headers={
+                "Content-Type": "application/json",
+            },
+        )
+        if response.status_code != 201:
+            response.raise_for_status()
+
+        return response.json()
+
+    async def add_songs_to_playlist(
+        self,
+        playlist_id: str,
+        uris: List[str],
+        session: Session,
+        user_id: int,
+        position: Optional[int] = None,
+    ) -> Dict:
+        """
+        Add songs to an existing Spotify playlist.
+
+        Args:
+            playlist_id (str): The Spotify ID of the playlist to add to.
+            uris (List[str]): A list of at most 100 Spotify track URIs to be added to the playlist.
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user_id (int): ID of the user who's playlist is being added to.
+            position (Optional[int], optional): Index in the playlist to insert the songs at. Defaults to None,
+                adding them to the end.
+
+        Returns:
+            Dict: The response from Spotify after adding the tracks.
+        """
+        user = await self.get_user_access_token(session, user_id)
+
+        body = {"uris": uris}
+        if position is not None:
+            body["position"] = position
+        response = await self._request(
+            "POST",
+            f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks",
+            session,
+            user,
+            content=json.dumps(body),
+            headers={
+                "Content-Type": "application/json",
+            },
+        )
+        if response.status_code != 201:
+            response.raise_for_status()
+
+        return response.json()
+
+    async def add_songs_to_playlist_in_chunks(
+        self,
+        playlist_id: str,
+        uris: List[str],
+        session: Session,
+        user_id: int,
+        position: Optional[int] = None,
+        start: int = 0,
+    ) -> PlaylistWrite:
+        """
+        Add any number of songs to an existing Spotify playlist, `cfg.SPOTIFY_PLAYLIST_CHUNK_SIZE` at a time.
+
+        Spotify takes at most 100 songs per request. The chunks are sent one after another over the shared
+        connection pool, each inserted right after the one before it when a position is given, so the songs
+        keep their order. Sending stops at the first chunk that fails, pass the number of songs that were added
+        as `start` to carry on from there.
+
+        Args:
+            playlist_id (str): The Spotify ID of the playlist to add to.
+            uris (List[str]): A list of Spotify track URIs to be added to the playlist.
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user_id (int): ID of the user who's playlist is being added to.
+            position (Optional[int], optional): Index in the playlist to insert the first of `uris` at. Defaults to
+                None, adding the songs to the end.
+            start (int, optional): Number of songs at the start of `uris` that were already added. Defaults to 0.
+
+        Returns:
+            PlaylistWrite: The number of songs from the start of `uris` that are in the playlist, the playlist's
+                latest snapshot id and the error that stopped the rest from being added, if any.
+        """
+        write = PlaylistWrite(added=start)
+        for offset in range(start, len(uris), cfg.SPOTIFY_PLAYLIST_CHUNK_SIZE):
+            chunk = uris[offset : offset + cfg.SPOTIFY_PLAYLIST_CHUNK_SIZE]
+            try:
+                response = await self.add_songs_to_playlist(
+                    playlist_id,
+                    chunk,
+                    session,
+                    user_id,
+                    position=None if position is None else position + offset,
+                )
+            except Exception as e:
+                write.error = e
+                break
+            write.added += len(chunk)
+            write.snapshot_id = response.get("snapshot_id")
+
+        return write
+
+    async def update_playlist_details(
+        self, playlist_id, playlist_name, playlist_description, session, user_id
+    ):
+        """
+        Update an existing playlist's name and description.
+
+        Args:
+            playlist_id (str): The Spotify ID of the playlist to add to.
+            playlist_name (str): The new name of the playlist.
+            playlist_description (str): The new description of the playlist.
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user_id (int): ID of the user who's playlist is being updated.
+
+        Returns:
+            Dict: The response from Spotify after updating the playlist.
+        """
+        user = await self.get_user_access_token(session, user_id)
+
+        response = await self._request(
+            "PUT",
+            f"https://api.spotify.com/v1/playlists/{playlist_id}",
+            session,
+            user,
+            content=json.dumps(
+                {
+                    "name": playlist_name,
+                    "description": playlist_description,
+                }
+            ),
+            headers={
+                "Content-Type": "application/json",
+            },
+        )
+        if response.status_code != 201:
+            response.raise_for_status()
+
+        return response
+
+    async def get_track_info(self, track_id: str, session: Session, user_id: int) -> Dict:
+        """
+        Get the track details from Spotify for a given track_id
+
+        Args:
+            track_id (str): The Spotify ID of the track being retreived.
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user_id (int): The ID of the user who's crednetials are being used to look the track up.
+
+        Returns:
+            Dict: The Spotify response with the track details.
+        """
+        user = await self.get_user_access_token(session, user_id)
+
+        # get track info
+        response = await self._request(
+            "GET",
             f"https://api.spotify.com/v1/tracks/{track_id}",
+            session,
+            user,
             headers={
                 "Content-Type": "application/x-www-form-urlencoded",
-                "Authorization": f"Bearer {user.spotify_access_token}",
             },
         )
 
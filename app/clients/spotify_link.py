@@ -0,0 +1,206 @@
+import asyncio
+import json
+import os
+import re
+from threading import Lock
+import time
+from typing import Optional
+from urllib.parse import urljoin
+
+import httpx
+from cachetools import LRUCache
+from fastapi.concurrency import run_in_threadpool
+from loguru import logger
+
+from app.clients.http import get_async_http_client
+from app.shared.config import cfg
+
+TRACK_URL_PATTERN = re.compile(
+    r"https://open\.spotify\.com/(?:intl-[a-zA-Z-]+/)?track/([a-zA-Z0-9]+)"
+)
+
+
+def is_short_link(link: str) -> bool:
+    """
+    Check whether a link is a `spotify.link` short link, which has to be followed to find the track it shares.
+
+    Args:
+        link (str): A link to a spotify track.
+
+    Returns:
+        bool: True if the link is a short link.
+    """
+    return "//spotify.link/" in link
+
+
+class SpotifyLinkResolver:
+    def __init__(self, path: Optional[str] = None):
+        """
+        Resolves `spotify.link` short links to track ids, remembering the links it has resolved.
+
+        Short links never change what they point to, so resolved links are kept in a bounded LRU cache and, when a
+        path is given, in a JSON file that is loaded again on startup. The file is rewritten off the event loop at
+        most every `cfg.SPOTIFY_LINK_FLUSH_INTERVAL_SECONDS` and when the app shuts down, see `flush`.
+
+        Args:
+            path (Optional[str], optional): File to persist resolved links to. Defaults to None.
+        """
+        self._track_ids = LRUCache(maxsize=cfg.SPOTIFY_LINK_CACHE_SIZE)
+        self._lock = Lock()
+        self._file_lock = Lock()
+        self._path = path
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+        self._load()
+
+    def get(self, link: str) -> Optional[str]:
+        """
+        Retrieve the track id a short link was resolved to before.
+
+        Args:
+            link (str): A short link.
+
+        Returns:
+            Optional[str]: The track id, or None if the link has not been resolved yet.
+        """
+        with self._lock:
+            return self._track_ids.get(_cache_key(link))
+
+    def set(self, link: str, track_id: str) -> None:
+        """
+        Remember the track id a short link resolves to.
+
+        Args:
+            link (str): A short link.
+            track_id (str): The id of the track it points to.
+        """
+        with self._lock:
+            self._track_ids[_cache_key(link)] = track_id
+            self._dirty = True
+
+    def flush(self) -> None:
+        """
+        Write the resolved links to the file, if any were resolved since it was last written.
+
+        This blocks on file IO, call it from a thread when on the event loop.
+        """
+        if self._path is None:
+            return
+        with self._file_lock:
+            with self._lock:
+                self._flushed_at = time.monotonic()
+                if not self._dirty:
+                    return
+                track_ids = dict(self._track_ids)
+                self._dirty = False
+            if not self._save(track_ids):
+                with self._lock:
+                    self._dirty = True
+
+    async def resolve(
+        self, link: str, client: Optional[httpx.AsyncClient] = None
+    ) -> Optional[str]:
+        """
+        Resolve a short link to the id of the track it shares.
+
+        Redirects are followed one at a time without reading their bodies, most short links redirect straight to
+        the track's page. Only when the redirects end at a page that does not name the track is the start of that
+        page read to find it. The whole lookup gives up after `cfg.SPOTIFY_LINK_TIMEOUT_SECONDS`.
+
+        Args:
+            link (str): A short link.
+            client (Optional[httpx.AsyncClient], optional): Client to follow the link with. Defaults to the
+                process-wide async HTTP client.
+
+        Raises:
+            httpx.HTTPError: When the link cannot be followed.
+
+        Returns:
+            Optional[str]: The track id, or None if the link does not lead to a track or took too long to follow.
+        """
+        track_id = self.get(link)
+        if track_id is not None:
+            return track_id
+
+        try:
+            track_id = await asyncio.wait_for(
+                self._follow(link, client or get_async_http_client()),
+                timeout=cfg.SPOTIFY_LINK_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out resolving spotify short link {link}")
+            return None
+
+        if track_id is not None:
+            self.set(link, track_id)
+            if self._flush_due():
+                await run_in_threadpool(self.flush)
+        return track_id
+
+    def _flush_due(self) -> bool:
+        with self._lock:
+            return (
+                self._path is not None
+                and self._dirty
+                and time.monotonic() - self._flushed_at
+                >= cfg.SPOTIFY_LINK_FLUSH_INTERVAL_SECONDS
+            )
+
+    async def _follow(self, link: str, client: httpx.AsyncClient) -> Optional[str]:
+        url = link
+        for _ in range(cfg.SPOTIFY_LINK_MAX_REDIRECTS + 1):
+            match = TRACK_URL_PATTERN.search(url)
+            if match:
+                return match.group(1)
+
+            async with client.stream("GET", url, follow_redirects=False) as response:
+                if response.is_redirect:
+                    location = response.headers.get("location")
+                    if location is None:
+                        return None
+                    url = urljoin(str(response.url), location)
+                    continue
+
+                response.raise_for_status()
+                body = b""
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    match = TRACK_URL_PATTERN.search(body.decode(errors="ignore"))
+                    if match:
+                        return match.group(1)
+                    if len(body) >= cfg.SPOTIFY_LINK_MAX_BODY_BYTES:
+                        break
+                return None
+        return None
+
+    def _load(self) -> None:
+        if self._path is None or not os.path.exists(self._path):
+            return
+        try:
+            with open(self._path) as file:
+                track_ids = json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load spotify short links from {self._path}: {e}")
+            return
+        for link, track_id in list(track_ids.items())[-self._track_ids.maxsize :]:
+            self._track_ids[link] = track_id
+
+    def _save(self, track_ids: dict) -> bool:
+        # write to a temporary file first so a crash never leaves a half written cache behind
+        temporary_path = f"{self._path}.tmp"
+        try:
+            with open(temporary_path, "w") as file:
+                json.dump(track_ids, file)
+            os.replace(temporary_path, self._path)
+        except OSError as e:
+            logger.warning(f"Could not save spotify short links to {self._path}: {e}")
+            return False
+        return True
+
+
+def _cache_key(link: str) -> str:
+    # tracking parameters do not change where a short link points
+    return link.strip().split("?")[0].rstrip("/")
+
+
+spotify_link_resolver = SpotifyLinkResolver(cfg.SPOTIFY_LINK_CACHE_PATH)
@@ -8,6 +8,7 @@ from fastapi.security.utils import get_authorization_scheme_param
 from sqlalchemy.orm.session import Session
 from jose import jwt
 
+from app.crud.crud_user import USER_PAYLOAD_OPTIONS
 from app.models.user import User
 from app.shared.config import cfg
 from app.core.security import verify_password
@@ -63,7 +64,12 @@ def authenticate(*, email: str, password: str, session: Session) -> Optional[Use
     Returns:
         Optional[User]: The authenticated user.
     """
-    user = session.query(User).filter(User.email == email).first()
+    user = (
+        session.query(User)
+        .options(*USER_PAYLOAD_OPTIONS)
+        .filter(User.email == email)
+        .first()
+    )
     if not user or not verify_password(password, user.password):
         return None
 
@@ -0,0 +1,141 @@
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.session import Session
+
+from app.models.user import User
+from app.shared.config import cfg
+
+
+class TokenCache:
+    def __init__(self):
+        """
+        In-process cache of the JWTs decoded recently, mapping each token to the id of the user it was issued to.
+
+        A token is only trusted until its own expiry, so caching it never extends its lifetime.
+        """
+        self._tokens = TTLCache(
+            maxsize=cfg.AUTH_TOKEN_CACHE_SIZE, ttl=cfg.AUTH_TOKEN_CACHE_TTL_SECONDS
+        )
+        self._lock = Lock()
+
+    def get(self, token: str) -> Optional[str]:
+        """
+        Retrieve the user id a token was issued to, if the token was decoded recently and has not expired.
+
+        Args:
+            token (str): A JWT.
+
+        Returns:
+            Optional[str]: The token's subject, or None if the token has to be decoded.
+        """
+        with self._lock:
+            cached = self._tokens.get(token)
+        if cached is None:
+            return None
+        user_id, expires_at = cached
+        if expires_at <= datetime.now(timezone.utc).timestamp():
+            self.invalidate(token)
+            return None
+        return user_id
+
+    def set(self, token: str, user_id: str, expires_at: float) -> None:
+        """
+        Cache the user id a token was issued to.
+
+        Args:
+            token (str): A JWT that was just verified.
+            user_id (str): The token's subject.
+            expires_at (float): Timestamp in seconds of the token's `exp` claim.
+        """
+        with self._lock:
+            self._tokens[token] = (user_id, expires_at)
+
+    def invalidate(self, token: str) -> None:
+        """
+        Drop a token from the cache.
+
+        Args:
+            token (str): A JWT.
+        """
+        with self._lock:
+            self._tokens.pop(token, None)
+
+    def clear(self) -> None:
+        """
+        Forget every cached token.
+        """
+        with self._lock:
+            self._tokens.clear()
+
+
+class UserCache:
+    def __init__(self):
+        """
+        In-process cache of the column values of recently authenticated users, keyed by user id.
+
+        Only column values are kept, never a model object, since those belong to the session that loaded them.
+        Updating or deleting a user through `crud.user` invalidates the entry, other processes notice once it
+        expires.
+        """
+        self._users = TTLCache(
+            maxsize=cfg.AUTH_USER_CACHE_SIZE, ttl=cfg.AUTH_USER_CACHE_TTL_SECONDS
+        )
+        self._lock = Lock()
+
+    def get(self, session: Session, user_id: int) -> Optional[User]:
+        """
+        Rebuild a cached user in the given session without querying the database.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user_id (int): ID of a user.
+
+        Returns:
+            Optional[User]: The user attached to the session, or None if it is not cached.
+        """
+        with self._lock:
+            values = self._users.get(int(user_id))
+        if values is None:
+            return None
+        user = User(**values)
+        make_transient_to_detached(user)
+        return session.merge(user, load=False)
+
+    def set(self, user: User) -> None:
+        """
+        Cache a user's column values.
+
+        Args:
+            user (User): A user model object loaded from the database.
+        """
+        values: Dict[str, Any] = {
+            attribute.key: getattr(user, attribute.key)
+            for attribute in User.__mapper__.column_attrs
+        }
+        with self._lock:
+            self._users[user.id] = values
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drop a user from the cache.
+
+        Args:
+            user_id (int): ID of a user.
+        """
+        with self._lock:
+            self._users.pop(int(user_id), None)
+
+    def clear(self) -> None:
+        """
+        Forget every cached user.
+        """
+        with self._lock:
+            self._users.clear()
+
+
+token_cache = TokenCache()
+user_cache = UserCache()
@@ -0,0 +1,112 @@
+from threading import Lock
+
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.session import Session
+
+from app import crud
+from app.shared.config import cfg
+
+
+class MembershipCache:
+    def __init__(self):
+        """
+        In-process cache of the sotw memberships confirmed recently, keyed by user id and sotw id.
+
+        Only memberships are cached, so a user who joins a sotw is let in straight away. Leaving a sotw
+        invalidates the entry, other processes notice once it expires.
+        """
+        self._members = TTLCache(
+            maxsize=cfg.MEMBERSHIP_CACHE_SIZE, ttl=cfg.MEMBERSHIP_CACHE_TTL_SECONDS
+        )
+        self._lock = Lock()
+
+    def contains(self, user_id: int, sotw_id: int) -> bool:
+        """
+        Check whether a membership was confirmed recently.
+
+        Args:
+            user_id (int): ID of a user.
+            sotw_id (int): ID of a sotw.
+
+        Returns:
+            bool: True if the user was recently found to be a member of the sotw.
+        """
+        with self._lock:
+            return (user_id, int(sotw_id)) in self._members
+
+    def add(self, user_id: int, sotw_id: int) -> None:
+        """
+        Remember that a user is a member of a sotw.
+
+        Args:
+            user_id (int): ID of a user.
+            sotw_id (int): ID of a sotw.
+        """
+        with self._lock:
+            self._members[(user_id, int(sotw_id))] = True
+
+    def invalidate(self, user_id: int, sotw_id: int) -> None:
+        """
+        Forget a user's membership of a sotw.
+
+        Args:
+            user_id (int): ID of a user.
+            sotw_id (int): ID of a sotw.
+        """
+        with self._lock:
+            self._members.pop((user_id, int(sotw_id)), None)
+
+    def clear(self) -> None:
+        """
+        Forget every cached membership.
+        """
+        with self._lock:
+            self._members.clear()
+
+
+membership_cache = MembershipCache()
+
+
+def is_sotw_member(session: Session, *, user_id: int, sotw_id: int) -> bool:
+    """
+    Check whether a user is a member of a sotw, using the membership cache before the database.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        user_id (int): ID of the user.
+        sotw_id (int): ID of the sotw.
+
+    Returns:
+        bool: True if the user is a member of the sotw.
+    """
+    if membership_cache.contains(user_id, sotw_id):
+        return True
+    if not crud.sotw.is_member(session=session, user_id=user_id, sotw_id=sotw_id):
+        return False
+    membership_cache.add(user_id, sotw_id)
+    return True
+
+
+async def is_sotw_member_async(
+    session: AsyncSession, *, user_id: int, sotw_id: int
+) -> bool:
+    """
+    Check whether a user is a member of a sotw, using the membership cache before the database.
+
+    Args:
+        session (AsyncSession): A SQLAlchemy AsyncSession object that is connected to the database.
+        user_id (int): ID of the user.
+        sotw_id (int): ID of the sotw.
+
+    Returns:
+        bool: True if the user is a member of the sotw.
+    """
+    if membership_cache.contains(user_id, sotw_id):
+        return True
+    if not await crud.async_sotw.is_member(
+        session=session, user_id=user_id, sotw_id=sotw_id
+    ):
+        return False
+    membership_cache.add(user_id, sotw_id)
+    return True
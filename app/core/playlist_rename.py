@@ -0,0 +1,273 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from loguru import logger
+from sqlalchemy.orm.session import Session
+
+from app import crud
+from app import schemas
+from app.clients.spotify import AsyncSpotifyClient
+from app.crud.crud_job import DONE, FAILED, PLAYLIST_RENAME
+from app.models.sotw import Sotw
+from app.shared.config import cfg
+
+
+@dataclass
+class PlaylistRename:
+    playlist_id: str
+    name: str
+    description: str
+    user_id: int
+
+
+def get_playlist_renames(session: Session, sotw: Sotw) -> List[PlaylistRename]:
+    """
+    List the new names and descriptions of every spotify playlist belonging to a sotw.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        sotw (Sotw): The sotw whose playlists are being renamed.
+
+    Returns:
+        List[PlaylistRename]: The master, song of the year, weekly and user playlists with their new details.
+    """
+    renames = [
+        PlaylistRename(
+            playlist_id=sotw.master_playlist_id,
+            name=f"{sotw.name} Master Playlist",
+            description=f"All the songs contained in every week of the {sotw.name} song of the week.",
+            user_id=sotw.owner_id,
+        ),
+        PlaylistRename(
+            playlist_id=sotw.soty_playlist_id,
+            name=f"{sotw.name} Song of the Year Playlist",
+            description=f"The winners from each week so far of the {sotw.name} Song of the Week for this year.",
+            user_id=sotw.owner_id,
+        ),
+    ]
+
+    for week in crud.week.get_all_weeks_in_sotw(session=session, sotw_id=sotw.id):
+        if week.week_num == 0:
+            continue
+        renames.append(
+            PlaylistRename(
+                playlist_id=week.playlist_link.split("/")[-1],
+                name=f"{sotw.name} SOTW #{week.week_num}",
+                description=f"Week {week.week_num} for {sotw.name} Song of the Week.",
+                user_id=sotw.owner_id,
+            )
+        )
+
+    user_playlists = {
+        user_playlist.user_id: user_playlist
+        for user_playlist in crud.user_playlist.get_playlists_for_sotw(
+            session=session, sotw_id=sotw.id
+        )
+    }
+    for user in sotw.user_list:
+        user_playlist = user_playlists.get(user.id)
+        if user_playlist is None:
+            continue
+        renames.append(
+            PlaylistRename(
+                playlist_id=user_playlist.playlist_id,
+                name=f"{user.name}'s {sotw.name} Song of the Week Playlist",
+                description=f"All songs submitted for the {sotw.name} Song of the Week for this year by {user.name}.",
+                user_id=user.id,
+            )
+        )
+
+    return renames
+
+
+async def rename_sotw_playlists(
+    session: Session, sotw: Sotw, spotify_client: AsyncSpotifyClient
+) -> List[str]:
+    """
+    Rename all of a sotw's spotify playlists, a few at a time.
+
+    At most `cfg.PLAYLIST_RENAME_CONCURRENCY` requests are in flight at once. A playlist that fails to be
+    renamed does not stop the others.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        sotw (Sotw): The sotw whose playlists are being renamed.
+        spotify_client (AsyncSpotifyClient): Client for Spotify interactions.
+
+    Returns:
+        List[str]: An error message for each playlist that could not be renamed.
+    """
+    semaphore = asyncio.Semaphore(cfg.PLAYLIST_RENAME_CONCURRENCY)
+    renames = await run_in_threadpool(get_playlist_renames, session, sotw)
+
+    async def rename(playlist: PlaylistRename) -> Optional[str]:
+        async with semaphore:
+            try:
+                await spotify_client.update_playlist_details(
+                    playlist.playlist_id,
+                    playlist.name,
+                    playlist.description,
+                    session,
+                    playlist.user_id,
+                )
+            except Exception as e:
+                logger.warning(f"Could not rename playlist {playlist.playlist_id}: {e}")
+                return f"{playlist.playlist_id}: {e}"
+        return None
+
+    errors = await asyncio.gather(*[rename(playlist) for playlist in renames])
+    return [error for error in errors if error is not None]
+
+
+def schedule_rename_if_renamed(
+    session: Session, sotw: Sotw, renamed_to: str
+) -> Optional[int]:
+    """
+    Schedule another playlist rename job when a sotw was renamed again after its playlists were renamed.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        sotw (Sotw): The sotw whose playlists were renamed.
+        renamed_to (str): The name the playlists were given.
+
+    Returns:
+        Optional[int]: The ID of the new rename job, or None if the playlists have the sotw's latest name.
+    """
+    session.refresh(sotw)
+    if sotw.name == renamed_to:
+        return None
+    return crud.job.schedule(
+        session=session,
+        sotw_id=sotw.id,
+        job_type=PLAYLIST_RENAME,
+        run_at=datetime.now().timestamp() * 1000,
+    ).id
+
+
+async def run_playlist_rename_job(
+    job_id: int,
+    session_factory: Callable[[], Session],
+    spotify_client: AsyncSpotifyClient,
+) -> None:
+    """
+    Background task that renames a sotw's playlists after the sotw itself is renamed.
+
+    The sotw is renamed again if its name changed while the playlists were being renamed, so the playlists always
+    end up with the latest name. A rename that lands after the last check, while the job is still running and so
+    does not schedule a job of its own, is picked up by scheduling and running a new job once this one is done.
+    The job's claim is renewed before each round of renames, and the task stops if another task claimed the job
+    in the meantime. The database is only used from the threadpool, so only the spotify requests are awaited on
+    the event loop.
+
+    Args:
+        job_id (int): ID of the playlist rename job.
+        session_factory (Callable[[], Session]): Creates the session the task works in.
+        spotify_client (AsyncSpotifyClient): Client for Spotify interactions.
+    """
+    next_job_id = None
+    session = await run_in_threadpool(session_factory)
+    try:
+        lease = await run_in_threadpool(crud.job.claim, session=session, job_id=job_id)
+        if lease is None:
+            # another task is already renaming this sotw's playlists
+            return
+        job = await run_in_threadpool(crud.job.get, session=session, id=job_id)
+        sotw_id = job.sotw_id
+
+        errors = []
+        sotw = None
+        renamed_to = None
+        try:
+            sotw = await run_in_threadpool(crud.sotw.get, session=session, id=sotw_id)
+            while sotw.name != renamed_to:
+                renamed_to = sotw.name
+                if not await run_in_threadpool(
+                    crud.job.update_claimed,
+                    session=session,
+                    job_id=job_id,
+                    lease=lease,
+                    object_in=schemas.JobUpdate(),
+                ):
+                    # the lock went stale and another task took over the job
+                    return
+                errors = await rename_sotw_playlists(session, sotw, spotify_client)
+                await run_in_threadpool(session.refresh, sotw)
+        except Exception as e:
+            logger.exception(f"Playlist rename for sotw {sotw_id} failed.")
+            errors = [str(e)]
+
+        if not await run_in_threadpool(
+            crud.job.update_claimed,
+            session=session,
+            job_id=job_id,
+            lease=lease,
+            object_in=schemas.JobUpdate(
+                status=FAILED if errors else DONE,
+                last_error="\n".join(errors) if errors else None,
+            ),
+        ):
+            return
+
+        if sotw is not None:
+            next_job_id = await run_in_threadpool(
+                schedule_rename_if_renamed, session, sotw, renamed_to
+            )
+    finally:
+        await run_in_threadpool(session.close)
+
+    if next_job_id is not None:
+        await run_playlist_rename_job(next_job_id, session_factory, spotify_client)
+
+
+def get_due_rename_job_ids(
+    session_factory: Callable[[], Session], due_before: float
+) -> List[int]:
+    """
+    List the IDs of the playlist rename jobs that are due.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates the session the jobs are read in.
+        due_before (float): Only jobs due before this timestamp, in milliseconds, are listed.
+
+    Returns:
+        List[int]: The IDs of the due rename jobs.
+    """
+    with session_factory() as session:
+        return [
+            job.id
+            for job in crud.job.get_due_jobs(
+                session=session, job_type=PLAYLIST_RENAME, now=due_before
+            )
+        ]
+
+
+async def run_due_playlist_renames(
+    session_factory: Callable[[], Session], spotify_client: AsyncSpotifyClient
+) -> int:
+    """
+    Run the playlist rename jobs whose background task never got to them.
+
+    Rename jobs are normally run by a background task of the request that renamed the sotw. A job that is still
+    pending `cfg.PLAYLIST_RENAME_ORPHAN_SECONDS` after it was due, or that is running with a stale lock, lost its
+    task to a restart or a crash and is run here instead.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates the sessions the jobs work in.
+        spotify_client (AsyncSpotifyClient): Client for Spotify interactions.
+
+    Returns:
+        int: The number of rename jobs that were run.
+    """
+    due_before = (
+        datetime.now().timestamp() - cfg.PLAYLIST_RENAME_ORPHAN_SECONDS
+    ) * 1000
+    job_ids = await run_in_threadpool(
+        get_due_rename_job_ids, session_factory, due_before
+    )
+
+    for job_id in job_ids:
+        await run_playlist_rename_job(job_id, session_factory, spotify_client)
+    return len(job_ids)
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from threading import Lock
+from typing import Optional
+
+from cachetools import LRUCache
+
+from app.api.serializers import get_results_etag
+from app.api.serializers import serialize_results
+from app.models.results import Results
+from app.shared.config import cfg
+
+
+@dataclass(frozen=True)
+class CachedResults:
+    body: bytes
+    etag: str
+
+
+class ResultsCache:
+    def __init__(self):
+        """
+        In-process cache of the serialized results of past weeks, keyed by sotw id and week number.
+
+        Results are written once when a week is rolled over and read by every member of the sotw several times
+        afterwards, so they are kept until they are evicted from the bounded LRU cache. Updating or deleting
+        results through `crud.results` invalidates the entry, other processes keep serving the old results until
+        they are evicted or the process restarts.
+        """
+        self._results = LRUCache(maxsize=cfg.RESULTS_CACHE_SIZE)
+        self._lock = Lock()
+
+    def get(self, sotw_id: int, week_num: int) -> Optional[CachedResults]:
+        """
+        Retrieve the serialized results of a week.
+
+        Args:
+            sotw_id (int): ID of a sotw.
+            week_num (int): Number of a week in the sotw.
+
+        Returns:
+            Optional[CachedResults]: The JSON body and ETag of the results, or None if they are not cached.
+        """
+        with self._lock:
+            return self._results.get((int(sotw_id), week_num))
+
+    def set(self, sotw_id: int, week_num: int, results: Results) -> CachedResults:
+        """
+        Serialize a week's results and cache them.
+
+        Args:
+            sotw_id (int): ID of a sotw.
+            week_num (int): Number of a week in the sotw.
+            results (Results): The results model object of the week.
+
+        Returns:
+            CachedResults: The JSON body and ETag of the results.
+        """
+        cached = CachedResults(
+            body=serialize_results(results).model_dump_json().encode(),
+            etag=get_results_etag(results),
+        )
+        with self._lock:
+            self._results[(int(sotw_id), week_num)] = cached
+        return cached
+
+    def invalidate(self, sotw_id: int, week_num: int) -> None:
+        """
+        Drop a week's results from the cache.
+
+        Args:
+            sotw_id (int): ID of a sotw.
+            week_num (int): Number of a week in the sotw.
+        """
+        with self._lock:
+            self._results.pop((int(sotw_id), week_num), None)
+
+    def clear(self) -> None:
+        """
+        Forget every cached result.
+        """
+        with self._lock:
+            self._results.clear()
+
+
+results_cache = ResultsCache()
@@ -0,0 +1,899 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+import json
+import random
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from loguru import logger
+from sqlalchemy.orm.session import Session
+
+from app import crud
+from app import schemas
+from app.clients.spotify import SpotifyClient
+from app.core.results_cache import results_cache
+from app.crud.crud_job import PLAYLIST_ADD
+from app.models.job import Job
+from app.models.response import Response
+from app.models.results import Results
+from app.models.song import Song
+from app.models.sotw import Sotw
+from app.models.user import User
+from app.models.user_playlist import UserPlaylist
+from app.models.week import Week
+from app.shared.config import cfg
+from app.shared.utils import get_next_datetime
+
+
+class RolloverError(Exception):
+    """
+    Raised when a week cannot be rolled over because the data it depends on is missing.
+    """
+
+
+class RolloverTakenOver(Exception):
+    """
+    Raised when the rollover job being run was claimed by another worker, so this one has to stop.
+    """
+
+
+@dataclass
+class WeekResultsData:
+    songs: List[Song]
+    responses: List[Response]
+    users: Dict[int, User]
+    playlists: Dict[int, UserPlaylist]
+
+
+@dataclass
+class PlaylistAddition:
+    playlist_id: str
+    uris: List[str]
+    user_id: int
+
+
+@dataclass
+class RolloverProgress:
+    week_playlist_id: Optional[str] = None
+    week_playlist_link: Optional[str] = None
+    # number of songs added so far to each playlist, by playlist id
+    added: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, progress: Optional[str]) -> "RolloverProgress":
+        return cls(**json.loads(progress)) if progress else cls()
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+
+@dataclass
+class PendingPlaylistAdditions:
+    additions: List[PlaylistAddition] = field(default_factory=list)
+    # number of songs added so far to each playlist, by playlist id
+    added: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, progress: Optional[str]) -> "PendingPlaylistAdditions":
+        if not progress:
+            return cls()
+        data = json.loads(progress)
+        return cls(
+            additions=[PlaylistAddition(**addition) for addition in data["additions"]],
+            added=data["added"],
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+
+def rollover_week(
+    sotw: Sotw,
+    current_week: Week,
+    session: Session,
+    spotify_client: SpotifyClient,
+    job: Job,
+    lease: str,
+) -> Week:
+    """
+    Close out the current week of a sotw and open the next one.
+
+    Creates the results for the week being closed (when there is one), builds the new week's playlist
+    and survey from the current week's responses, and stores the new week. The songs going into the
+    submitters', song of the year, new week's and master playlists are added all at once, before the
+    results are stored.
+
+    The new week's playlist and the number of songs added to each playlist are recorded on the job as they are
+    done, so a retry of a failed rollover reuses the playlist and only adds the songs that were not added yet.
+    A week or results stored by an earlier attempt are not stored again. Playlists that cannot be added to do
+    not hold the week back, their remaining songs are handed to a playlist addition job that retries them.
+
+    Args:
+        sotw (Sotw): Sotw model object.
+        current_week (Week): Week model object representing the current week for sotw.
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        spotify_client (SpotifyClient): Client to communicate with spotify api.
+        job (Job): The claimed rollover job.
+        lease (str): The lease of the job's claim, the claim is renewed before every step.
+
+    Raises:
+        RolloverTakenOver: When another worker claimed the job since.
+
+    Returns:
+        Week: The newly created current week.
+    """
+    next_week_id = f"{sotw.id}+{current_week.next_results_release}"
+    existing_week = crud.week.get(session=session, id=next_week_id)
+    if existing_week is not None:
+        return existing_week
+
+    # work out the results for the previous week and the songs they add to playlists
+    results_in = None
+    additions = []
+    if (
+        current_week.week_num >= 1
+        and crud.results.get_results_by_week(
+            session=session, week_id=current_week.id, sotw_id=sotw.id
+        )
+        is None
+    ):
+        results_in, additions = prepare_results(sotw, current_week, session)
+
+    # get the next results release timestamp
+    results_datetime = datetime.fromtimestamp(
+        sotw.results_datetime / 1000.0, tz=ZoneInfo(sotw.results_timezone)
+    )
+    next_results_release = get_next_datetime(
+        target_day=results_datetime.weekday(),
+        target_hour=results_datetime.hour,
+        target_minute=results_datetime.minute,
+        timezone=sotw.results_timezone,
+    )
+
+    progress = RolloverProgress.from_json(job.progress)
+    renew_job(session, job.id, lease)
+    responses, playlist_link, weekly_additions = create_weekly_playlist(
+        sotw, current_week, spotify_client, session, progress
+    )
+    save_progress(session, job.id, lease, progress)
+    errors = add_songs_to_playlists(
+        additions + weekly_additions, session, spotify_client, progress.added
+    )
+    if errors:
+        hand_off_playlist_additions(
+            session, sotw.id, additions + weekly_additions, errors, progress.added
+        )
+    # commits the hand off along with the progress
+    save_progress(session, job.id, lease, progress)
+
+    if results_in is not None:
+        create_results(current_week, results_in, session)
+
+    survey = create_survey(responses, sotw.owner_id)
+
+    # create the new week
+    next_week = schemas.WeekCreate(
+        id=next_week_id,
+        week_num=current_week.week_num + 1,
+        playlist_link=playlist_link,
+        sotw_id=sotw.id,
+        next_results_release=next_results_release,
+        survey=json.dumps(survey),
+        responses=[],
+    )
+
+    return crud.week.create(session=session, object_in=next_week)
+
+
+def renew_job(
+    session: Session,
+    job_id: int,
+    lease: str,
+    object_in: Optional[schemas.JobUpdate] = None,
+) -> None:
+    """
+    Update a claimed job, renewing the claim's lock, as long as no other worker claimed the job since.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        job_id (int): ID of the claimed job.
+        lease (str): The lease of the claim.
+        object_in (Optional[schemas.JobUpdate], optional): Fields to update along the way. Defaults to None.
+
+    Raises:
+        RolloverTakenOver: When another worker claimed the job since.
+    """
+    if not crud.job.update_claimed(
+        session=session,
+        job_id=job_id,
+        lease=lease,
+        object_in=object_in or schemas.JobUpdate(),
+    ):
+        raise RolloverTakenOver(f"Job {job_id} was claimed by another worker.")
+
+
+def save_progress(
+    session: Session, job_id: int, lease: str, progress: RolloverProgress
+) -> None:
+    """
+    Record a rollover's progress on its job.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        job_id (int): ID of the claimed rollover job.
+        lease (str): The lease of the claim.
+        progress (RolloverProgress): The steps of the rollover that are done.
+
+    Raises:
+        RolloverTakenOver: When another worker claimed the job since.
+    """
+    renew_job(session, job_id, lease, schemas.JobUpdate(progress=progress.to_json()))
+
+
+def hand_off_playlist_additions(
+    session: Session,
+    sotw_id: int,
+    additions: List[PlaylistAddition],
+    errors: Dict[str, str],
+    added: Dict[str, int],
+) -> Job:
+    """
+    Schedule the songs that could not be added to some playlists to be added by a playlist addition job.
+
+    The songs join the sotw's pending playlist addition job when it has one. The playlists are marked as done in
+    `added` so the rollover does not add to them itself. The job is only flushed, the caller commits it along with
+    its own progress.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        sotw_id (int): ID of the sotw the playlists belong to.
+        additions (List[PlaylistAddition]): The songs that were being added.
+        errors (Dict[str, str]): The error adding to each playlist that failed, by playlist id.
+        added (Dict[str, int]): The number of songs added to each playlist, by playlist id.
+
+    Raises:
+        RolloverError: When the sotw's playlist addition job is running, the rollover is retried once it is done.
+
+    Returns:
+        Job: The playlist addition job.
+    """
+    last_error = "\n".join(
+        f"{playlist_id}: {error}" for playlist_id, error in errors.items()
+    )
+
+    job = crud.job.get_active_job_for_sotw(
+        session=session, sotw_id=sotw_id, job_type=PLAYLIST_ADD
+    )
+    if job is None:
+        pending = PendingPlaylistAdditions()
+    else:
+        pending = PendingPlaylistAdditions.from_json(job.progress)
+
+    # only hand off the songs that were not added, after any songs already waiting for the same playlist
+    skip = {playlist_id: added.get(playlist_id, 0) for playlist_id in errors}
+    for addition in additions:
+        if addition.playlist_id not in errors:
+            continue
+        uris = addition.uris[skip[addition.playlist_id] :]
+        skip[addition.playlist_id] = max(
+            skip[addition.playlist_id] - len(addition.uris), 0
+        )
+        if uris:
+            pending.additions.append(
+                PlaylistAddition(
+                    playlist_id=addition.playlist_id,
+                    uris=uris,
+                    user_id=addition.user_id,
+                )
+            )
+            pending.added.setdefault(addition.playlist_id, 0)
+    for playlist_id in errors:
+        # the rollover counts the playlist as done
+        added[playlist_id] = sum(
+            len(addition.uris)
+            for addition in additions
+            if addition.playlist_id == playlist_id
+        )
+
+    run_at = (datetime.now().timestamp() + cfg.ROLLOVER_RETRY_SECONDS) * 1000
+    if job is None:
+        job = crud.job.create(
+            session=session,
+            object_in=schemas.JobCreate(
+                job_type=PLAYLIST_ADD,
+                sotw_id=sotw_id,
+                run_at=run_at,
+                progress=pending.to_json(),
+                last_error=last_error,
+            ),
+            commit=False,
+        )
+    elif not crud.job.update_pending(
+        session=session,
+        job_id=job.id,
+        object_in=schemas.JobUpdate(
+            progress=pending.to_json(), last_error=last_error, run_at=run_at
+        ),
+        commit=False,
+    ):
+        raise RolloverError(
+            f"Songs are being added to the playlists of sotw {sotw_id}, the rollover will be retried."
+        )
+    logger.warning(f"Handed songs for sotw {sotw_id} off to job {job.id}: {last_error}")
+    return job
+
+
+def create_week_zero(sotw: Sotw, session: Session):
+    """
+    Create week zero for sotw.
+
+    Args:
+        sotw (Sotw): Sotw model object.
+        session (Session): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
+
+    Returns:
+        schemas.Week: A week object for week 0 of a sotw competition.
+    """
+    results_datetime = datetime.fromtimestamp(
+        sotw.results_datetime / 1000.0, tz=ZoneInfo(sotw.results_timezone)
+    )
+    next_results_release = get_next_datetime(
+        target_day=results_datetime.weekday(),
+        target_hour=results_datetime.hour,
+        target_minute=results_datetime.minute,
+        timezone=sotw.results_timezone,
+    )
+    first_week = schemas.WeekCreate(
+        id=str(sotw.id) + "+0",
+        week_num=0,
+        playlist_link="",
+        sotw_id=sotw.id,
+        next_results_release=next_results_release,
+        responses=[],
+    )
+    # create the first week of this sotw
+    return crud.week.create(session=session, object_in=first_week)
+
+
+def do_not_create_new_week(
+    sotw: Sotw, current_week: Week, submitted: bool, session: Session
+):
+    """
+    Returns error responses when a new week cannot be created.
+
+    Args:
+        sotw (Sotw): Sotw model object.
+        current_week (Week): Week model object representing the current week for sotw.
+        submitted (bool): Flag to indicate if the user has submitted or not.
+        session (Session): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
+
+    Returns:
+        A WeekErrorResponse when a sotw does not have at least 3 players or when not everyone in a sotw has
+        submitted for the current week. Otherwise, return None.
+    """
+    sotw_num_users = len(sotw.user_list)
+    if sotw_num_users < 3:
+        return schemas.WeekErrorResponse(
+            week=schemas.Week(
+                id=current_week.id,
+                sotw_id=str(current_week.sotw_id),
+                week_num=current_week.week_num,
+                playlist_link=current_week.playlist_link,
+                next_results_release=current_week.next_results_release,
+                survey=current_week.survey,
+                submitted=submitted,
+            ),
+            status=406,
+            message=f"You will need at least three players in your Song of the Week competition in order to continue playing.",
+        )
+    if len(current_week.responses) < sotw_num_users:
+        submitted_users = crud.user.get_submitted_users(
+            session=session, week_id=current_week.id
+        )
+        unsubmitted_users = []
+        for user in sotw.user_list:
+            if user not in submitted_users:
+                unsubmitted_users.append(user.name)
+
+        if len(unsubmitted_users) == 1:
+            unsubmitted_user_string = unsubmitted_users[0]
+        elif len(unsubmitted_users) == 2:
+            unsubmitted_user_string = (
+                f"{unsubmitted_users[0]} and {unsubmitted_users[1]}"
+            )
+        else:
+            unsubmitted_user_string = (
+                ", ".join(unsubmitted_users[:-1]) + ", and " + unsubmitted_users[-1]
+            )
+        return schemas.WeekErrorResponse(
+            week=schemas.Week(
+                id=current_week.id,
+                sotw_id=str(current_week.sotw_id),
+                week_num=current_week.week_num,
+                playlist_link=current_week.playlist_link,
+                next_results_release=current_week.next_results_release,
+                survey=current_week.survey,
+                submitted=submitted,
+            ),
+            status=406,
+            message=f"Please make sure everyone has submitted their surveys for the week. Looks like we're still waiting on {sotw_num_users - len(current_week.responses)} player{'s' if sotw_num_users - len(current_week.responses) > 1 else ''} to submit: {unsubmitted_user_string}",
+        )
+
+    return None
+
+
+def prepare_results(
+    sotw: Sotw, current_week: Week, session: Session
+) -> Tuple[schemas.ResultsCreate, List[PlaylistAddition]]:
+    """
+    Work out the results for a week and the songs they add to the submitters' and song of the year playlists.
+
+    Args:
+        sotw (Sotw): Sotw model object.
+        current_week (Week): Week model object representing the current week for sotw.
+        session (Session): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
+
+    Raises:
+        RolloverError: when no previous week is found.
+
+    Returns:
+        Tuple[schemas.ResultsCreate, List[PlaylistAddition]]: The results to store and the songs to add to playlists.
+    """
+    previous_week = crud.week.get_week_by_number(
+        session=session, week_num=current_week.week_num - 1, sotw_id=sotw.id
+    )
+    if not previous_week:
+        raise RolloverError(
+            f"Could not find a previous week with the number {current_week.week_num - 1} for sotw {sotw.id}."
+        )
+
+    data = load_week_results_data(sotw, current_week, previous_week, session)
+    all_songs = get_all_songs(current_week, data)
+
+    guessing_data = get_guessing_data(current_week, all_songs, data)
+
+    first_place_names, first_place_ids, second_place_names, second_place_ids = (
+        calculate_first_second_place(all_songs)
+    )
+    survey = json.loads(previous_week.survey or "{}")
+
+    # create the results for the previous week
+    results_in = schemas.ResultsCreate(
+        sotw_id=sotw.id,
+        week_id=current_week.id,
+        first_place=json.dumps(first_place_names),
+        second_place=json.dumps(second_place_names),
+        all_songs=json.dumps(all_songs),
+        guessing_data=json.dumps(
+            sorted(
+                guessing_data,
+                key=lambda x: x["num_correct_guesses"],
+                reverse=True,
+            )
+        ),
+        theme=survey["theme"] if "theme" in survey else "",
+        theme_description=survey["theme_description"] if "theme_description" in survey else "",
+    )
+
+    additions = get_submitter_playlist_additions(data)
+    additions.append(
+        get_soty_playlist_addition(sotw, first_place_ids, second_place_ids)
+    )
+
+    return results_in, additions
+
+
+def create_results(
+    current_week: Week, results_in: schemas.ResultsCreate, session: Session
+) -> Results:
+    """
+    Store the results for a week and put them in the results cache, ready for members to read.
+
+    Args:
+        current_week (Week): Week model object representing the current week for sotw.
+        results_in (schemas.ResultsCreate): The results worked out by `prepare_results`.
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+
+    Returns:
+        Results: The stored results model object.
+    """
+    results = crud.results.create(session=session, object_in=results_in)
+    results_cache.set(results.sotw_id, current_week.week_num, results)
+    return results
+
+
+def load_week_results_data(
+    sotw: Sotw, current_week: Week, previous_week: Week, session: Session
+) -> WeekResultsData:
+    """
+    Load everything the results of a week are built from in a handful of queries.
+
+    Args:
+        sotw (Sotw): Sotw model object.
+        current_week (Week): Week model object representing the current week for sotw.
+        previous_week (Week): Week model object representing the previous week for sotw.
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+
+    Returns:
+        WeekResultsData: The previous week's songs, the current week's responses with their matches, and the
+            users and playlists they refer to keyed by user id.
+    """
+    songs = crud.song.get_songs_from_week(
+        session=session, sotw_id=sotw.id, week_id=previous_week.id
+    )
+    responses = crud.response.get_responses_for_week(
+        session=session, week_id=current_week.id
+    )
+
+    user_ids = {song.submitter_id for song in songs}
+    for response in responses:
+        user_ids.add(response.submitter_id)
+        user_ids.update(match.user_id for match in response.user_song_matches)
+    users = {
+        user.id: user
+        for user in crud.user.get_users_by_ids(session=session, ids=list(user_ids))
+    }
+    playlists = {
+        playlist.user_id: playlist
+        for playlist in crud.user_playlist.get_playlists_for_sotw(
+            session=session, sotw_id=sotw.id
+        )
+    }
+
+    return WeekResultsData(
+        songs=songs, responses=responses, users=users, playlists=playlists
+    )
+
+
+def get_all_songs(current_week: Week, data: WeekResultsData):
+    """
+    Get all the songs from the previous week.
+
+    Args:
+        current_week (Week): Week model object representing the current week for sotw.
+        data (WeekResultsData): The week's songs, responses, users and playlists.
+
+    Return:
+        A dictionary of all the songs in the previous week with voting data attached.
+    """
+    all_songs = {}
+    for song in data.songs:
+        all_songs[song.id] = {
+            "name": song.name,
+            "voters": [],
+            "submitter": data.users[song.submitter_id].name,
+            "spotify_id": song.spotify_id,
+        }
+
+    # order songs in the same order as the survey data (and thus the playlist)
+    survey = json.loads(current_week.survey)
+
+    ordered_all_songs = {
+        int(song["id"]): all_songs[int(song["id"])] for song in survey["songs"]
+    }
+
+    return ordered_all_songs
+
+
+def get_submitter_playlist_additions(data: WeekResultsData) -> List[PlaylistAddition]:
+    """
+    Group the previous week's songs by the playlist of the user who submitted them.
+
+    Args:
+        data (WeekResultsData): The week's songs, responses, users and playlists.
+
+    Returns:
+        List[PlaylistAddition]: The songs to add to each submitter's playlist.
+    """
+    additions: Dict[int, PlaylistAddition] = {}
+    # keep the order the same on every attempt, so a retry can pick up after the songs already added
+    for song in sorted(data.songs, key=lambda song: song.id):
+        if song.submitter_id not in additions:
+            additions[song.submitter_id] = PlaylistAddition(
+                playlist_id=data.playlists[song.submitter_id].playlist_id,
+                uris=[],
+                user_id=song.submitter_id,
+            )
+        additions[song.submitter_id].uris.append(f"spotify:track:{song.spotify_id}")
+    return list(additions.values())
+
+
+def get_guessing_data(current_week: Week, all_songs: dict, data: WeekResultsData):
+    """
+    Get the guessing data from the current week's responses for the previous week's playlist.
+
+    Args:
+        current_week (Week): Week model object representing the current week for sotw.
+        all_songs (dict): Dictionary of all the songs from the previous week.
+        data (WeekResultsData): The week's songs, responses, users and playlists.
+
+    Return:
+        A list of guessing data.
+    """
+    # create a mapping of song names to index in survey song list
+    survey = json.loads(current_week.survey)
+    song_name_order = {
+        song["name"]: index for index, song in enumerate(survey["songs"])
+    }
+
+    guessing_data = []
+    for response in data.responses:
+        submitter = data.users[response.submitter_id]
+        # fill out all_songs
+        all_songs[response.picked_song_1_id]["voters"].append(submitter.name)
+        all_songs[response.picked_song_2_id]["voters"].append(submitter.name)
+        # fill out guessing data
+        guesses = []
+        for match in response.user_song_matches:
+            guesses.append(
+                {
+                    "song": all_songs[match.song_id]["name"],
+                    "submitter_guess": data.users[match.user_id].name,
+                    "correct": match.correct_guess,
+                }
+            )
+        guessing_data.append(
+            {
+                "id": response.submitter_id,
+                "name": submitter.name,
+                "guesses": sorted(
+                    guesses, key=lambda guess: song_name_order[guess["song"]]
+                ),
+                "num_correct_guesses": response.number_correct_matches,
+            }
+        )
+    return guessing_data
+
+
+def calculate_first_second_place(all_songs: dict):
+    """
+    Calculate the first and second place songs from the previous week's playlist based on voting data.
+
+    Args:
+        all_songs (dict): Dictionary of all the songs from the previous week.
+
+    Return:
+        A tuple of the first place song names, first place song ids, second place song names, and second place song ids.
+    """
+    first_place_names = []
+    first_place_ids = []
+    first_place_votes = 0
+    second_place_names = []
+    second_place_ids = []
+    second_place_votes = 0
+    for song_id in all_songs:
+        num_votes = len(all_songs[song_id]["voters"])
+        if num_votes == first_place_votes:
+            # add first place ties
+            first_place_names.append(all_songs[song_id]["name"])
+            first_place_ids.append(all_songs[song_id]["spotify_id"])
+        elif num_votes > first_place_votes:
+            # new first place votes
+            second_place_votes = first_place_votes
+            first_place_votes = num_votes
+            second_place_names = first_place_names
+            second_place_ids = first_place_ids
+            first_place_names = [all_songs[song_id]["name"]]
+            first_place_ids = [all_songs[song_id]["spotify_id"]]
+        elif num_votes == second_place_votes:
+            # add second place ties
+            second_place_names.append(all_songs[song_id]["name"])
+            second_place_ids.append(all_songs[song_id]["spotify_id"])
+        elif num_votes > second_place_votes:
+            # new second place votes
+            second_place_votes = num_votes
+            second_place_names = [all_songs[song_id]["name"]]
+            second_place_ids = [all_songs[song_id]["spotify_id"]]
+
+    return first_place_names, first_place_ids, second_place_names, second_place_ids
+
+
+def get_soty_playlist_addition(
+    sotw: Sotw, first_place_ids: list, second_place_ids: list
+) -> PlaylistAddition:
+    """
+    Get the first (and second) place song(s) to add to the song of the year playlist for sotw.
+
+    Args:
+        sotw (Sotw): Sotw model object.
+        first_place_ids (list): A list of the first place song ids.
+        second_place_ids (list): A list of the second place song ids.
+
+    Returns:
+        PlaylistAddition: The songs to add to the song of the year playlist.
+    """
+    uris = []
+    if len(first_place_ids) == 1:
+        for song_id in first_place_ids + second_place_ids:
+            uris.append(f"spotify:track:{song_id}")
+    else:
+        for song_id in first_place_ids:
+            uris.append(f"spotify:track:{song_id}")
+    return PlaylistAddition(
+        playlist_id=sotw.soty_playlist_id, uris=uris, user_id=sotw.owner_id
+    )
+
+
+def add_songs_to_playlists(
+    additions: List[PlaylistAddition],
+    session: Session,
+    spotify_client: SpotifyClient,
+    added: Dict[str, int],
+) -> Dict[str, str]:
+    """
+    Add songs to several spotify playlists at once.
+
+    The songs going into the same playlist are sent together, in the order they were given and in chunks as
+    large as spotify allows, and at most `cfg.PLAYLIST_ADD_CONCURRENCY` playlists are added to at a time.
+    The number of songs added to each playlist is recorded in `added`, even when adding to it fails part way,
+    and adding to a playlist starts after the songs `added` says it already has. A playlist that fails does not
+    stop the others.
+
+    Args:
+        additions (List[PlaylistAddition]): The songs to add to each playlist.
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        spotify_client (SpotifyClient): Client to communicate with spotify api.
+        added (Dict[str, int]): The number of songs added to each playlist so far, by playlist id.
+
+    Returns:
+        Dict[str, str]: The error adding to each playlist that failed, by playlist id.
+    """
+    playlists: Dict[str, PlaylistAddition] = {}
+    for addition in additions:
+        if not addition.uris:
+            continue
+        if addition.playlist_id in playlists:
+            playlists[addition.playlist_id].uris.extend(addition.uris)
+        else:
+            playlists[addition.playlist_id] = PlaylistAddition(
+                playlist_id=addition.playlist_id,
+                uris=list(addition.uris),
+                user_id=addition.user_id,
+            )
+
+    def add(playlist: PlaylistAddition) -> Optional[Exception]:
+        try:
+            write = spotify_client.add_songs_to_playlist_in_chunks(
+                playlist.playlist_id,
+                playlist.uris,
+                session,
+                playlist.user_id,
+                start=added.get(playlist.playlist_id, 0),
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not add songs to playlist {playlist.playlist_id}: {e}"
+            )
+            return e
+        added[playlist.playlist_id] = write.added
+        if write.error is not None:
+            logger.warning(
+                f"Added {write.added} of {len(playlist.uris)} songs to playlist {playlist.playlist_id}: {write.error}"
+            )
+        return write.error
+
+    remaining = [
+        playlist
+        for playlist in playlists.values()
+        if added.get(playlist.playlist_id, 0) < len(playlist.uris)
+    ]
+    with ThreadPoolExecutor(max_workers=cfg.PLAYLIST_ADD_CONCURRENCY) as executor:
+        futures = {
+            playlist.playlist_id: executor.submit(add, playlist)
+            for playlist in remaining
+        }
+    return {
+        playlist_id: str(future.result())
+        for playlist_id, future in futures.items()
+        if future.result() is not None
+    }
+
+
+def create_weekly_playlist(
+    sotw: Sotw,
+    current_week: Week,
+    spotify_client: SpotifyClient,
+    session: Session,
+    progress: RolloverProgress,
+):
+    """
+    Create the new playlist for the new week from the current week's responses.
+
+    A playlist an earlier attempt at the rollover created is reused, and its songs are put in the same order,
+    which is shuffled the same way on every attempt.
+
+    Args:
+        sotw (Sotw): Sotw model object.
+        current_week (Week): Week model object representing the current week for sotw.
+        session (Session): A SQLAlchemy Session object that is connected to the database. Defaults to Depends(deps.get_session).
+        spotify_client (SpotifyClient, optional): Client to communicate with spotify api.
+        progress (RolloverProgress): Progress of the rollover, the new playlist is recorded in it.
+
+    Returns:
+        A tuple with the responses from the current week, the playlist link for the new week's playlist and
+        the songs to add to the new week's and master playlists
+    """
+    previous_week = crud.week.get_week_by_number(
+        session=session, week_num=current_week.week_num - 1, sotw_id=sotw.id
+    )
+    if not previous_week and current_week.week_num > 0:
+        raise RolloverError(
+            f"Could not find a previous week with the number {current_week.week_num - 1} for sotw {sotw.id}."
+        )
+    theme = ""
+    theme_description = ""
+    if previous_week:
+        for response in previous_week.responses:
+            if response.submitter_id == sotw.owner_id:
+                theme = response.theme
+                theme_description = response.theme_description
+                break
+
+    if progress.week_playlist_id is None:
+        week_playlist_name = f"{sotw.name} SOTW #{current_week.week_num + 1}{' - ' + theme if theme else ''}"
+        week_playlist_description = f"Week {current_week.week_num + 1} for {sotw.name} Song of the Week.{' Theme: ' + theme_description if theme_description else ''}"
+        week_playlist = spotify_client.create_playlist(
+            week_playlist_name, week_playlist_description, session, sotw.owner_id
+        )
+        progress.week_playlist_id = week_playlist["id"]
+        progress.week_playlist_link = week_playlist["external_urls"]["spotify"]
+    playlist_link = progress.week_playlist_link
+    playlist_id = progress.week_playlist_id
+
+    # add all responses from `current_week` to the new playlist
+    uris = []
+    responses = sorted(current_week.responses, key=lambda response: response.id)
+    random.Random(current_week.id).shuffle(responses)
+    for response in responses:
+        uris.append(f"spotify:track:{response.next_song.spotify_id}")
+    additions = [
+        PlaylistAddition(playlist_id=playlist_id, uris=uris, user_id=sotw.owner_id),
+        # also add these songs to the master playlist for the sotw
+        PlaylistAddition(
+            playlist_id=sotw.master_playlist_id, uris=uris, user_id=sotw.owner_id
+        ),
+    ]
+
+    return responses, playlist_link, additions
+
+
+def create_survey(responses: list, sotw_owner_id: int):
+    """
+    Create the next week's survey dictionary using the responses from the current week.
+
+    Args:
+        responses (list): List of the current week's responses.
+        sotw_owner_id (int): ID of the sotw owner.
+
+    Returns:
+        A dictionary representing a survey for the new week.
+    """
+    survey = {
+        "songs": [],
+        "users": [],
+        "theme": "",
+        "theme_description": "",
+    }
+    for response in responses:
+        # note: the `id` is the id of the Song object in the database
+        survey["songs"].append(
+            {
+                "id": str(response.next_song.id),
+                "name": response.next_song.name,
+            }
+        )
+        if response.submitter_id == sotw_owner_id:
+            survey["theme"] = response.theme
+            survey["theme_description"] = response.theme_description
+    random.shuffle(responses)
+    for response in responses:
+        survey["users"].append(
+            {
+                "id": str(response.submitter_id),
+                "name": response.submitter.name,
+                "matched": False,
+            }
+        )
+
+    return survey
@@ -0,0 +1,373 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from loguru import logger
+from sqlalchemy.orm.session import Session
+
+from app import crud
+from app import schemas
+from app.clients.spotify import AsyncSpotifyClient
+from app.clients.spotify import SpotifyClient
+from app.core.playlist_rename import run_due_playlist_renames
+from app.core.rollover import PendingPlaylistAdditions
+from app.core.rollover import RolloverTakenOver
+from app.core.rollover import add_songs_to_playlists
+from app.core.rollover import do_not_create_new_week
+from app.core.rollover import renew_job
+from app.core.rollover import rollover_week
+from app.crud.crud_job import DONE, FAILED, PENDING, PLAYLIST_ADD, WEEK_ROLLOVER
+from app.db.session import SessionLocal
+from app.models.job import Job
+from app.models.week import Week
+from app.shared.config import cfg
+
+
+def run_due_rollovers(session: Session, spotify_client: SpotifyClient) -> int:
+    """
+    Run every week rollover job whose release time has passed.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        spotify_client (SpotifyClient): Client to communicate with spotify api.
+
+    Returns:
+        int: The number of weeks that were rolled over.
+    """
+    now = datetime.now().timestamp() * 1000
+    jobs = crud.job.get_due_jobs(session=session, job_type=WEEK_ROLLOVER, now=now)
+
+    rolled_over = 0
+    for job in jobs:
+        if run_rollover_job(session, job, spotify_client) is not None:
+            rolled_over += 1
+    return rolled_over
+
+
+def run_rollover_job(
+    session: Session, job: Job, spotify_client: SpotifyClient
+) -> Optional[Week]:
+    """
+    Roll over the current week of the job's sotw and schedule the rollover for the week after.
+
+    The job is claimed before anything else is done so that when several workers pick up the same due job only
+    one of them performs the rollover; the others return straight away and the week is read once it is ready.
+    A sotw that is not ready to move on (not enough players or missing responses) has its job released and is
+    checked again after `cfg.ROLLOVER_RETRY_SECONDS`.
+
+    A rollover that fails is retried after `cfg.ROLLOVER_RETRY_SECONDS`, until it has been attempted
+    `cfg.ROLLOVER_MAX_ATTEMPTS` times. After that the job is marked failed with the last error and the sotw is no
+    longer rolled over. A worker that stalls long enough for its job to be claimed again stops at its next write
+    to the job and leaves the job to the new claim.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        job (Job): The due rollover job.
+        spotify_client (SpotifyClient): Client to communicate with spotify api.
+
+    Returns:
+        Optional[Week]: The newly created week, or None when the week was not rolled over.
+    """
+    lease = crud.job.claim(session=session, job_id=job.id)
+    if lease is None:
+        # another worker is already rolling this sotw over
+        return None
+
+    try:
+        return _run_claimed_rollover_job(session, job, lease, spotify_client)
+    except RolloverTakenOver:
+        session.rollback()
+        logger.warning(
+            f"Week rollover for sotw {job.sotw_id} was claimed by another worker."
+        )
+    except Exception as e:
+        logger.exception(f"Week rollover for sotw {job.sotw_id} failed.")
+        session.rollback()
+        retry_job(session, job, lease, str(e))
+    return None
+
+
+def _run_claimed_rollover_job(
+    session: Session, job: Job, lease: str, spotify_client: SpotifyClient
+) -> Optional[Week]:
+    now = datetime.now().timestamp() * 1000
+
+    sotw = crud.sotw.get(session=session, id=job.sotw_id)
+    current_week = (
+        crud.week.get_current_week(session=session, sotw_id=sotw.id) if sotw else None
+    )
+    if current_week is None:
+        # nothing to roll over, the job will be scheduled again along with week zero
+        renew_job(session, job.id, lease, schemas.JobUpdate(status=DONE))
+        return None
+
+    if current_week.next_results_release > now:
+        # the release time moved since this job was scheduled, or the week was already rolled over
+        release_job(session, job, lease, current_week.next_results_release)
+        return None
+
+    if do_not_create_new_week(sotw, current_week, False, session):
+        release_job(session, job, lease, now + cfg.ROLLOVER_RETRY_SECONDS * 1000)
+        return None
+
+    next_week = rollover_week(sotw, current_week, session, spotify_client, job, lease)
+
+    renew_job(session, job.id, lease, schemas.JobUpdate(status=DONE, last_error=None))
+    crud.job.schedule(
+        session=session,
+        sotw_id=sotw.id,
+        job_type=WEEK_ROLLOVER,
+        run_at=next_week.next_results_release,
+    )
+    logger.info(f"Rolled sotw {sotw.id} over to week {next_week.week_num}.")
+
+    return next_week
+
+
+def release_job(session: Session, job: Job, lease: str, run_at: float) -> None:
+    """
+    Hand a claimed job back to the scheduler to be run again later.
+
+    A sotw that is not ready to move on yet has not failed to, so the claim is not counted as an attempt.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        job (Job): The claimed job.
+        lease (str): The lease of the claim.
+        run_at (float): Timestamp in milliseconds at which the job should run again.
+
+    Raises:
+        RolloverTakenOver: When another worker claimed the job since.
+    """
+    renew_job(
+        session,
+        job.id,
+        lease,
+        schemas.JobUpdate(status=PENDING, run_at=run_at, attempts=job.attempts - 1),
+    )
+
+
+def retry_job(session: Session, job: Job, lease: str, last_error: str) -> None:
+    """
+    Hand a job that failed back to the scheduler to be retried, or mark it failed once it ran out of attempts.
+
+    Nothing is written when another worker claimed the job since.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        job (Job): The claimed job.
+        lease (str): The lease of the claim.
+        last_error (str): The error the job failed with.
+    """
+    # claiming the job counted this attempt
+    if job.attempts >= cfg.ROLLOVER_MAX_ATTEMPTS:
+        logger.error(
+            f"Giving up on the {job.job_type} job for sotw {job.sotw_id} after {job.attempts} attempts."
+        )
+        object_in = schemas.JobUpdate(status=FAILED, last_error=last_error)
+    else:
+        object_in = schemas.JobUpdate(
+            status=PENDING,
+            last_error=last_error,
+            run_at=(datetime.now().timestamp() + cfg.ROLLOVER_RETRY_SECONDS) * 1000,
+        )
+    crud.job.update_claimed(
+        session=session, job_id=job.id, lease=lease, object_in=object_in
+    )
+
+
+def run_due_playlist_additions(session: Session, spotify_client: SpotifyClient) -> int:
+    """
+    Run every playlist addition job that is due.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        spotify_client (SpotifyClient): Client to communicate with spotify api.
+
+    Returns:
+        int: The number of jobs that added all of their songs.
+    """
+    now = datetime.now().timestamp() * 1000
+    jobs = crud.job.get_due_jobs(session=session, job_type=PLAYLIST_ADD, now=now)
+
+    done = 0
+    for job in jobs:
+        if run_playlist_addition_job(session, job, spotify_client):
+            done += 1
+    return done
+
+
+def run_playlist_addition_job(
+    session: Session, job: Job, spotify_client: SpotifyClient
+) -> bool:
+    """
+    Add the songs a week rollover could not add to some of a sotw's playlists.
+
+    Only the playlists that still miss songs are added to, starting after the songs already added. The job is
+    retried like a rollover until every song is added or it runs out of attempts.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        job (Job): The due playlist addition job.
+        spotify_client (SpotifyClient): Client to communicate with spotify api.
+
+    Returns:
+        bool: True if every song was added.
+    """
+    lease = crud.job.claim(session=session, job_id=job.id)
+    if lease is None:
+        # another worker is already adding these songs
+        return False
+
+    try:
+        pending = PendingPlaylistAdditions.from_json(job.progress)
+        renew_job(session, job.id, lease)
+        errors = add_songs_to_playlists(
+            pending.additions, session, spotify_client, pending.added
+        )
+        if errors:
+            renew_job(
+                session, job.id, lease, schemas.JobUpdate(progress=pending.to_json())
+            )
+            retry_job(
+                session,
+                job,
+                lease,
+                "\n".join(
+                    f"{playlist_id}: {error}" for playlist_id, error in errors.items()
+                ),
+            )
+            return False
+        renew_job(
+            session,
+            job.id,
+            lease,
+            schemas.JobUpdate(
+                status=DONE, progress=pending.to_json(), last_error=None
+            ),
+        )
+    except RolloverTakenOver:
+        session.rollback()
+        logger.warning(
+            f"Playlist additions for sotw {job.sotw_id} were claimed by another worker."
+        )
+        return False
+    except Exception as e:
+        logger.exception(f"Playlist additions for sotw {job.sotw_id} failed.")
+        session.rollback()
+        retry_job(session, job, lease, str(e))
+        return False
+    logger.info(f"Added the remaining playlist songs for sotw {job.sotw_id}.")
+    return True
+
+
+def schedule_rollover(session: Session, sotw_id: int, run_at: float) -> Optional[Job]:
+    """
+    Make sure the rollover of a sotw's current week is scheduled, unless the scheduler already gave up on it.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        sotw_id (int): ID of the sotw.
+        run_at (float): Timestamp in milliseconds of the current week's results release.
+
+    Returns:
+        Optional[Job]: The active rollover job, or None if the rollover of this week failed for good.
+    """
+    job = crud.job.get_latest_job_for_sotw(
+        session=session, sotw_id=sotw_id, job_type=WEEK_ROLLOVER
+    )
+    # retries only ever move a job's run_at later
+    if job is not None and job.status == FAILED and job.run_at >= run_at:
+        return None
+    return crud.job.schedule(
+        session=session, sotw_id=sotw_id, job_type=WEEK_ROLLOVER, run_at=run_at
+    )
+
+
+def retry_failed_rollover(session: Session, sotw_id: int) -> Optional[Job]:
+    """
+    Schedule the rollover of a sotw's current week again after the scheduler gave up on it.
+
+    The new job is due straight away and gets a fresh set of `cfg.ROLLOVER_MAX_ATTEMPTS` attempts.
+
+    Args:
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+        sotw_id (int): ID of the sotw.
+
+    Returns:
+        Optional[Job]: The new rollover job, or None if the sotw's latest rollover did not fail.
+    """
+    job = crud.job.get_latest_job_for_sotw(
+        session=session, sotw_id=sotw_id, job_type=WEEK_ROLLOVER
+    )
+    if job is None or job.status != FAILED:
+        return None
+    return crud.job.schedule(
+        session=session,
+        sotw_id=sotw_id,
+        job_type=WEEK_ROLLOVER,
+        run_at=datetime.now().timestamp() * 1000,
+    )
+
+
+class RolloverScheduler:
+    def __init__(self, poll_interval: float = cfg.ROLLOVER_POLL_INTERVAL_SECONDS):
+        """
+        Background task that rolls each sotw over to its next week once the week's results release time passes,
+        retries the playlist additions a rollover handed off, and runs the playlist renames whose background task
+        was lost.
+
+        Args:
+            poll_interval (float, optional): Seconds to wait between checks for due jobs. Defaults to cfg.ROLLOVER_POLL_INTERVAL_SECONDS.
+        """
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """
+        Start polling for due jobs on the running event loop.
+        """
+        if self._task is None:
+            self._stopped = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop polling and wait for the job being run, if any, to finish.
+        """
+        if self._task is None:
+            return
+        self._stopped.set()
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        async_spotify_client = AsyncSpotifyClient(
+            cfg.SPOTIFY_CLIENT_ID, cfg.SPOTIFY_CLIENT_SECRET
+        )
+        while not self._stopped.is_set():
+            try:
+                # the rollover talks to the database and spotify synchronously so keep it off the event loop
+                await run_in_threadpool(self._run_once)
+            except Exception:
+                logger.exception("Week rollover scheduler run failed.")
+            try:
+                await run_due_playlist_renames(SessionLocal, async_spotify_client)
+            except Exception:
+                logger.exception("Playlist rename scheduler run failed.")
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _run_once(self) -> int:
+        spotify_client = SpotifyClient(cfg.SPOTIFY_CLIENT_ID, cfg.SPOTIFY_CLIENT_SECRET)
+        with SessionLocal() as session:
+            rolled_over = run_due_rollovers(session, spotify_client)
+            run_due_playlist_additions(session, spotify_client)
+            return rolled_over
+
+
+rollover_scheduler = RolloverScheduler()
@@ -0,0 +1,69 @@
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy.orm.session import Session
+
+from app import crud
+from app import schemas
+
+
+def get_user_song_matches(
+    payload: schemas.ResponsePost, sotw_id: int, week_num: int, session: Session
+) -> List[Dict[str, Any]]:
+    """
+    Work out which of the guesses in a survey response are correct.
+
+    The guessed songs and the previous week's songs are each loaded with a single query, however many guesses
+    the response makes.
+
+    Args:
+        payload (schemas.ResponsePost): The answers to the survey.
+        sotw_id (int): ID of the sotw being responded to.
+        week_num (int): Number of the week being responded to.
+        session (Session): A SQLAlchemy Session object that is connected to the database.
+
+    Raises:
+        HTTPException: 400 - a guessed song does not exist
+
+    Returns:
+        List[Dict[str, Any]]: The user id, song id and correct guess of each match.
+    """
+    if not payload.user_song_matches:
+        return []
+
+    guessed_songs = {
+        song.id: song
+        for song in crud.song.get_songs_by_ids(
+            session=session,
+            ids=[int(match.song_id) for match in payload.user_song_matches],
+        )
+    }
+    for match in payload.user_song_matches:
+        # the payload has some sort of error if the song can't be found
+        if int(match.song_id) not in guessed_songs:
+            raise HTTPException(
+                status_code=400,
+                detail=f"There's something wrong with your request. A song with the given id {match.song_id} does not exist.",
+            )
+
+    # the songs being guessed were submitted last week, a guess is right if it names one of their submitters
+    previous_week = crud.week.get_week_by_number(
+        session=session, week_num=week_num - 1, sotw_id=sotw_id
+    )
+    submitter_ids_by_name = defaultdict(set)
+    if previous_week is not None:
+        for song in crud.song.get_songs_from_week(
+            session=session, sotw_id=sotw_id, week_id=previous_week.id
+        ):
+            submitter_ids_by_name[song.name].add(song.submitter_id)
+
+    return [
+        {
+            "song_id": int(match.song_id),
+            "user_id": int(match.user_id),
+            "correct_guess": match.user_id
+            in submitter_ids_by_name[guessed_songs[int(match.song_id)].name],
+        }
+        for match in payload.user_song_matches
+    ]
@@ -1,8 +1,12 @@
+from app.crud.crud_job import job
+from app.crud.crud_response import async_response
 from app.crud.crud_response import response
 from app.crud.crud_results import results
 from app.crud.crud_song import song
+from app.crud.crud_sotw import async_sotw
 from app.crud.crud_sotw import sotw
 from app.crud.crud_user_song_match import user_song_match
 from app.crud.crud_user_playlist import user_playlist
 from app.crud.crud_user import user
+from app.crud.crud_week import async_week
 from app.crud.crud_week import week
@@ -0,0 +1,139 @@
+from typing import Any
+from typing import Dict
+from typing import Generic
+from typing import Optional
+from typing import Type
+from typing import Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.crud_base import CreateSchemaType
+from app.crud.crud_base import get_column_keys
+from app.crud.crud_base import ModelType
+from app.crud.crud_base import UpdateSchemaType
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType]) -> None:
+        """
+        Async CRUD object with default methods to Create, Read, Update, and Delete
+
+        Args:
+            model (Type[ModelType]): A SQLAlchemy model class.
+        """
+        self.model = model
+
+    async def get(self, session: AsyncSession, id: Any) -> Optional[ModelType]:
+        """
+        Session query to get an object from the database with the specified id
+
+        Args:
+            session (AsyncSession): a SQLAlchemy AsyncSession object that is connected to the database.
+            id (Any): The id of the object being sought after.
+
+        Returns:
+            Optional[ModelType]: The object in the db that was retreived or None
+        """
+        result = await session.execute(select(self.model).where(self.model.id == id))
+        return result.scalar_one_or_none()
+
+    async def create(
+        self,
+        session: AsyncSession,
+        *,
+        object_in: CreateSchemaType,
+        commit: bool = True,
+    ) -> ModelType:
+        """
+        Creates an object in the database with the type ModelType
+
+        Args:
+            session (AsyncSession): a SQLAlchemy AsyncSession object that is connected to the database.
+            object_in (CreateSchemaType): A pydantic model object that is used to create a db object.
+            commit (bool, optional): Commit the transaction and reload the object. When False the object is only
+                flushed, so it gets its id, and the caller commits. Defaults to True.
+
+        Returns:
+            ModelType: The newly created model object.
+        """
+        db_object = self.model(**object_in.model_dump())
+        session.add(db_object)
+        await self._save(session, db_object, commit)
+        return db_object
+
+    async def update(
+        self,
+        session: AsyncSession,
+        *,
+        db_object: ModelType,
+        object_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True,
+    ) -> ModelType:
+        """
+        Updates an object in the database
+
+        Args:
+            session (AsyncSession): a SQLAlchemy AsyncSession object that is connected to the database.
+            db_object (ModelType): An object from the database.
+            object_in (Union[UpdateSchemaType, Dict[str, Any]]): A pydantic model object used to update the db model object.
+            commit (bool, optional): Commit the transaction and reload the object. When False the change is only
+                flushed and the caller commits. Defaults to True.
+
+        Returns:
+            ModelType: The updated db model object.
+        """
+        # update the db object
+        update_data = (
+            object_in
+            if isinstance(object_in, dict)
+            else object_in.model_dump(exclude_unset=True)
+        )
+        column_keys = get_column_keys(self.model)
+        for field, value in update_data.items():
+            if field in column_keys:
+                setattr(db_object, field, value)
+        # update the db object through the session
+        session.add(db_object)
+        await self._save(session, db_object, commit)
+        return db_object
+
+    async def delete(
+        self, session: AsyncSession, *, id: int, commit: bool = True
+    ) -> ModelType:
+        """
+        Deletes an object from the database
+
+        Args:
+            session (AsyncSession): a SQLAlchemy AsyncSession object that is connected to the database
+            id (int): The id of the object being removed
+            commit (bool, optional): Commit the transaction. When False the delete is only flushed and the caller
+                commits. Defaults to True.
+
+        Returns:
+            ModelType: The deleted model object.
+        """
+        object = await session.get(self.model, id)
+        await session.delete(object)
+        if commit:
+            await session.commit()
+        else:
+            await session.flush()
+        return object
+
+    async def _save(
+        self, session: AsyncSession, db_object: ModelType, commit: bool
+    ) -> None:
+        """
+        Helper function to commit a change and reload the object, or to only flush it when the caller commits.
+
+        Args:
+            session (AsyncSession): a SQLAlchemy AsyncSession object that is connected to the database.
+            db_object (ModelType): The object that was added to the session.
+            commit (bool): Whether to commit the transaction.
+        """
+        if commit:
+            await session.commit()
+            await session.refresh(db_object)
+        else:
+            await session.flush()
@@ -1,6 +1,8 @@
+from functools import lru_cache
 from time import sleep
 from typing import Any
 from typing import Dict
+from typing import FrozenSet
 from typing import Generic
 from typing import Optional
 from typing import TypeVar
@@ -9,8 +11,8 @@ from typing import Union
 from pydantic import BaseModel
 from loguru import logger
 
-from fastapi.encoders import jsonable_encoder
 from sqlalchemy import create_engine
+from sqlalchemy import inspect
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Session
 
@@ -22,6 +24,20 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+@lru_cache(maxsize=None)
+def get_column_keys(model: Type[Base]) -> FrozenSet[str]:
+    """
+    Get the names of a model's column attributes, worked out once per model class.
+
+    Args:
+        model (Type[Base]): A SQLAlchemy model class.
+
+    Returns:
+        FrozenSet[str]: The attribute names of the model's columns.
+    """
+    return frozenset(attribute.key for attribute in inspect(model).column_attrs)
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]) -> None:
         """
@@ -45,21 +61,24 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         return session.query(self.model).filter(self.model.id == id).scalar()
 
-    def create(self, session: Session, *, object_in: CreateSchemaType) -> ModelType:
+    def create(
+        self, session: Session, *, object_in: CreateSchemaType, commit: bool = True
+    ) -> ModelType:
         """
         Creates an object in the database with the type ModelType
 
         Args:
             session (Session): a SQLAlchemy Session object that is connected to the database.
             object_in (CreateSchemaType): A pydantic model object that is used to create a db object.
+            commit (bool, optional): Commit the transaction and reload the object. When False the object is only
+                flushed, so it gets its id, and the caller commits. Defaults to True.
 
         Returns:
             ModelType: The newly created model object.
         """
-        db_object = self.model(**jsonable_encoder(object_in))
+        db_object = self.model(**object_in.model_dump())
         session.add(db_object)
-        session.commit()
-        session.refresh(db_object)
+        self._save(session, db_object, commit)
         return db_object
 
     def update(
@@ -68,6 +87,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         *,
         db_object: ModelType,
         object_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True,
     ) -> ModelType:
         """
         Updates an object in the database
@@ -76,6 +96,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             session (Session): a SQLAlchemy Session object that is connected to the database.
             db_object (ModelType): An object from the database.
             object_in (Union[UpdateSchemaType, Dict[str, Any]]): A pydantic model object used to update the db model object.
+            commit (bool, optional): Commit the transaction and reload the object. When False the change is only
+                flushed and the caller commits. Defaults to True.
 
         Returns:
             ModelType: The updated db model object.
@@ -86,27 +108,49 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if isinstance(object_in, dict)
             else object_in.model_dump(exclude_unset=True)
         )
-        for field in jsonable_encoder(db_object):
-            if field in update_data.keys():
-                setattr(db_object, field, update_data[field])
+        column_keys = get_column_keys(self.model)
+        for field, value in update_data.items():
+            if field in column_keys:
+                setattr(db_object, field, value)
         # update the db object through the session
         session.add(db_object)
-        session.commit()
-        session.refresh(db_object)
+        self._save(session, db_object, commit)
         return db_object
 
-    def delete(self, session: Session, *, id: int) -> ModelType:
+    def delete(
+        self, session: Session, *, id: int, commit: bool = True
+    ) -> ModelType:
         """
         Deletes an object from the database
 
         Args:
             session (Session): a SQLAlchemy Session object that is connected to the database
             id (int): The id of the object being removed
+            commit (bool, optional): Commit the transaction. When False the delete is only flushed and the caller
+                commits. Defaults to True.
 
         Returns:
             ModelType: The deleted model object.
         """
         object = session.query(self.model).get(id)
         session.delete(object)
-        session.commit()
+        if commit:
+            session.commit()
+        else:
+            session.flush()
         return object
+
+    def _save(self, session: Session, db_object: ModelType, commit: bool) -> None:
+        """
+        Helper function to commit a change and reload the object, or to only flush it when the caller commits.
+
+        Args:
+            session (Session): a SQLAlchemy Session object that is connected to the database.
+            db_object (ModelType): The object that was added to the session.
+            commit (bool): Whether to commit the transaction.
+        """
+        if commit:
+            session.commit()
+            session.refresh(db_object)
+        else:
+            session.flush()
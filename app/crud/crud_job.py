@@ -0,0 +1,264 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import uuid4
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.crud.crud_base import CRUDBase
+from app.models.job import Job
+from app.schemas.job import JobCreate
+from app.schemas.job import JobUpdate
+from app.shared.config import cfg
+
+
+WEEK_ROLLOVER = "week_rollover"
+PLAYLIST_RENAME = "playlist_rename"
+PLAYLIST_ADD = "playlist_add"
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class CRUDJob(CRUDBase[Job, JobCreate, JobUpdate]):
+    def get_active_job_for_sotw(
+        self, session: Session, *, sotw_id: int, job_type: str
+    ) -> Optional[Job]:
+        """
+        Retrieve the pending or running job of the given type for a sotw.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            sotw_id (int): The ID of the sotw the job belongs to.
+            job_type (str): The type of job being sought.
+
+        Returns:
+            Optional[Job]: The active job model object or None.
+        """
+        return (
+            session.query(Job)
+            .filter(
+                and_(
+                    Job.sotw_id == sotw_id,
+                    Job.job_type == job_type,
+                    Job.status.in_([PENDING, RUNNING]),
+                )
+            )
+            .first()
+        )
+
+    def get_latest_job_for_sotw(
+        self, session: Session, *, sotw_id: int, job_type: str
+    ) -> Optional[Job]:
+        """
+        Retrieve the most recently created job of the given type for a sotw.
+
+        The job is reloaded even if it is already in the session, since the worker running it updates it from
+        another session.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            sotw_id (int): The ID of the sotw the job belongs to.
+            job_type (str): The type of job being sought.
+
+        Returns:
+            Optional[Job]: The latest job model object or None.
+        """
+        return (
+            session.query(Job)
+            .filter(and_(Job.sotw_id == sotw_id, Job.job_type == job_type))
+            .order_by(Job.id.desc())
+            .populate_existing()
+            .first()
+        )
+
+    def get_due_jobs(
+        self, session: Session, *, job_type: str, now: float
+    ) -> List[Job]:
+        """
+        Retrieve all the jobs of the given type that should have run by `now`.
+
+        Running jobs whose lock has gone stale are included so that a worker that died mid-run does not block the
+        sotw forever.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            job_type (str): The type of jobs being sought.
+            now (float): The current timestamp in milliseconds.
+
+        Returns:
+            List[Job]: The due job model objects, oldest first.
+        """
+        return (
+            session.query(Job)
+            .filter(
+                and_(
+                    Job.job_type == job_type,
+                    Job.run_at <= now,
+                    self._claimable(),
+                )
+            )
+            .order_by(Job.run_at)
+            .all()
+        )
+
+    def claim(self, session: Session, *, job_id: int) -> Optional[str]:
+        """
+        Atomically mark a job as running so that only one worker runs it.
+
+        The status is flipped with a single compare-and-set UPDATE, so when several workers race for the same job
+        only the one whose UPDATE matched the row gets to run it. Every claim gets a new lease. A running job whose
+        lock went stale can be claimed again, so the worker writes to its job through `update_claimed` with its
+        lease and stops as soon as a write is refused.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            job_id (int): The ID of the job to claim.
+
+        Returns:
+            Optional[str]: The lease of this worker's claim, or None if another worker got to the job first.
+        """
+        lease = uuid4().hex
+        result = session.execute(
+            update(Job)
+            .where(and_(Job.id == job_id, self._claimable()))
+            .values(
+                status=RUNNING,
+                lease=lease,
+                attempts=Job.attempts + 1,
+                updated_at=datetime.now(timezone.utc),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        return lease if result.rowcount == 1 else None
+
+    def update_claimed(
+        self, session: Session, *, job_id: int, lease: str, object_in: JobUpdate
+    ) -> bool:
+        """
+        Update a running job, as long as it is still held by the claim with the given lease.
+
+        Every update also renews the claim's lock, so a worker that is still busy with its job calls this with an
+        empty update well within `cfg.ROLLOVER_LOCK_TIMEOUT_SECONDS` to keep the job from being claimed again.
+        The update is committed along with anything else pending in the session, and when it is refused the
+        session is rolled back instead.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            job_id (int): The ID of the claimed job.
+            lease (str): The lease returned by `claim`.
+            object_in (JobUpdate): The fields to update.
+
+        Returns:
+            bool: True if the job was updated, False if another worker claimed it since.
+        """
+        values = object_in.model_dump(exclude_unset=True)
+        values.setdefault("updated_at", datetime.now(timezone.utc))
+        result = session.execute(
+            update(Job)
+            .where(and_(Job.id == job_id, Job.lease == lease, Job.status == RUNNING))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            # the worker lost its job, nothing else it did in this transaction is kept either
+            session.rollback()
+            return False
+        session.commit()
+        return True
+
+    def update_pending(
+        self,
+        session: Session,
+        *,
+        job_id: int,
+        object_in: JobUpdate,
+        commit: bool = True,
+    ) -> bool:
+        """
+        Update a job, as long as no worker has claimed it yet.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            job_id (int): The ID of the pending job.
+            object_in (JobUpdate): The fields to update.
+            commit (bool, optional): Commit the transaction. When False the caller commits. Defaults to True.
+
+        Returns:
+            bool: True if the job was updated, False if it is no longer pending.
+        """
+        values = object_in.model_dump(exclude_unset=True)
+        values.setdefault("updated_at", datetime.now(timezone.utc))
+        result = session.execute(
+            update(Job)
+            .where(and_(Job.id == job_id, Job.status == PENDING))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
+            session.commit()
+        return result.rowcount == 1
+
+    def _claimable(self):
+        """
+        Helper function to build the filter matching jobs that are free to be claimed.
+
+        Returns:
+            ColumnElement: Filter for pending jobs and running jobs whose lock is older than `cfg.ROLLOVER_LOCK_TIMEOUT_SECONDS`.
+        """
+        stale_before = datetime.now(timezone.utc) - timedelta(
+            seconds=cfg.ROLLOVER_LOCK_TIMEOUT_SECONDS
+        )
+        return or_(
+            Job.status == PENDING,
+            and_(Job.status == RUNNING, Job.updated_at < stale_before),
+        )
+
+    def schedule(
+        self, session: Session, *, sotw_id: int, job_type: str, run_at: float
+    ) -> Job:
+        """
+        Schedule a job for a sotw, moving an already pending job of the same type instead of creating a duplicate.
+
+        A job that is already running is left alone, the worker running it schedules the next one when it is done.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            sotw_id (int): The ID of the sotw the job belongs to.
+            job_type (str): The type of job to schedule.
+            run_at (float): Timestamp in milliseconds at which the job should run.
+
+        Returns:
+            Job: The active job model object.
+        """
+        job = self.get_active_job_for_sotw(
+            session=session, sotw_id=sotw_id, job_type=job_type
+        )
+        if job is None:
+            try:
+                return self.create(
+                    session=session,
+                    object_in=JobCreate(
+                        job_type=job_type, sotw_id=sotw_id, run_at=run_at
+                    ),
+                )
+            except IntegrityError:
+                # another request scheduled the job first
+                session.rollback()
+                return self.get_active_job_for_sotw(
+                    session=session, sotw_id=sotw_id, job_type=job_type
+                )
+        if job.status == RUNNING or job.run_at == run_at:
+            return job
+        return self.update(
+            session=session,
+            db_object=job,
+            object_in=JobUpdate(run_at=run_at, updated_at=datetime.now(timezone.utc)),
+        )
+
+
+job = CRUDJob(Job)
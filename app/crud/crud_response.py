@@ -1,13 +1,45 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete
+from sqlalchemy import exists
+from sqlalchemy import insert
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app.crud.crud_async_base import AsyncCRUDBase
 from app.crud.crud_base import CRUDBase
 from app.models.response import Response
+from app.models.song import Song
+from app.models.user_song_match import UserSongMatch
 from app.schemas.response import ResponseCreate
 from app.schemas.response import ResponseUpdate
+from app.schemas.song import SongCreate
+from app.shared.utils import get_song_fingerprint
 
 
 class CRUDResponse(CRUDBase[Response, ResponseCreate, ResponseUpdate]):
+    def create(
+        self, session: Session, *, object_in: ResponseCreate, commit: bool = True
+    ) -> Response:
+        """
+        Creates a response in the database, indexing its song for repeat detection.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            object_in (ResponseCreate): A pydantic model used to create the response.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
+
+        Returns:
+            Response: The newly created response.
+        """
+        db_object = Response(**object_in.model_dump())
+        _index_song(db_object, session.get(Song, object_in.next_song_id))
+        session.add(db_object)
+        self._save(session, db_object, commit)
+        return db_object
+
     def get_by_sotw_and_submitter(
         self, 
         session: Session, 
@@ -36,5 +68,169 @@ class CRUDResponse(CRUDBase[Response, ResponseCreate, ResponseUpdate]):
         return response
 
 
+    def get_responses_for_week(
+        self, session: Session, *, week_id: str
+    ) -> List[Response]:
+        """
+        Retrieve every response to a week, with their user song matches loaded.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            week_id (str): The ID of the week for which the responses are being sought.
+
+        Returns:
+            List[Response]: The week's response model objects.
+        """
+        return (
+            session.query(Response)
+            .filter(Response.week_id == week_id)
+            .options(selectinload(Response.user_song_matches))
+            .order_by(Response.id)
+            .all()
+        )
+
+    def create_submission(
+        self,
+        session: Session,
+        *,
+        song_in: SongCreate,
+        response_data: Dict[str, Any],
+        user_song_matches: List[Dict[str, Any]],
+        replaces: Optional[Response] = None,
+        commit: bool = True,
+    ) -> Response:
+        """
+        Store a survey submission, its song and its user song matches in a single transaction.
+
+        The matches are written with one bulk insert and everything, including removing the response being
+        replaced, is committed once.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            song_in (SongCreate): A pydantic model used to create the submitted song.
+            response_data (Dict[str, Any]): The response's columns, except for its song id.
+            user_song_matches (List[Dict[str, Any]]): The user id, song id and correct guess of each match.
+            replaces (Optional[Response], optional): A response the user submitted earlier in the week, deleted
+                with its song and matches. Defaults to None.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
+
+        Returns:
+            Response: The newly created response.
+        """
+        if replaces is not None:
+            replaced_id, replaced_song_id = replaces.id, replaces.next_song_id
+            session.execute(
+                delete(UserSongMatch).where(UserSongMatch.response_id == replaced_id)
+            )
+            session.execute(delete(Response).where(Response.id == replaced_id))
+            session.execute(delete(Song).where(Song.id == replaced_song_id))
+
+        song = Song(**song_in.model_dump())
+        response = Response(**response_data, next_song=song)
+        _index_song(response, song)
+        session.add(response)
+        session.flush()
+
+        if user_song_matches:
+            session.execute(
+                insert(UserSongMatch),
+                [
+                    {**user_song_match, "response_id": response.id}
+                    for user_song_match in user_song_matches
+                ],
+            )
+        self._save(session, response, commit)
+        return response
+
+    def is_repeat(
+        self,
+        session: Session,
+        *,
+        sotw_id: int,
+        week_id: str,
+        spotify_id: str,
+        name: str,
+    ) -> bool:
+        """
+        Check whether a song was already submitted to a sotw before the given week.
+
+        A song counts as submitted before if a response from another week has the same spotify track or the same
+        normalized name, each looked up through an index on the sotw and the song's fingerprint.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            sotw_id (int): The ID of the sotw being searched in.
+            week_id (str): The ID of the week to exclude from the search.
+            spotify_id (str): The spotify track id of the song.
+            name (str): The name of the song like `song_name - artist1, artist2`.
+
+        Returns:
+            bool: True if the song is a repeat.
+        """
+        return session.scalar(
+            select(
+                exists().where(
+                    Response.sotw_id == sotw_id,
+                    Response.week_id != week_id,
+                    or_(
+                        Response.next_song_spotify_id == spotify_id,
+                        Response.next_song_fingerprint == get_song_fingerprint(name),
+                    ),
+                )
+            )
+        )
+
+
+class AsyncCRUDResponse(AsyncCRUDBase[Response, ResponseCreate, ResponseUpdate]):
+    async def get_by_sotw_and_submitter(
+        self,
+        session: AsyncSession,
+        *,
+        sotw_id: int,
+        submitter_id: int,
+        week_id: str,
+    ) -> Optional[Response]:
+        """
+        Retrieve the response object with the corresponding sotw id and submitter id, with its song and matches loaded.
+
+        Args:
+            session (AsyncSession): A SQLAlchemy AsyncSession object that is connected to the database.
+            sotw_id (int): The ID of the sotw for which the response is being sought.
+            submitter_id (int): The ID of the user for which the response is being sought.
+            week_id (str): The ID of the week for which the response is being sought.
+
+        Returns:
+            Optional[Response]: A response model object.
+        """
+        result = await session.execute(
+            select(Response)
+            .where(
+                Response.sotw_id == sotw_id,
+                Response.submitter_id == submitter_id,
+                Response.week_id == week_id,
+            )
+            .options(
+                selectinload(Response.next_song),
+                selectinload(Response.user_song_matches),
+            )
+        )
+        return result.scalars().first()
+
+
+def _index_song(response: Response, song: Optional[Song]) -> None:
+    """
+    Helper function to copy the keys repeat detection looks songs up by onto the response submitting the song.
+
+    Args:
+        response (Response): A response model object.
+        song (Optional[Song]): The song submitted with the response.
+    """
+    if song is None:
+        return
+    response.next_song_spotify_id = song.spotify_id
+    response.next_song_fingerprint = get_song_fingerprint(song.name)
+
 
 response = CRUDResponse(Response)
+async_response = AsyncCRUDResponse(Response)
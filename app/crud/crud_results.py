@@ -1,11 +1,13 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
+from app.core.results_cache import results_cache
 from app.crud.crud_base import CRUDBase
 from app.models.results import Results
+from app.models.week import Week
 from app.schemas.results import ResultsCreate
 from app.schemas.results import ResultsUpdate
 
@@ -32,4 +34,78 @@ class CRUDResults(CRUDBase[Results, ResultsCreate, ResultsUpdate]):
         )
 
 
+    def get_results_by_week_num(
+        self, session: Session, *, week_num: int, sotw_id: int
+    ) -> Optional[Results]:
+        """
+        Retrieve the results object for the week with the given number in a sotw, without loading the week.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            week_num (int): The number of the week for which the results are being sought.
+            sotw_id (int): The ID of the sotw for which the results are being sought.
+
+        Returns:
+            Optional[Results]: A results model object.
+        """
+        return (
+            session.query(Results)
+            .join(Week, Results.week_id == Week.id)
+            .filter(and_(Week.week_num == week_num, Week.sotw_id == sotw_id))
+            .scalar()
+        )
+
+
+    def update(
+        self,
+        session: Session,
+        *,
+        db_object: Results,
+        object_in: Union[ResultsUpdate, Dict[str, Any]],
+        commit: bool = True,
+    ) -> Results:
+        """
+        Updates the results of a week in the database and drops them from the results cache.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            db_object (Results): A model object of the results to update.
+            object_in (Union[ResultsUpdate, Dict[str, Any]]): A pydantic model or dict used to update the results.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
+
+        Returns:
+            Results: The updated results.
+        """
+        results = super().update(
+            session=session, db_object=db_object, object_in=object_in, commit=commit
+        )
+        self._invalidate(session, results.sotw_id, results.week_id)
+        return results
+
+    def delete(self, session: Session, *, id: int, commit: bool = True) -> Results:
+        """
+        Deletes the results of a week from the database and drops them from the results cache.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            id (int): The id of the results being removed.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
+
+        Returns:
+            Results: The deleted results.
+        """
+        db_object = session.get(Results, id)
+        sotw_id, week_id = db_object.sotw_id, db_object.week_id
+        results = super().delete(session=session, id=id, commit=commit)
+        self._invalidate(session, sotw_id, week_id)
+        return results
+
+    def _invalidate(self, session: Session, sotw_id: int, week_id: str) -> None:
+        week = session.get(Week, week_id)
+        if week is not None:
+            results_cache.invalidate(sotw_id, week.week_num)
+
+
 results = CRUDResults(Results)
@@ -32,54 +32,20 @@ class CRUDSong(CRUDBase[Song, SongCreate, SongUpdate]):
             .all()
         )
 
-    def get_songs_by_name(
-        self,
-        session: Session,
-        *,
-        name: str,
-        sotw_id: int,
-        week_id: int,
-        this_week: bool = False
-    ) -> Song | None:
+    def get_songs_by_ids(self, session: Session, *, ids: List[int]) -> List[Song]:
         """
-        Retrieves song(s) with the same name value as the one given.
+        Retrieves the songs with the given ids in a single query.
 
         Args:
             session (Session): A SQLAlchemy Session object that is connected to the database.
-            name (str): The name of a song and the artist(s) like `song_name - artist(1, artist2, etc.).
-            sotw_id (int): The ID of the sotw being searched in.
-            week_id (int): The ID of the week to exclude from the search (only want songs from outside of the given week).
+            ids (List[int]): The ids of the songs being sought after.
 
         Returns:
-            Song: Song object(s) from the db.
+            List[Song]: The song objects that were found, in no particular order.
         """
-        return (
-            (
-                session.query(Song)
-                .join(Response)
-                .filter(
-                    and_(
-                        Song.name == name,
-                        Response.sotw_id == sotw_id,
-                        Response.week_id != week_id,
-                    )
-                )
-                .all()
-            )
-            if not this_week
-            else (
-                session.query(Song)
-                .join(Response)
-                .filter(
-                    and_(
-                        Song.name == name,
-                        Response.sotw_id == sotw_id,
-                        Response.week_id == week_id,
-                    )
-                )
-                .all()
-            )
-        )
+        if not ids:
+            return []
+        return session.query(Song).filter(Song.id.in_(ids)).all()
 
 
 song = CRUDSong(Song)
@@ -1,24 +1,33 @@
 from datetime import datetime, timedelta
 import random
 import string
+from sqlalchemy import exists
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from loguru import logger
 
+from app.crud.crud_async_base import AsyncCRUDBase
 from app.crud.crud_base import CRUDBase
 from app.models.sotw import Sotw
+from app.models.sotw_user_association import sotw_user_association_table
 from app.schemas.sotw import SotwCreate
 from app.schemas.sotw import SotwUpdate
 from app.shared.config import cfg
 
 
 class CRUDSotw(CRUDBase[Sotw, SotwCreate, SotwUpdate]):
-    def create(self, session: Session, *, object_in: SotwCreate) -> Sotw:
+    def create(
+        self, session: Session, *, object_in: SotwCreate, commit: bool = True
+    ) -> Sotw:
         """
         Creates a Sotw object in the database.
 
         Args:
             session (Session): A SQLAlchemy Session object that is connected to the database.
             object_in (SotwCreate): A pydantic model to create the sotw with.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
 
         Returns:
             Sotw: Newly created sotw object.
@@ -26,9 +35,52 @@ class CRUDSotw(CRUDBase[Sotw, SotwCreate, SotwUpdate]):
         db_object = Sotw(**object_in.model_dump())
 
         session.add(db_object)
-        session.commit()
+        if commit:
+            session.commit()
+        else:
+            session.flush()
 
         return db_object
 
+    def is_member(self, session: Session, *, user_id: int, sotw_id: int) -> bool:
+        """
+        Check whether a user is a member of a sotw with a single EXISTS on the membership table's primary key.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            user_id (int): ID of the user.
+            sotw_id (int): ID of the sotw.
+
+        Returns:
+            bool: True if the user is a member of the sotw.
+        """
+        return session.scalar(select(_membership_exists(user_id, sotw_id)))
+
+
+class AsyncCRUDSotw(AsyncCRUDBase[Sotw, SotwCreate, SotwUpdate]):
+    async def is_member(
+        self, session: AsyncSession, *, user_id: int, sotw_id: int
+    ) -> bool:
+        """
+        Check whether a user is a member of a sotw with a single EXISTS on the membership table's primary key.
+
+        Args:
+            session (AsyncSession): A SQLAlchemy AsyncSession object that is connected to the database.
+            user_id (int): ID of the user.
+            sotw_id (int): ID of the sotw.
+
+        Returns:
+            bool: True if the user is a member of the sotw.
+        """
+        return await session.scalar(select(_membership_exists(user_id, sotw_id)))
+
+
+def _membership_exists(user_id: int, sotw_id: int):
+    return exists().where(
+        sotw_user_association_table.c.sotw_id == sotw_id,
+        sotw_user_association_table.c.user_id == user_id,
+    )
+
 
 sotw = CRUDSotw(Sotw)
+async_sotw = AsyncCRUDSotw(Sotw)
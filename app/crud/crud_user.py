@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from loguru import logger
 
 from app.crud.crud_base import CRUDBase
@@ -9,10 +9,34 @@ from app.models.sotw import Sotw
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.schemas.user import UserUpdate
+from app.core.auth_cache import user_cache
+from app.core.membership import membership_cache
 from app.core.security import get_password_hash
 
 
+# loads everything a user payload includes in two round-trips, however many sotws the user is in
+USER_PAYLOAD_OPTIONS = (joinedload(User.playlists), selectinload(User.sotw_list))
+
+
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
+    def get_with_memberships(self, session: Session, *, id: int) -> Optional[User]:
+        """
+        Get a user model object with its playlists and sotws loaded.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            id (int): The id of the user being sought after.
+
+        Returns:
+            Optional[User]: The user with the given id.
+        """
+        return (
+            session.query(User)
+            .options(*USER_PAYLOAD_OPTIONS)
+            .filter(User.id == id)
+            .first()
+        )
+
     def get_by_email(self, session: Session, *, email: str) -> Optional[User]:
         """
         Get a user model object from the database with the specified email
@@ -26,13 +50,17 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         """
         return session.query(User).filter(User.email == email).first()
 
-    def create(self, session: Session, *, object_in: UserCreate) -> User:
+    def create(
+        self, session: Session, *, object_in: UserCreate, commit: bool = True
+    ) -> User:
         """
         Creates a User in the database with a hashed password.
 
         Args:
             session (Session): A SQLAlchemy Session object that is connected to the database.
             object_in (UserCreate): A pydantic model used to create the user.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
 
         Returns:
             User: The newly created user.
@@ -43,12 +71,64 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         db_object = User(**create_data)
         db_object.password = get_password_hash(object_in.password)
         session.add(db_object)
+        if not commit:
+            session.flush()
+            return db_object
         session.commit()
 
         return self.get_by_email(session=session, email=db_object.email)
 
+    def update(
+        self,
+        session: Session,
+        *,
+        db_object: User,
+        object_in: Union[UserUpdate, Dict[str, Any]],
+        commit: bool = True,
+    ) -> User:
+        """
+        Updates a user in the database and drops them from the authenticated user cache.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            db_object (User): A model object of the user to update.
+            object_in (Union[UserUpdate, Dict[str, Any]]): A pydantic model or dict used to update the user.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
+
+        Returns:
+            User: The updated user.
+        """
+        user = super().update(
+            session=session, db_object=db_object, object_in=object_in, commit=commit
+        )
+        user_cache.invalidate(user.id)
+        return user
+
+    def delete(self, session: Session, *, id: int, commit: bool = True) -> User:
+        """
+        Deletes a user from the database and drops them from the authenticated user cache.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            id (int): The id of the user being removed.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
+
+        Returns:
+            User: The deleted user.
+        """
+        user = super().delete(session=session, id=id, commit=commit)
+        user_cache.invalidate(id)
+        return user
+
     def add_user_to_sotw(
-        self, session: Session, *, db_object: User, object_in: Sotw
+        self,
+        session: Session,
+        *,
+        db_object: User,
+        object_in: Sotw,
+        commit: bool = True,
     ) -> User:
         """
         Adds the sotw to the user (and vice versa via model relationship)
@@ -57,18 +137,24 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             session (Session): A SQLAlchemy Session object that is connected to the database.
             db_object (User): A model object of the user to update.
             object_in (Sotw): A sotw model object to add to the user.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
 
         Returns:
             User: The newly updated user.
         """
         db_object.sotw_list.append(object_in)
         session.add(db_object)
-        session.commit()
-        session.refresh(db_object)
+        self._save(session, db_object, commit)
         return db_object
 
     def remove_user_from_sotw(
-        self, session: Session, *, db_object: User, object_in: Sotw
+        self,
+        session: Session,
+        *,
+        db_object: User,
+        object_in: Sotw,
+        commit: bool = True,
     ) -> User:
         """
         Removes the sotw from the user (and vice versa via model relationship)
@@ -77,6 +163,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             session (Session): A SQLAlchemy Session object that is connected to the database.
             db_object (User): A model object of the user to update.
             object_in (Sotw): A sotw model object to remove from the user.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
 
         Returns:
             User: The newly updated user.
@@ -89,8 +177,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         if index is not None:
             del db_object.sotw_list[index]
         session.add(db_object)
-        session.commit()
-        session.refresh(db_object)
+        self._save(session, db_object, commit)
+        membership_cache.invalidate(db_object.id, object_in.id)
         return db_object
 
     def get_submitted_users(self, session: Session, *, week_id: str) -> List[User]:
@@ -111,5 +199,20 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             .all()
         )
 
+    def get_users_by_ids(self, session: Session, *, ids: List[int]) -> List[User]:
+        """
+        Get the users with the given ids in a single query.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            ids (List[int]): The ids of the users being sought after.
+
+        Returns:
+            List[User]: The user model objects that were found, in no particular order.
+        """
+        if not ids:
+            return []
+        return session.query(User).filter(User.id.in_(ids)).all()
+
 
 user = CRUDUser(User)
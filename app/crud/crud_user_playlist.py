@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from typing import List
 
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
@@ -30,5 +31,20 @@ class CRUDUserPlaylist(CRUDBase[UserPlaylist, UserPlaylistCreate, UserPlaylistUp
             .first()
         )
 
+    def get_playlists_for_sotw(
+        self, session: Session, *, sotw_id: int
+    ) -> List[UserPlaylist]:
+        """
+        Retrieves every user playlist belonging to a sotw.
+
+        Args:
+            session (Session): A SQLAlchemy Session object that is connected to the database.
+            sotw_id (int): The id of the sotw for which the playlists are being sought.
+
+        Returns:
+            List[UserPlaylist]: The user playlist model objects of the sotw's members.
+        """
+        return session.query(UserPlaylist).filter(UserPlaylist.sotw_id == sotw_id).all()
+
 
 user_playlist = CRUDUserPlaylist(UserPlaylist)
@@ -1,8 +1,10 @@
 from typing import List, Optional
-from sqlalchemy import and_, func
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from loguru import logger
 
+from app.crud.crud_async_base import AsyncCRUDBase
 from app.crud.crud_base import CRUDBase
 from app.models.response import Response
 from app.models.week import Week
@@ -28,6 +30,8 @@ class CRUDWeek(CRUDBase[Week, WeekCreate, WeekUpdate]):
         """
         Session query to get the current week from a sotw
 
+        The week with the highest number is found in a single lookup on the sotw_id, week_num unique index.
+
         Args:
             session (Session): A SQLAlchemy Session object that is connected to the database.
             sotw_id (int): The sotw ID of the Week being sought after.
@@ -35,30 +39,12 @@ class CRUDWeek(CRUDBase[Week, WeekCreate, WeekUpdate]):
         Returns:
             Optional[Week]: The latest week model object in the sotw.
         """
-        sub_query = self._get_current_week_num(session=session, sotw_id=sotw_id)
         return (
             session.query(Week)
-            .filter(Week.sotw_id == sotw_id, Week.week_num == sub_query)
-            .one_or_none()
-        )
-
-    def _get_current_week_num(
-        self, session: Session, *, sotw_id: int
-    ) -> Optional[Week]:
-        """
-        Helper function to get the current week in a sotw.
-
-        Args:
-            session (Session): A SQLAlchemy Session object that is connected to the database.
-            sotw_id (int): The sotw ID of the Week being sought after.
-
-        Returns:
-            Optional[Week]: The week model object with the maximum week_num value for the given sotw.
-        """
-        return (
-            session.query(func.max(Week.week_num))
             .filter(Week.sotw_id == sotw_id)
-            .scalar()
+            .order_by(Week.week_num.desc())
+            .limit(1)
+            .one_or_none()
         )
 
     def get_week_by_number(
@@ -82,7 +68,12 @@ class CRUDWeek(CRUDBase[Week, WeekCreate, WeekUpdate]):
         )
 
     def add_response_to_week(
-        self, session: Session, *, db_object: Week, object_in: Response
+        self,
+        session: Session,
+        *,
+        db_object: Week,
+        object_in: Response,
+        commit: bool = True,
     ) -> Week:
         """
         Adds the response to the week (and vice versa via model relationship)
@@ -91,14 +82,15 @@ class CRUDWeek(CRUDBase[Week, WeekCreate, WeekUpdate]):
             session (Session): a SQLAlchemy Session object that is connected to the database.
             db_object (Week): a model object of the week to update.
             object_in (Response): A response model object.
+            commit (bool, optional): Commit the transaction. When False the change is only flushed and the caller
+                commits. Defaults to True.
 
         Returns:
             Week: The week given with the new response in it's responses list.
         """
         db_object.responses.append(object_in)
         session.add(db_object)
-        session.commit()
-        session.refresh(db_object)
+        self._save(session, db_object, commit)
         return db_object
 
     def get_all_weeks_in_sotw(self, session: Session, *, sotw_id) -> List[Week]:
@@ -115,4 +107,48 @@ class CRUDWeek(CRUDBase[Week, WeekCreate, WeekUpdate]):
         return session.query(Week).filter(Week.sotw_id == sotw_id).all()
 
 
+class AsyncCRUDWeek(AsyncCRUDBase[Week, WeekCreate, WeekUpdate]):
+    async def get_current_week(
+        self, session: AsyncSession, *, sotw_id: int
+    ) -> Optional[Week]:
+        """
+        Session query to get the current week from a sotw, with its responses loaded.
+
+        Args:
+            session (AsyncSession): A SQLAlchemy AsyncSession object that is connected to the database.
+            sotw_id (int): The sotw ID of the Week being sought after.
+
+        Returns:
+            Optional[Week]: The latest week model object in the sotw.
+        """
+        result = await session.execute(
+            select(Week)
+            .where(Week.sotw_id == sotw_id)
+            .order_by(Week.week_num.desc())
+            .limit(1)
+            .options(selectinload(Week.responses))
+        )
+        return result.scalar_one_or_none()
+
+    async def get_week_by_number(
+        self, session: AsyncSession, *, week_num: int, sotw_id: int
+    ) -> Optional[Week]:
+        """
+        Session query to get a week from a sotw by its number.
+
+        Args:
+            session (AsyncSession): A SQLAlchemy AsyncSession object that is connected to the database.
+            week_num (int): The number of the week being sought after.
+            sotw_id (int): The sotw ID of the week being sought after.
+
+        Returns:
+            Optional[Week]: The week model object with the given number for the given sotw.
+        """
+        result = await session.execute(
+            select(Week).where(and_(Week.week_num == week_num, Week.sotw_id == sotw_id))
+        )
+        return result.scalar_one_or_none()
+
+
 week = CRUDWeek(Week)
+async_week = AsyncCRUDWeek(Week)
@@ -7,3 +7,4 @@ from app.models.user_song_match import UserSongMatch
 from app.models.user_playlist import UserPlaylist
 from app.models.user import User
 from app.models.week import Week
+from app.models.job import Job
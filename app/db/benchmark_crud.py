@@ -0,0 +1,119 @@
+"""
+Compare how fast the crud objects build and update model objects with the current code and with the
+`jsonable_encoder` based code they used before.
+
+`CRUDBase.create` used to round-trip the pydantic model through `jsonable_encoder` and `CRUDBase.update` used to
+encode the whole db object to find the fields to set. The benchmark times both against `model_dump` and the
+cached column keys on an in-memory sqlite database.
+
+    python -m app.db.benchmark_crud [--repeat 500]
+"""
+import argparse
+from datetime import datetime, timezone
+import sys
+import time
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app import schemas
+from app.crud.crud_base import get_column_keys
+from app.db.base import Base
+from app.models.song import Song
+
+
+def _legacy_update(db_object, update_data):
+    # how `CRUDBase.update` used to find the fields to set
+    for field in jsonable_encoder(db_object):
+        if field in update_data.keys():
+            setattr(db_object, field, update_data[field])
+
+
+def _update(db_object, update_data):
+    column_keys = get_column_keys(type(db_object))
+    for field, value in update_data.items():
+        if field in column_keys:
+            setattr(db_object, field, value)
+
+
+def _time(function: Callable[[int], object], repeat: int) -> float:
+    """
+    Run a function a number of times.
+
+    Args:
+        function (Callable[[int], object]): The function to time, called with the number of the run.
+        repeat (int): Number of times to run it.
+
+    Returns:
+        float: The number of runs per second.
+    """
+    start = time.perf_counter()
+    for run in range(repeat):
+        function(run)
+    return repeat / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    user = crud.user.create(
+        session,
+        object_in=schemas.UserCreate(
+            email="benchmark@example.com", name="benchmark", password="password"
+        ),
+    )
+    user = crud.user.update(
+        session,
+        db_object=user,
+        object_in=schemas.UserUpdate(
+            spotify_linked=True,
+            spotify_access_token="access" * 20,
+            spotify_refresh_token="refresh" * 20,
+            spotify_user_id="spotify-user",
+            spotify_accessed_date=datetime.now(timezone.utc),
+            spotify_token_expires_in=3600,
+        ),
+    )
+    song_in = schemas.SongCreate(
+        spotify_id="spotify-id",
+        spotify_link="https://open.spotify.com/track/spotify-id",
+        name="song - artist",
+        submitter_id=user.id,
+    )
+
+    results = {
+        "update with jsonable_encoder": _time(
+            lambda run: _legacy_update(user, {"name": f"legacy {run}"}), args.repeat
+        ),
+        "update with cached columns": _time(
+            lambda run: _update(user, {"name": f"new {run}"}), args.repeat
+        ),
+        "create with jsonable_encoder": _time(
+            lambda run: Song(**jsonable_encoder(song_in)), args.repeat
+        ),
+        "create with model_dump": _time(
+            lambda run: Song(**song_in.model_dump()), args.repeat
+        ),
+        "crud.song.create without commit": _time(
+            lambda run: crud.song.create(session, object_in=song_in, commit=False),
+            args.repeat,
+        ),
+    }
+    session.close()
+
+    print(f"{args.repeat} runs of each operation")
+    for name, per_second in results.items():
+        print(f"  {name:<32} {per_second:10.0f}/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""
+Compare the query plans and timings of the hot queries with and without the indexes added in `e2b7d4a9c153`.
+
+The benchmark seeds a throwaway database, runs each query before and after creating the indexes and prints
+the plans side by side. It defaults to an in-memory sqlite database, pass the URL of an empty postgres database
+to see postgres' plans instead, every table is dropped from it afterwards.
+
+    python -m app.db.benchmark_indexes [--url URL] [--sotws 100] [--weeks 52] [--users 10]
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy import insert
+from sqlalchemy import MetaData
+from sqlalchemy import select
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from app.db.base import Base
+
+# indexes and constraints added by the migration, left out of the tables the benchmark starts with
+NEW_INDEXES = {
+    "uq_week_sotw_id_week_num",
+    "ix_response_week_id_sotw_id_submitter_id",
+    "ix_response_submitter_id",
+    "ix_response_next_song_id",
+    "ix_userplaylist_user_id_sotw_id",
+    "ix_results_week_id_sotw_id",
+    "ix_user_email",
+    "ix_song_name",
+}
+
+
+def _unindexed_metadata() -> MetaData:
+    """
+    Copy the models' tables without the new indexes, which is how the tables look before the migration.
+
+    Returns:
+        MetaData: The copied tables.
+    """
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for index in list(copy.indexes):
+            if index.name in NEW_INDEXES:
+                copy.indexes.remove(index)
+        for constraint in list(copy.constraints):
+            if constraint.name in NEW_INDEXES:
+                copy.constraints.remove(constraint)
+    return metadata
+
+
+def _create_indexes(connection: Connection) -> None:
+    """
+    Create the new indexes on the seeded tables.
+
+    sqlite cannot add a constraint to an existing table, so the unique constraint on week is created as the unique
+    index postgres backs it with.
+
+    Args:
+        connection (Connection): Connection to the benchmark database.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in NEW_INDEXES:
+                index.create(connection)
+    connection.execute(
+        text(
+            "CREATE UNIQUE INDEX uq_week_sotw_id_week_num ON week (sotw_id, week_num)"
+        )
+    )
+
+
+def _seed(connection: Connection, sotws: int, weeks: int, users: int) -> None:
+    """
+    Fill the tables with sotws that each have a group of users answering every week.
+
+    Args:
+        connection (Connection): Connection to the benchmark database.
+        sotws (int): Number of sotws.
+        weeks (int): Number of weeks in each sotw.
+        users (int): Number of users in each sotw.
+    """
+    tables = Base.metadata.tables
+    now = time.time()
+    user_rows, sotw_rows, membership_rows, playlist_rows = [], [], [], []
+    week_rows, song_rows, response_rows, results_rows = [], [], [], []
+
+    for sotw_id in range(1, sotws + 1):
+        sotw_rows.append(
+            {
+                "id": sotw_id,
+                "name": f"sotw {sotw_id}",
+                "results_datetime": now,
+                "results_timezone": "America/New_York",
+                "master_playlist_link": "",
+                "master_playlist_id": "",
+                "soty_playlist_link": "",
+                "soty_playlist_id": "",
+                "owner_id": (sotw_id - 1) * users + 1,
+            }
+        )
+        for member in range(users):
+            user_id = (sotw_id - 1) * users + member + 1
+            user_rows.append(
+                {
+                    "id": user_id,
+                    "email": f"user{user_id}@example.com",
+                    "password": "",
+                    "name": f"user {user_id}",
+                    "is_superuser": False,
+                    "spotify_linked": False,
+                }
+            )
+            membership_rows.append({"sotw_id": sotw_id, "user_id": user_id})
+            playlist_rows.append(
+                {"sotw_id": sotw_id, "user_id": user_id, "playlist_id": ""}
+            )
+        for week_num in range(weeks):
+            week_id = f"{sotw_id}+{week_num}"
+            week_rows.append(
+                {
+                    "id": week_id,
+                    "week_num": week_num,
+                    "playlist_link": "",
+                    "sotw_id": sotw_id,
+                    "next_results_release": now,
+                    "survey": "",
+                }
+            )
+            results_rows.append(
+                {
+                    "sotw_id": sotw_id,
+                    "week_id": week_id,
+                    "first_place": "",
+                    "second_place": "",
+                    "all_songs": "",
+                    "guessing_data": "",
+                }
+            )
+            for member in range(users):
+                song_id = len(song_rows) + 1
+                submitter_id = (sotw_id - 1) * users + member + 1
+                song_rows.append(
+                    {
+                        "id": song_id,
+                        "name": f"song {random.randrange(sotws * weeks * users)}",
+                        "submitter_id": submitter_id,
+                        "spotify_link": "",
+                        "spotify_id": "",
+                    }
+                )
+                response_rows.append(
+                    {
+                        "next_song_id": song_id,
+                        "number_correct_matches": 0,
+                        "sotw_id": sotw_id,
+                        "week_id": week_id,
+                        "submitter_id": submitter_id,
+                    }
+                )
+
+    for table, rows in [
+        ("sotw", sotw_rows),
+        ("user", user_rows),
+        ("sotw_user_association_table", membership_rows),
+        ("userplaylist", playlist_rows),
+        ("week", week_rows),
+        ("results", results_rows),
+        ("song", song_rows),
+        ("response", response_rows),
+    ]:
+        connection.execute(insert(tables[table]), rows)
+
+
+def _queries(sotws: int, weeks: int, users: int) -> Dict[str, Select]:
+    """
+    Build the hot queries, in the shape the crud objects send them.
+
+    Args:
+        sotws (int): Number of seeded sotws.
+        weeks (int): Number of weeks in each sotw.
+        users (int): Number of users in each sotw.
+
+    Returns:
+        Dict[str, Select]: The queries by name.
+    """
+    tables = Base.metadata.tables
+    week, response, song = tables["week"], tables["response"], tables["song"]
+    user, user_playlist = tables["user"], tables["userplaylist"]
+    results = tables["results"]
+    sotw_id = sotws // 2
+    week_id = f"{sotw_id}+{weeks // 2}"
+    user_id = (sotw_id - 1) * users + 1
+
+    return {
+        "current week": select(week)
+        .where(week.c.sotw_id == sotw_id)
+        .order_by(week.c.week_num.desc())
+        .limit(1),
+        "week by number": select(week).where(
+            week.c.week_num == weeks // 2, week.c.sotw_id == sotw_id
+        ),
+        "response by submitter": select(response).where(
+            response.c.sotw_id == sotw_id,
+            response.c.submitter_id == user_id,
+            response.c.week_id == week_id,
+        ),
+        "users that submitted": select(user)
+        .join(response, response.c.submitter_id == user.c.id)
+        .where(response.c.week_id == week_id),
+        "songs in week": select(song)
+        .join(response)
+        .where(response.c.sotw_id == sotw_id, response.c.week_id == week_id),
+        "songs by name": select(song)
+        .join(response)
+        .where(
+            song.c.name == "song 1",
+            response.c.sotw_id == sotw_id,
+            response.c.week_id != week_id,
+        ),
+        "user playlist": select(user_playlist).where(
+            user_playlist.c.user_id == user_id, user_playlist.c.sotw_id == sotw_id
+        ),
+        "results": select(results).where(
+            results.c.week_id == week_id, results.c.sotw_id == sotw_id
+        ),
+        "user by email": select(user).where(
+            user.c.email == f"user{user_id}@example.com"
+        ),
+    }
+
+
+def _measure(
+    connection: Connection, query: Select, repeat: int
+) -> Tuple[List[str], float]:
+    """
+    Explain a query and time it.
+
+    Args:
+        connection (Connection): Connection to the benchmark database.
+        query (Select): The query.
+        repeat (int): Number of times to run the query.
+
+    Returns:
+        Tuple[List[str], float]: The lines of the query plan and the average run time in milliseconds.
+    """
+    compiled = query.compile(
+        dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+    )
+    if connection.dialect.name == "sqlite":
+        explain = f"EXPLAIN QUERY PLAN {compiled}"
+        plan = [row[-1] for row in connection.execute(text(explain))]
+    else:
+        explain = f"EXPLAIN {compiled}"
+        plan = [row[0] for row in connection.execute(text(explain))]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        connection.execute(query).all()
+    return plan, (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--sotws", type=int, default=100)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    metadata = _unindexed_metadata()
+    queries = _queries(args.sotws, args.weeks, args.users)
+    try:
+        with engine.begin() as connection:
+            metadata.create_all(connection)
+            _seed(connection, args.sotws, args.weeks, args.users)
+            connection.execute(text("ANALYZE"))
+            before = {
+                name: _measure(connection, query, args.repeat)
+                for name, query in queries.items()
+            }
+
+            _create_indexes(connection)
+            connection.execute(text("ANALYZE"))
+            after = {
+                name: _measure(connection, query, args.repeat)
+                for name, query in queries.items()
+            }
+    finally:
+        metadata.drop_all(engine)
+
+    print(
+        f"{args.sotws} sotws, {args.weeks} weeks per sotw, {args.users} users per sotw, "
+        f"{args.sotws * args.weeks * args.users} responses on {engine.dialect.name}"
+    )
+    for name in queries:
+        (plan_before, ms_before), (plan_after, ms_after) = before[name], after[name]
+        print(f"\n{name}: {ms_before:.3f} ms -> {ms_after:.3f} ms")
+        print("  before:")
+        print("\n".join(f"    {line}" for line in plan_before))
+        print("  after:")
+        print("\n".join(f"    {line}" for line in plan_after))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
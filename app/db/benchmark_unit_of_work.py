@@ -0,0 +1,218 @@
+"""
+Count the database round-trips of multi-step writes with the crud objects committing each step and with one commit.
+
+The benchmark runs sotw creation and a survey submission through the crud objects twice, once with the default
+`commit=True` and once passing `commit=False` and committing at the end, counting the statements and commits
+sent. It defaults to an in-memory sqlite database, pass the URL of an empty postgres database to measure
+postgres instead, every table is dropped from it afterwards.
+
+    python -m app.db.benchmark_unit_of_work [--url URL] [--repeat 20]
+"""
+import argparse
+import sys
+import time
+from typing import Callable, Dict, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app import schemas
+from app.db.base import Base
+from app.models.user import User
+
+
+def _create_sotw(session: Session, user: User, run: int, commit: bool) -> None:
+    """
+    Create a sotw, add its owner to it and store the owner's playlist, like `POST /sotw/` does.
+
+    Args:
+        session (Session): Session bound to the benchmark database.
+        user (User): The owner of the sotw.
+        run (int): Number of this run, used to keep names unique.
+        commit (bool): Whether each crud call commits.
+    """
+    sotw = crud.sotw.create(
+        session=session,
+        object_in=schemas.SotwCreate(
+            name=f"sotw {run}",
+            results_datetime=0,
+            results_timezone="America/New_York",
+            owner_id=user.id,
+        ),
+        commit=commit,
+    )
+    crud.user.add_user_to_sotw(
+        session=session, db_object=user, object_in=sotw, commit=commit
+    )
+    crud.user_playlist.create(
+        session,
+        object_in=schemas.UserPlaylistCreate(
+            playlist_id=f"playlist {run}",
+            playlist_link="",
+            sotw_id=sotw.id,
+            user_id=user.id,
+        ),
+        commit=commit,
+    )
+    if not commit:
+        session.commit()
+
+
+def _submit_response(session: Session, user: User, run: int, commit: bool) -> None:
+    """
+    Store a song, a response with three guesses and the correct guess count, like a survey submission does.
+
+    Args:
+        session (Session): Session bound to the benchmark database.
+        user (User): The user submitting the response.
+        run (int): Number of this run, used to keep names unique.
+        commit (bool): Whether each crud call commits.
+    """
+    sotw = user.sotw_list[0]
+    week = crud.week.create(
+        session=session,
+        object_in=schemas.WeekCreate(
+            id=f"{sotw.id}+{run}",
+            week_num=run,
+            playlist_link="",
+            sotw_id=sotw.id,
+            next_results_release=0,
+            survey="",
+        ),
+        commit=commit,
+    )
+    song = crud.song.create(
+        session=session,
+        object_in=schemas.SongCreate(
+            spotify_id="", spotify_link="", name=f"song {run}", submitter_id=user.id
+        ),
+        commit=commit,
+    )
+    response = crud.response.create(
+        session=session,
+        object_in=schemas.ResponseCreate(
+            next_song_id=song.id,
+            sotw_id=sotw.id,
+            week_id=week.id,
+            submitter_id=user.id,
+        ),
+        commit=commit,
+    )
+    for _ in range(3):
+        crud.user_song_match.create(
+            session=session,
+            object_in=schemas.UserSongMatchCreate(
+                user_id=user.id,
+                song_id=song.id,
+                correct_guess=True,
+                response_id=response.id,
+            ),
+            commit=commit,
+        )
+    crud.response.update(
+        session=session,
+        db_object=response,
+        object_in=schemas.ResponseUpdate(number_correct_matches=3),
+        commit=commit,
+    )
+    crud.week.add_response_to_week(
+        session=session, db_object=week, object_in=response, commit=commit
+    )
+    if not commit:
+        session.commit()
+
+
+def _measure(
+    session_factory: Callable[[], Session],
+    counts: Dict[str, int],
+    operation: Callable[[Session, User, int, bool], None],
+    commit: bool,
+    repeat: int,
+) -> Tuple[float, float, float]:
+    """
+    Run an operation a number of times and count what it sends to the database.
+
+    Args:
+        session_factory (Callable[[], Session]): Creates sessions bound to the benchmark database.
+        counts (Dict[str, int]): Statement and commit counters updated by the engine's event listeners.
+        operation (Callable[[Session, User, int, bool], None]): The operation to run.
+        commit (bool): Whether each crud call commits.
+        repeat (int): Number of times to run the operation.
+
+    Returns:
+        Tuple[float, float, float]: The average statements, commits and milliseconds per run.
+    """
+    session = session_factory()
+    user = crud.user.get_by_email(session=session, email="benchmark@example.com")
+    offset = 0 if commit else repeat
+    counts.update(statements=0, commits=0)
+    start = time.perf_counter()
+    for run in range(repeat):
+        operation(session, user, run + offset, commit)
+    elapsed = time.perf_counter() - start
+    session.close()
+    return (
+        counts["statements"] / repeat,
+        counts["commits"] / repeat,
+        elapsed / repeat * 1000,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    counts = {"statements": 0, "commits": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(*_):
+        counts["statements"] += 1
+
+    @event.listens_for(engine, "commit")
+    def count_commit(*_):
+        counts["commits"] += 1
+
+    results = {}
+    try:
+        Base.metadata.create_all(engine)
+        with session_factory() as session:
+            crud.user.create(
+                session,
+                object_in=schemas.UserCreate(
+                    email="benchmark@example.com", name="benchmark", password="password"
+                ),
+            )
+        for name, operation in [
+            ("create sotw", _create_sotw),
+            ("submit response", _submit_response),
+        ]:
+            results[name] = {
+                commit: _measure(
+                    session_factory, counts, operation, commit, args.repeat
+                )
+                for commit in (True, False)
+            }
+    finally:
+        Base.metadata.drop_all(engine)
+
+    print(f"{args.repeat} runs of each operation on {engine.dialect.name}")
+    for name, modes in results.items():
+        print(f"\n{name}:")
+        for commit, label in [(True, "commit each step"), (False, "commit once")]:
+            statements, commits, ms = modes[commit]
+            print(
+                f"  {label:<16} {statements:6.1f} statements "
+                f"{commits:4.1f} commits {ms:8.3f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+from threading import Lock
+import time
+from typing import Dict, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    def __init__(self):
+        """
+        Counters describing how an engine's connection pool is being used.
+        """
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = Lock()
+
+    def record_wait(self, seconds: float) -> None:
+        """
+        Record how long a checkout waited for a connection.
+
+        Args:
+            seconds (float): Time spent waiting for the pool to hand out a connection.
+        """
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def increment(self, counter: str) -> None:
+        """
+        Increment one of the event counters.
+
+        Args:
+            counter (str): Name of the counter.
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> Dict[str, Union[int, float]]:
+        """
+        Retrieve the current counts.
+
+        Returns:
+            Dict[str, Union[int, float]]: The event counters and checkout wait times.
+        """
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "wait_seconds_avg": (
+                    self.wait_seconds_total / self.waits if self.waits else 0.0
+                ),
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+class _TimedPoolMixin:
+    """
+    Times how long each checkout waits on the pool, which SQLAlchemy's pool events do not report.
+    """
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+
+# the metrics live on the pool class so they survive the pool being recreated by `engine.dispose()`
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    metrics = PoolMetrics()
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+def instrument_pool(engine: Union[Engine, AsyncEngine]) -> None:
+    """
+    Count the checkouts, checkins, new connections and invalidations on an engine's pool.
+
+    Args:
+        engine (Union[Engine, AsyncEngine]): An engine using one of the timed pools.
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    metrics = sync_engine.pool.metrics
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.increment("checkouts")
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.increment("checkins")
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.increment("connects")
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
+
+    @event.listens_for(sync_engine, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
+
+
+def get_pool_status(
+    engine: Union[Engine, AsyncEngine]
+) -> Dict[str, Union[int, float]]:
+    """
+    Retrieve the current state of an engine's connection pool along with its usage counters.
+
+    Args:
+        engine (Union[Engine, AsyncEngine]): An engine using one of the timed pools.
+
+    Returns:
+        Dict[str, Union[int, float]]: The pool's size, checked out connections, overflow and usage counters.
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **pool.metrics.snapshot(),
+    }
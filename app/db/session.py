@@ -1,11 +1,25 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine.url import URL
 
+from app.db.pool import TimedAsyncAdaptedQueuePool
+from app.db.pool import TimedQueuePool
+from app.db.pool import instrument_pool
 from app.shared.config import cfg
 
 
+# connections to the cluster are expensive to open (TLS), so keep a sized pool of them around
+pool_options = dict(
+    pool_size=cfg.DB_POOL_SIZE,
+    max_overflow=cfg.DB_MAX_OVERFLOW,
+    pool_timeout=cfg.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=cfg.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=cfg.DB_POOL_PRE_PING,
+)
+
+
 # Synchronous engine
 engine_url = URL.create(
     cfg.DB_SCHEME,
@@ -16,7 +30,8 @@ engine_url = URL.create(
     database=cfg.DB_NAME,
     query={'sslmode': f"{'disable' if cfg.BUILD_ENV == 'dev' else 'verify-full'}"},
 )
-engine = create_engine(engine_url)
+engine = create_engine(engine_url, poolclass=TimedQueuePool, **pool_options)
+instrument_pool(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Asynchronous engine
@@ -27,7 +42,14 @@ engine_async_url = URL.create(
     host=cfg.DB_HOST,
     port=cfg.DB_PORT,
     database=cfg.DB_NAME,
-    query={'sslmode': 'verify-full'},
+    # asyncpg takes the ssl mode as `ssl` rather than libpq's `sslmode`
+    query={'ssl': f"{'disable' if cfg.BUILD_ENV == 'dev' else 'verify-full'}"},
+)
+async_engine = create_async_engine(
+    engine_async_url, poolclass=TimedAsyncAdaptedQueuePool, **pool_options
+)
+instrument_pool(async_engine)
+# objects are read after commit in async endpoints, where expired attributes cannot be lazy loaded
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
 )
-async_engine = create_async_engine(engine_async_url)
-AsyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=async_engine)
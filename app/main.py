@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from curses import use_default_colors
 import sys
 import time
@@ -13,12 +14,33 @@ from app.shared.config import cfg
 from app.shared.config import setup_app_logging
 from app.api import deps
 from app.api.api_v1 import api_router
+from app.clients.http import close_async_http_client
+from app.clients.http import close_http_client
+from app.clients.spotify_link import spotify_link_resolver
+from app.core.scheduler import rollover_scheduler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Run the background week rollover scheduler for the lifetime of the app. On shutdown close the shared HTTP
+    clients and save the resolved spotify short links.
+    """
+    if cfg.ROLLOVER_SCHEDULER_ENABLED:
+        rollover_scheduler.start()
+    yield
+    await rollover_scheduler.stop()
+    close_http_client()
+    await close_async_http_client()
+    spotify_link_resolver.flush()
 
 
 setup_app_logging(config=cfg)
 root_router = APIRouter()
 app = FastAPI(
-    title="Song of the Week API", openapi_url=f"{cfg.API_V1_STR}/openapi.json"
+    title="Song of the Week API",
+    openapi_url=f"{cfg.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 if cfg.BACKEND_CORS_ORIGINS:
@@ -43,10 +65,7 @@ def root(
     return {"hello": "world"}
 
 @root_router.get("/health", status_code=200)
-def health(
-    request: Request,
-    session: Session = Depends(deps.get_session),
-) -> dict:
+def health(request: Request) -> dict:
     """
     Root GET
     """
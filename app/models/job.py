@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy import ForeignKey
+from sqlalchemy import Index
+from sqlalchemy import String
+from sqlalchemy import text
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from app.db.base_class import Base
+
+
+class Job(Base):
+    __table_args__ = (
+        # a sotw can only have one pending or running job of each type
+        Index(
+            "ix_job_sotw_id_job_type_active",
+            "sotw_id",
+            "job_type",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+            sqlite_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    job_type: Mapped[str] = mapped_column(String, nullable=False)
+    sotw_id: Mapped[int] = mapped_column(ForeignKey("sotw.id"))
+    run_at: Mapped[float]
+    status: Mapped[str] = mapped_column(String, default="pending", nullable=False)
+    attempts: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[str] = mapped_column(nullable=True)
+    # identifies the latest claim, see `crud.job.claim`
+    lease: Mapped[str] = mapped_column(String, nullable=True)
+    # JSON record of the steps a job already finished, so a retry can pick up where it left off
+    progress: Mapped[str] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    # drives the staleness of claims, so every write to a job renews it
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
@@ -3,6 +3,7 @@ from typing import List
 
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
@@ -12,13 +13,38 @@ from app.models.user_song_match import UserSongMatch
 
 
 class Response(Base):
+    __table_args__ = (
+        # serves lookups by week alone as well as by week, sotw and submitter
+        Index(
+            "ix_response_week_id_sotw_id_submitter_id",
+            "week_id",
+            "sotw_id",
+            "submitter_id",
+        ),
+        # repeat detection looks a submitted song up by its track and by its normalized name within a sotw
+        Index(
+            "ix_response_sotw_id_next_song_spotify_id",
+            "sotw_id",
+            "next_song_spotify_id",
+        ),
+        Index(
+            "ix_response_sotw_id_next_song_fingerprint",
+            "sotw_id",
+            "next_song_fingerprint",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.now(timezone.utc)
     )
-    next_song_id: Mapped[int] = mapped_column(ForeignKey("song.id"), nullable=True)
+    next_song_id: Mapped[int] = mapped_column(
+        ForeignKey("song.id"), nullable=True, index=True
+    )
     next_song = relationship("Song", back_populates="response", uselist=False)
+    # copied from the song when the response is created, see `crud.response.create`
+    next_song_spotify_id: Mapped[str] = mapped_column(nullable=True)
+    next_song_fingerprint: Mapped[str] = mapped_column(nullable=True)
     user_song_matches: Mapped[List[UserSongMatch]] = relationship(
         back_populates="response",
     )
@@ -28,7 +54,7 @@ class Response(Base):
     sotw_id: Mapped[int] = mapped_column(ForeignKey("sotw.id"))
     week_id: Mapped[str] = mapped_column(ForeignKey("week.id"))
     week = relationship("Week", foreign_keys=week_id, back_populates="responses")
-    submitter_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
+    submitter_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
     submitter = relationship(
         "User", foreign_keys=submitter_id, back_populates="responses"
     )
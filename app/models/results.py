@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 
 from sqlalchemy import DateTime, String
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 
@@ -9,6 +10,7 @@ from app.db.base_class import Base
 
 
 class Results(Base):
+    __table_args__ = (Index("ix_results_week_id_sotw_id", "week_id", "sotw_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -9,7 +9,7 @@ from app.db.base_class import Base
 class Song(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    name: Mapped[str]
+    name: Mapped[str] = mapped_column(index=True)
     submitter_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
     response = relationship("Response", back_populates="next_song", uselist=False)
     spotify_link: Mapped[str]
@@ -1,5 +1,7 @@
+from datetime import datetime
 from typing import List
 
+from sqlalchemy import DateTime
 from sqlalchemy import String
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
@@ -14,7 +16,7 @@ from app.models.response import Response
 class User(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    email: Mapped[str] = mapped_column(String, nullable=False)
+    email: Mapped[str] = mapped_column(String, nullable=False, index=True)
     password: Mapped[str] = mapped_column(String, nullable=False)
     name: Mapped[str] = mapped_column(String, nullable=False)
     is_superuser: Mapped[bool] = mapped_column(nullable=False, default=False)
@@ -22,6 +24,10 @@ class User(Base):
     spotify_access_token: Mapped[str] = mapped_column(nullable=True)
     spotify_refresh_token: Mapped[str] = mapped_column(nullable=True)
     spotify_user_id: Mapped[str] = mapped_column(nullable=True)
+    spotify_accessed_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    spotify_token_expires_in: Mapped[int] = mapped_column(nullable=True)
     playlists: Mapped[List[UserPlaylist]] = relationship(
         cascade="all,delete-orphan", back_populates="user"
     )
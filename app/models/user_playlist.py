@@ -1,5 +1,6 @@
 from sqlalchemy import String
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
@@ -8,6 +9,9 @@ from app.db.base_class import Base
 
 
 class UserPlaylist(Base):
+    __table_args__ = (
+        Index("ix_userplaylist_user_id_sotw_id", "user_id", "sotw_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     playlist_id: Mapped[str] = mapped_column(String, nullable=True)
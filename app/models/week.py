@@ -1,6 +1,7 @@
 from typing import List
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import relationship
@@ -10,6 +11,11 @@ from app.models.response import Response
 
 
 class Week(Base):
+    __table_args__ = (
+        # a sotw has one week of each number, which also indexes the week lookups
+        UniqueConstraint("sotw_id", "week_num", name="uq_week_sotw_id_week_num"),
+    )
+
     id: Mapped[str] = mapped_column(primary_key=True)
     week_num: Mapped[int]
     playlist_link: Mapped[str]
@@ -27,3 +27,4 @@ from app.schemas.results import (
     Results,
     ResultsErrorResponse,
 )
+from app.schemas.job import Job, JobCreate, JobUpdate
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import ConfigDict
+
+from app.schemas.base import Base
+
+
+class JobBase(Base):
+    job_type: str
+    sotw_id: int
+    run_at: float
+
+
+# properties to receive via API creation
+class JobCreate(JobBase):
+    status: str = "pending"
+    progress: Optional[str] = None
+    last_error: Optional[str] = None
+
+
+# properties to receive via API update
+class JobUpdate(Base):
+    run_at: Optional[float] = None
+    status: Optional[str] = None
+    attempts: Optional[int] = None
+    last_error: Optional[str] = None
+    progress: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
+# properties shared by models stored in DB
+class JobInDBBase(JobBase):
+    id: int = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+# additional properties stored in DB bt not returned by API
+class JobInDB(JobInDBBase): ...
+
+
+# additional properties to return via API
+class Job(JobInDBBase):
+    id: str
+    sotw_id: str
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
@@ -41,6 +41,7 @@ class UserUpdate(UserBase):
     spotify_refresh_token: Optional[str] = None
     spotify_user_id: Optional[str] = None
     spotify_accessed_date: Optional[datetime] = None
+    spotify_token_expires_in: Optional[int] = None
 
 
 # properties shared by models stored in DB
@@ -39,6 +39,11 @@ class Config(BaseSettings):
         "7f0a187153e8c67cd0ef1a27552803e61b0a7051b9d981c8bf41a031b72a74d1"  # use `openssl rand -hex 32` to generate
     )
     ALGORITHM: str = "HS256"
+    # decoded tokens are reused until they expire, authenticated users are reloaded after the ttl
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 300
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
 
     ### EMAIL ###
     AWS_REGION: str = "us-east-1"
@@ -51,9 +56,58 @@ class Config(BaseSettings):
     SPOTIFY_CLIENT_ID: str = "id"
     SPOTIFY_CLIENT_SECRET: str = "secret"
     SPOTIFY_CALLBACK_URI: str = "http://localhost/"
+    # refresh a user's access token this long before spotify says it expires
+    SPOTIFY_TOKEN_REFRESH_MARGIN_SECONDS: int = 60
+    # request budgets shared by the whole app and for each user
+    SPOTIFY_APP_REQUESTS_PER_SECOND: float = 10.0
+    SPOTIFY_APP_BURST: int = 20
+    SPOTIFY_USER_REQUESTS_PER_SECOND: float = 2.0
+    SPOTIFY_USER_BURST: int = 5
+    # retries after a 429 or 5xx, with jittered exponential backoff
+    SPOTIFY_MAX_RETRIES: int = 3
+    SPOTIFY_BACKOFF_BASE_SECONDS: float = 0.5
+    SPOTIFY_BACKOFF_MAX_SECONDS: float = 30.0
+    # spotify takes at most 100 songs in one request to add to a playlist
+    SPOTIFY_PLAYLIST_CHUNK_SIZE: int = 100
+    # spotify.link short links resolved to track ids, optionally persisted to a JSON file
+    SPOTIFY_LINK_CACHE_SIZE: int = 10000
+    SPOTIFY_LINK_CACHE_PATH: Optional[str] = None
+    SPOTIFY_LINK_TIMEOUT_SECONDS: float = 5.0
+    SPOTIFY_LINK_MAX_REDIRECTS: int = 5
+    SPOTIFY_LINK_MAX_BODY_BYTES: int = 262144
+    SPOTIFY_LINK_FLUSH_INTERVAL_SECONDS: float = 60.0
+
+    ### HTTP ###
+    HTTP_MAX_CONNECTIONS: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
 
     ### MODEL ###
     SOTW_SHARE_ID_K: int = 12
+    # how long a confirmed sotw membership is trusted before the database is asked again
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 30
+    MEMBERSHIP_CACHE_SIZE: int = 10000
+    # how long browsers may reuse a week's results before revalidating them with their ETag
+    RESULTS_CACHE_MAX_AGE_SECONDS: int = 86400
+    # number of weeks of serialized results kept in memory by each process
+    RESULTS_CACHE_SIZE: int = 1000
+
+    ### SCHEDULER ###
+    ROLLOVER_SCHEDULER_ENABLED: bool = True
+    ROLLOVER_POLL_INTERVAL_SECONDS: int = 30
+    ROLLOVER_RETRY_SECONDS: int = 60
+    # a rollover or playlist addition job that fails this many times is marked failed and no longer retried
+    ROLLOVER_MAX_ATTEMPTS: int = 5
+    # a running rollover that has not finished in this long is assumed dead and can be claimed again
+    ROLLOVER_LOCK_TIMEOUT_SECONDS: int = 600
+    # number of spotify playlists renamed at once when a sotw is renamed
+    PLAYLIST_RENAME_CONCURRENCY: int = 5
+    # a rename job still pending this long after it was due lost its background task and is run by the scheduler
+    PLAYLIST_RENAME_ORPHAN_SECONDS: int = 60
+    # number of spotify playlists added to at once when a week is rolled over
+    PLAYLIST_ADD_CONCURRENCY: int = 5
 
     # BACKEND_CORS_ORIGINS is a JSON-formatted list of origins
     # e.g: '["http://localhost", "http://localhost:4200", "http://localhost:3000", \
@@ -84,6 +138,12 @@ class Config(BaseSettings):
     DB_NAME: str = "sotw"
     DB_PORT: int = 5432
     DB_CA_PATH: str = "~/.postgresql/root.crt"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    # recycle connections before the cluster's load balancer drops idle ones
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
     # AWS_ACCESS_KEY_ID: str = "DUMMYIDEXAMPLE"
     # AWS_SECRET_ACCESS_KEY: str = "DUMMYEXAMPLEKEY"
     # AWS_REGION: str = "us-east-1"
@@ -1,4 +1,7 @@
 from datetime import datetime, timedelta
+import re
+from typing import Optional
+import unicodedata
 from zoneinfo import ZoneInfo
 
 
@@ -41,3 +44,58 @@ def get_next_datetime(
 
     # return milliseconds
     return target_datetime.timestamp() * 1000
+
+
+def get_spotify_track_id(link: str) -> str:
+    """
+    Pull the track id out of the ways a spotify track can be shared, e.g. `https://open.spotify.com/track/<id>?si=...`,
+    `https://open.spotify.com/intl-de/track/<id>` or `spotify:track:<id>`.
+
+    Args:
+        link (str): A link or uri to a spotify track.
+
+    Returns:
+        str: The track id.
+    """
+    link = link.strip()
+    if link.startswith("spotify:"):
+        return link.split(":")[-1]
+    return link.split("?")[0].split("#")[0].rstrip("/").split("/")[-1]
+
+
+def get_song_fingerprint(name: str) -> str:
+    """
+    Normalize a song's `title - artists` name so that the same song is recognised however its name is cased,
+    accented or punctuated.
+
+    Args:
+        name (str): The name of a song like `song_name - artist1, artist2`.
+
+    Returns:
+        str: The normalized name.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    words = re.sub(r"[^\w]+", " ", stripped.casefold().replace("&", " and "))
+    return " ".join(words.split())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check whether an `If-None-Match` header names the current ETag of a resource.
+
+    Args:
+        if_none_match (Optional[str]): Value of the request's `If-None-Match` header.
+        etag (str): The quoted ETag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be sent.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # If-None-Match uses the weak comparison, a W/ prefix is ignored
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,172 @@
+from app import crud
+from app.crud.crud_job import FAILED, WEEK_ROLLOVER
+from app.schemas.job import JobCreate
+from app.shared.config import cfg
+from app.tests.conftest import override_session
+
+
+def test_get_db_pool_403(client):
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/admin/db-pool")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 403
+    assert data["detail"] == "Not authorized."
+
+
+def test_get_db_pool_success(client):
+    # Given
+    user = crud.user.get(session=override_session, id=1)
+    crud.user.update(
+        session=override_session, db_object=user, object_in={"is_superuser": True}
+    )
+
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/admin/db-pool")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 200
+    for engine in ["sync", "async"]:
+        assert engine in data.keys()
+        assert data[engine]["size"] == cfg.DB_POOL_SIZE
+        for key in [
+            "checked_in",
+            "checked_out",
+            "overflow",
+            "checkouts",
+            "checkins",
+            "connects",
+            "invalidations",
+            "wait_seconds_avg",
+            "wait_seconds_max",
+        ]:
+            assert key in data[engine].keys()
+
+
+def test_get_spotify_rate_limit_403(client):
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/admin/spotify-rate-limit")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 403
+    assert data["detail"] == "Not authorized."
+
+
+def test_get_spotify_rate_limit_success(client):
+    # Given
+    user = crud.user.get(session=override_session, id=1)
+    crud.user.update(
+        session=override_session, db_object=user, object_in={"is_superuser": True}
+    )
+
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/admin/spotify-rate-limit")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 200
+    for key in [
+        "queue_depth",
+        "delayed",
+        "throttled",
+        "retries",
+        "blocked_for_seconds",
+    ]:
+        assert key in data.keys()
+
+
+def test_get_http_client_metrics_403(client):
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/admin/http-client")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 403
+    assert data["detail"] == "Not authorized."
+
+
+def test_get_http_client_metrics_success(client):
+    # Given
+    user = crud.user.get(session=override_session, id=1)
+    crud.user.update(
+        session=override_session, db_object=user, object_in={"is_superuser": True}
+    )
+
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/admin/http-client")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 200
+    for key in ["requests", "new_connections", "reused_connections"]:
+        assert key in data.keys()
+
+
+def test_health_does_not_report_metrics(client):
+    # When
+    response = client.get("/health")
+
+    # Then
+    assert response.status_code == 200
+    assert response.json() == {"health": "ok"}
+
+
+def test_retry_rollover_403(client):
+    # When
+    response = client.post(f"{cfg.API_V1_STR}/admin/sotw/1/rollover")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 403
+    assert data["detail"] == "Not authorized."
+
+
+def test_retry_rollover_409(client, sotw):
+    # Given
+    user = crud.user.get(session=override_session, id=1)
+    crud.user.update(
+        session=override_session, db_object=user, object_in={"is_superuser": True}
+    )
+
+    # When
+    response = client.post(f"{cfg.API_V1_STR}/admin/sotw/1/rollover")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 409
+    assert data["detail"] == "The rollover of sotw with id 1 has not failed."
+
+
+def test_retry_rollover_success(client, sotw):
+    # Given
+    user = crud.user.get(session=override_session, id=1)
+    crud.user.update(
+        session=override_session, db_object=user, object_in={"is_superuser": True}
+    )
+    failed = crud.job.create(
+        session=override_session,
+        object_in=JobCreate(
+            job_type=WEEK_ROLLOVER,
+            sotw_id=1,
+            run_at=0,
+            status=FAILED,
+            last_error="Spotify API Error",
+        ),
+    )
+
+    # When
+    response = client.post(f"{cfg.API_V1_STR}/admin/sotw/1/rollover")
+    data = response.json()
+    job = crud.job.get_active_job_for_sotw(
+        session=override_session, sotw_id=1, job_type=WEEK_ROLLOVER
+    )
+
+    # Then
+    assert response.status_code == 202
+    assert data["id"] == str(job.id)
+    assert job.id != failed.id
+    assert job.status == "pending"
+    assert job.attempts == 0
@@ -1,5 +1,12 @@
 import json
+
+import pytest
+from sqlalchemy import event
+
+from app import crud
 from app.shared.config import cfg
+from app.tests.conftest import kick_off_new_week
+from app.tests.conftest import override_session
 
 
 def test_post_response_404_sotw_not_found(client):
@@ -141,7 +148,7 @@ def test_post_response_400(client, current_week):
 def test_post_response_success_week_n_no_repeat(client, current_week_new_week):
     # When
     # kick off the new week
-    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    kick_off_new_week(client)
 
     # post a response
     payload = {
@@ -177,7 +184,7 @@ def test_post_response_success_week_n_no_repeat(client, current_week_new_week):
 def test_post_response_success_week_n_repeat(client, current_week_new_week_plus_1):
     # When
     # kick off the new week
-    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    kick_off_new_week(client)
 
     # post a response
     payload = {
@@ -208,12 +215,48 @@ def test_post_response_success_week_n_repeat(client, current_week_new_week_plus_
     assert data["repeat"] == True
 
 
+@pytest.mark.parametrize(
+    "next_song",
+    [
+        # the same track shared as a uri
+        "spotify:track:1auuYcOrua5hrsGCS7idun",
+        # another release of the same song, recognised by its name
+        "https://open.spotify.com/intl-de/track/2xVvCbN6Ue0pXq5aZ2rTqC",
+    ],
+)
+def test_post_response_success_week_n_repeat_other_link_forms(
+    client, current_week_new_week_plus_1, next_song
+):
+    # When
+    # kick off the new week
+    kick_off_new_week(client)
+
+    # post a response
+    payload = {
+        "picked_song_1": 1,
+        "picked_song_2": 2,
+        "user_song_matches": [
+            {
+                "song_id": 1,
+                "user_id": 1,
+            },
+        ],
+        "next_song": next_song,
+    }
+    response = client.post(f"{cfg.API_V1_STR}/response/1/1", data=json.dumps(payload))
+    data = response.json()
+
+    # Then
+    assert response.status_code == 201
+    assert data["repeat"] == True
+
+
 def test_post_response_success_week_n_repeat_approved(
     client, current_week_new_week_plus_1
 ):
     # When
     # kick off the new week
-    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    kick_off_new_week(client)
 
     # post a response
     payload = {
@@ -250,7 +293,7 @@ def test_post_response_success_week_n_replace_existing_response(
 ):
     # When
     # kick off the new week
-    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    kick_off_new_week(client)
 
     # post a response
     payload = {
@@ -281,7 +324,7 @@ def test_post_response_success_week_n_replace_existing_response(
     assert data["repeat"] == False
 
     # kick off the new week
-    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    kick_off_new_week(client)
 
     # post a response
     payload = {
@@ -311,10 +354,71 @@ def test_post_response_success_week_n_replace_existing_response(
     assert "repeat" in data.keys()
     assert data["repeat"] == False
 
+def test_post_response_replace_existing_response_commits_once(
+    client, current_week_new_week
+):
+    # Given
+    kick_off_new_week(client)
+    payload = {
+        "picked_song_1": 1,
+        "picked_song_2": 2,
+        "user_song_matches": [
+            {
+                "song_id": 1,
+                "user_id": 2,
+            },
+            {
+                "song_id": 2,
+                "user_id": 3,
+            },
+            {
+                "song_id": 3,
+                "user_id": 1,
+            },
+        ],
+        "next_song": "https://open.spotify.com/track/1auuYcOrua5hrsGCS7idun?si=f951bceb14204344",
+    }
+    response = client.post(f"{cfg.API_V1_STR}/response/1/1", data=json.dumps(payload))
+    assert response.status_code == 201
+
+    # When
+    commits = []
+    listener = lambda session: commits.append(session)
+    event.listen(override_session, "after_commit", listener)
+    payload["user_song_matches"] = [
+        {"song_id": 1, "user_id": 1},
+        {"song_id": 2, "user_id": 2},
+        {"song_id": 3, "user_id": 3},
+    ]
+    try:
+        response = client.post(
+            f"{cfg.API_V1_STR}/response/1/1", data=json.dumps(payload)
+        )
+    finally:
+        event.remove(override_session, "after_commit", listener)
+
+    # Then
+    assert response.status_code == 201
+    assert len(commits) == 1
+    current_week = crud.week.get_current_week(session=override_session, sotw_id=1)
+    responses = [
+        response
+        for response in crud.response.get_responses_for_week(
+            session=override_session, week_id=current_week.id
+        )
+        if response.submitter_id == 1
+    ]
+    assert len(responses) == 1
+    assert [match.user_id for match in responses[0].user_song_matches] == [1, 2, 3]
+    assert responses[0].number_correct_matches == sum(
+        match.correct_guess for match in responses[0].user_song_matches
+    )
+
+
 def test_post_response_403_missing_theme_description(client, current_week_new_week):
     # When
     # kick off the new week
-    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    kick_off_new_week(client)
 
     # post a response
     payload = {
@@ -347,7 +451,7 @@ def test_post_response_403_missing_theme_description(client, current_week_new_we
 def test_post_response_403_description_without_theme(client, current_week_new_week):
     # When
     # kick off the new week
-    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    kick_off_new_week(client)
 
     # post a response
     payload = {
@@ -1,4 +1,9 @@
+from unittest.mock import patch
+
+from app import crud
 from app.shared.config import cfg
+from app.tests.conftest import kick_off_new_week
+from app.tests.conftest import override_session
 
 
 def test_get_results_404_sotw_not_found(client):
@@ -32,6 +37,7 @@ def test_post_response_404_week_not_found(client, current_week):
 def test_get_results_success(client, current_week_new_week_new_results):
     # When
     # kick off the new week
+    kick_off_new_week(client)
     response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
     data = response.json()
 
@@ -66,6 +72,7 @@ def test_get_results_success(client, current_week_new_week_new_results):
 def test_get_results_success_themed(client, current_week_new_week_new_results_themed_survey):
     # When
     # kick off the new week
+    kick_off_new_week(client)
     response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
     data = response.json()
 
@@ -108,3 +115,86 @@ def test_get_results_404_not_ready(client, current_week_new_week_new_results):
     assert response.status_code == 200
     assert "message" in data.keys()
     assert data["message"] == "Results for week 1 for test not yet available."
+
+
+def test_get_results_etag(client, current_week_new_week_new_results):
+    # Given
+    kick_off_new_week(client)
+
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/results/1/1")
+    etag = response.headers["etag"]
+    not_modified = client.get(
+        f"{cfg.API_V1_STR}/results/1/1", headers={"If-None-Match": etag}
+    )
+    weak_not_modified = client.get(
+        f"{cfg.API_V1_STR}/results/1/1", headers={"If-None-Match": f"W/{etag}"}
+    )
+    modified = client.get(
+        f"{cfg.API_V1_STR}/results/1/1", headers={"If-None-Match": '"stale"'}
+    )
+
+    # Then
+    assert response.status_code == 200
+    assert etag.startswith('"') and etag.endswith('"')
+    assert response.headers["cache-control"] == (
+        f"private, max-age={cfg.RESULTS_CACHE_MAX_AGE_SECONDS}"
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert weak_not_modified.status_code == 304
+    assert modified.status_code == 200
+    assert modified.json() == response.json()
+
+
+def test_get_results_not_ready_no_etag(client, current_week_new_week_new_results):
+    # When
+    response = client.get(
+        f"{cfg.API_V1_STR}/results/1/1", headers={"If-None-Match": "*"}
+    )
+
+    # Then
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert "cache-control" not in response.headers
+
+
+def test_get_results_served_from_cache(client, current_week_new_week_new_results):
+    # Given
+    kick_off_new_week(client)
+
+    # When
+    with patch.object(crud.results, "get_results_by_week_num") as get_results:
+        response = client.get(f"{cfg.API_V1_STR}/results/1/1")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 200
+    assert data["week_id"] == "1+123456789"
+    # the rollover put the results in the cache
+    get_results.assert_not_called()
+
+
+def test_get_results_after_update(client, current_week_new_week_new_results):
+    # Given
+    kick_off_new_week(client)
+    response = client.get(f"{cfg.API_V1_STR}/results/1/1")
+    etag = response.headers["etag"]
+    results = crud.results.get_results_by_week_num(
+        session=override_session, week_num=1, sotw_id=1
+    )
+
+    # When
+    crud.results.update(
+        session=override_session, db_object=results, object_in={"theme": "NEW THEME"}
+    )
+    response = client.get(
+        f"{cfg.API_V1_STR}/results/1/1", headers={"If-None-Match": etag}
+    )
+    data = response.json()
+
+    # Then
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert data["theme"] == "NEW THEME"
@@ -1,13 +1,19 @@
+import asyncio
 from datetime import datetime
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
-from app.clients.spotify import SpotifyClient
+from app import crud
 from app.main import app
 from app.api import deps
+from app.core.playlist_rename import run_due_playlist_renames
+from app.core.playlist_rename import run_playlist_rename_job
+from app.crud.crud_job import PLAYLIST_RENAME
 from app.models.user import User
 from app.shared.config import cfg
 from app.tests.conftest import memory_session, override_session
+from app.tests.conftest import override_get_async_spotify_client
+from app.tests.conftest import override_get_session_factory
 
 
 def test_sotw_creation_406(client):
@@ -54,6 +60,47 @@ def test_sotw_creation_success(client):
     assert int(data["owner_id"]) == 1
 
 
+def test_sotw_creation_creates_playlists_concurrently(client):
+    # Given
+    client.put(
+        f"{cfg.API_V1_STR}/auth/spotify-access-token",
+        data=json.dumps({"state": "admin@admin.admin-test1", "code": "success"}),
+    )
+    in_flight = []
+    most_in_flight = 0
+
+    async def create_playlist(name, description, session, user_id):
+        nonlocal most_in_flight
+        in_flight.append(name)
+        most_in_flight = max(most_in_flight, len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(name)
+        return {"id": name, "external_urls": {"spotify": f"www.{name}.com"}}
+
+    mock_spotify = AsyncMock()
+    mock_spotify.create_playlist.side_effect = create_playlist
+    client.app.dependency_overrides[deps.get_async_spotify_client] = lambda: mock_spotify
+
+    # When
+    payload = {
+        "name": "test_sotw",
+        "results_datetime": round(datetime.now().timestamp() * 1000),
+        "results_timezone": "America/New_York",
+    }
+    response = client.post(f"{cfg.API_V1_STR}/sotw/", data=json.dumps(payload))
+    data = response.json()
+
+    # Then
+    assert response.status_code == 201
+    assert most_in_flight == 3
+    assert data["master_playlist_link"] == "www.test_sotw Master Playlist.com"
+    assert data["soty_playlist_link"] == "www.test_sotw Song of the Year Playlist.com"
+    response = client.get(f"{cfg.API_V1_STR}/auth/current_user")
+    assert response.json()["playlists"][0]["playlist_id"] == (
+        "test1's test_sotw Song of the Week Playlist"
+    )
+
+
 def test_sotw_update_403(client, sotw_other_owner):
     # When
     payload = {
@@ -105,6 +152,141 @@ def test_sotw_update_success(client):
     assert data["results_timezone"] == "test"
 
 
+def test_get_playlist_rename_status_404(client, sotw):
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/sotw/1/playlist-rename")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 404
+    assert data["detail"] == "No playlist rename found for sotw with id 1."
+
+
+def test_get_playlist_rename_status_success(client):
+    # Given
+    # "link" spotify
+    payload = {
+        "state": "admin@admin.admin-test1",
+        "code": "success",
+    }
+    response = client.put(
+        f"{cfg.API_V1_STR}/auth/spotify-access-token", data=json.dumps(payload)
+    )
+    # create sotw
+    payload = {
+        "name": "test_sotw",
+        "results_datetime": round(datetime.now().timestamp() * 1000),
+        "results_timezone": "America/New_York",
+    }
+    response = client.post(f"{cfg.API_V1_STR}/sotw/", data=json.dumps(payload))
+    # rename sotw
+    payload = {"name": "new_name"}
+    response = client.put(f"{cfg.API_V1_STR}/sotw/1", data=json.dumps(payload))
+
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/sotw/1/playlist-rename")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 200
+    assert data["sotw_id"] == "1"
+    assert data["job_type"] == "playlist_rename"
+    assert data["status"] == "done"
+    assert data["attempts"] == 1
+    assert data["last_error"] is None
+
+
+def test_playlist_rename_job_renames_again_after_late_rename(sotw):
+    # Given
+    job = crud.job.schedule(
+        session=override_session,
+        sotw_id=sotw.id,
+        job_type=PLAYLIST_RENAME,
+        run_at=datetime.now().timestamp() * 1000,
+    )
+    spotify_client = override_get_async_spotify_client()
+    session_factory = override_get_session_factory()
+    update_job = crud.job.update_claimed
+    renamed = []
+
+    def rename_before_done(session, job_id, lease, object_in):
+        # the sotw is renamed after the job last checked its name but before it is marked done
+        if object_in.status == "done" and not renamed:
+            renamed.append(True)
+            with session_factory() as other_session:
+                crud.sotw.update(
+                    session=other_session,
+                    db_object=crud.sotw.get(session=other_session, id=sotw.id),
+                    object_in={"name": "late_name"},
+                )
+        return update_job(
+            session=session, job_id=job_id, lease=lease, object_in=object_in
+        )
+
+    # When
+    with patch.object(crud.job, "update_claimed", side_effect=rename_before_done):
+        asyncio.run(run_playlist_rename_job(job.id, session_factory, spotify_client))
+
+    # Then
+    names = [
+        call.args[1] for call in spotify_client.update_playlist_details.call_args_list
+    ]
+    assert names[-2:] == [
+        "late_name Master Playlist",
+        "late_name Song of the Year Playlist",
+    ]
+    latest_job = crud.job.get_latest_job_for_sotw(
+        session=override_session, sotw_id=sotw.id, job_type=PLAYLIST_RENAME
+    )
+    assert latest_job.id != job.id
+    assert latest_job.status == "done"
+
+
+def test_run_due_playlist_renames_runs_orphaned_job(sotw):
+    # Given
+    crud.job.schedule(
+        session=override_session,
+        sotw_id=sotw.id,
+        job_type=PLAYLIST_RENAME,
+        run_at=(datetime.now().timestamp() - 2 * cfg.PLAYLIST_RENAME_ORPHAN_SECONDS)
+        * 1000,
+    )
+    spotify_client = override_get_async_spotify_client()
+
+    # When
+    run = asyncio.run(
+        run_due_playlist_renames(override_get_session_factory(), spotify_client)
+    )
+
+    # Then
+    assert run == 1
+    assert spotify_client.update_playlist_details.call_count == 2
+    job = crud.job.get_latest_job_for_sotw(
+        session=override_session, sotw_id=sotw.id, job_type=PLAYLIST_RENAME
+    )
+    assert job.status == "done"
+
+
+def test_run_due_playlist_renames_leaves_job_to_its_task(sotw):
+    # Given
+    crud.job.schedule(
+        session=override_session,
+        sotw_id=sotw.id,
+        job_type=PLAYLIST_RENAME,
+        run_at=datetime.now().timestamp() * 1000,
+    )
+    spotify_client = override_get_async_spotify_client()
+
+    # When
+    run = asyncio.run(
+        run_due_playlist_renames(override_get_session_factory(), spotify_client)
+    )
+
+    # Then
+    assert run == 0
+    spotify_client.update_playlist_details.assert_not_called()
+
+
 def test_get_sotw_404(client):
     # When
     response = client.get(f"{cfg.API_V1_STR}/sotw/3")
@@ -332,10 +514,10 @@ def test_get_sotw_invite_join_400(decode, client, sotw):
     )
 
     # Override the dependencie for this test
-    mock_spotify = MagicMock()
+    mock_spotify = AsyncMock()
     mock_spotify.create_playlist.side_effect = Exception("Spotify API Error")
 
-    client.app.dependency_overrides[deps.get_spotify_client] = lambda: mock_spotify
+    client.app.dependency_overrides[deps.get_async_spotify_client] = lambda: mock_spotify
 
     response = client.get(f"{cfg.API_V1_STR}/sotw/invite/join/ABC123")
 
@@ -438,6 +620,21 @@ def test_get_leave_sotw_success(client, current_week):
     assert len(data["sotw_list"]) == 0
 
 
+def test_get_sotw_403_after_leaving(client, current_week):
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/sotw/1")
+
+    # Then
+    assert response.status_code == 200
+
+    # When
+    client.get(f"{cfg.API_V1_STR}/sotw/1/leave")
+    response = client.get(f"{cfg.API_V1_STR}/sotw/1")
+
+    # Then
+    assert response.status_code == 403
+
+
 def test_get_sotw_members(client, current_week_new_week_new_results):
 
     # When
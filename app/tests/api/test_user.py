@@ -3,7 +3,12 @@ from unittest.mock import patch
 
 from jose import JWTError
 
+from app import crud
+from app.api import deps
+from app.core.auth import create_access_token
+from app.main import app
 from app.shared.config import cfg
+from app.tests.conftest import override_session
 
 
 def test_update_user_wrong_id_403(client):
@@ -119,6 +124,30 @@ def test_update_user_email_success(client):
     assert data["email"] == "email@email.email"
 
 
+@patch.object(cfg, "SEND_REGISTRATION_EMAILS", True)
+def test_update_user_reloads_cached_current_user(client):
+    # Given
+    # authenticate with a real token rather than the overridden dependency
+    app.dependency_overrides.pop(deps.get_current_user)
+    client.cookies.set("Authorization", f"Bearer {create_access_token(sub=1)}")
+    payload = {
+        "email": "email@email.email",
+    }
+    response = client.put(f"{cfg.API_V1_STR}/user/{1}", data=json.dumps(payload))
+    assert response.status_code == 200
+    assert response.json()["name"] == "test1"
+
+    # When
+    user = crud.user.get(override_session, id=1)
+    crud.user.update(override_session, db_object=user, object_in={"name": "renamed"})
+    response = client.put(f"{cfg.API_V1_STR}/user/{1}", data=json.dumps(payload))
+    data = response.json()
+
+    # Then
+    assert response.status_code == 200
+    assert data["name"] == "renamed"
+
+
 @patch("app.api.api_v1.endpoints.user.jwt.decode")
 def test_verify_email_change_success(decode, client):
     decode.return_value = {"sub": "email@email.email"}
@@ -3,8 +3,16 @@ import json
 import random
 from unittest.mock import patch
 
+from app import crud
+from app.clients.spotify import PlaylistWrite
+from app.crud.crud_job import PLAYLIST_ADD, WEEK_ROLLOVER
 from app.shared.config import cfg
 from app.shared.utils import get_next_datetime
+from app.core.scheduler import run_due_playlist_additions
+from app.core.scheduler import run_due_rollovers
+from app.tests.conftest import kick_off_new_week
+from app.tests.conftest import override_get_spotify_client
+from app.tests.conftest import override_session
 
 
 def test_get_current_week_404(client):
@@ -127,8 +135,346 @@ def test_get_current_week_n_406_not_enough_responses(
     )
 
 
+def test_get_current_week_202_new_week_pending(client, current_week_new_week):
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    data = response.json()
+
+    # Then
+    assert response.status_code == 200
+    assert "week" in data.keys()
+    assert data["week"]["week_num"] == 0
+    assert "status" in data.keys()
+    assert data["status"] == 202
+    assert "message" in data.keys()
+    assert (
+        data["message"]
+        == "The results for week 0 are being tallied and the next week is being set up. Check back in a moment!"
+    )
+
+
+def test_get_current_week_202_rollover_already_claimed(client, current_week_new_week):
+    # Given
+    client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    job = crud.job.get_active_job_for_sotw(
+        session=override_session, sotw_id=1, job_type=WEEK_ROLLOVER
+    )
+    assert crud.job.claim(session=override_session, job_id=job.id)
+    assert not crud.job.claim(session=override_session, job_id=job.id)
+
+    # When
+    rolled_over = kick_off_new_week(client)
+    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    data = response.json()
+
+    # Then
+    assert rolled_over == 0
+    assert response.status_code == 200
+    assert data["status"] == 202
+    assert data["week"]["week_num"] == 0
+    assert len(crud.week.get_all_weeks_in_sotw(session=override_session, sotw_id=1)) == 1
+
+
+def test_rollover_schedules_next_week(client, current_week_new_week):
+    # When
+    assert kick_off_new_week(client) == 1
+    override_session.expire_all()
+    current_week = crud.week.get_current_week(session=override_session, sotw_id=1)
+    jobs = override_session.query(crud.job.model).order_by(crud.job.model.id).all()
+
+    # Then
+    assert [job.status for job in jobs] == ["done", "pending"]
+    assert jobs[1].run_at == current_week.next_results_release
+
+
+def test_rollover_adds_songs_once_per_playlist(
+    client, current_week_new_week_new_results
+):
+    # Given
+    sotw = crud.sotw.get(session=override_session, id=1)
+    crud.sotw.update(
+        session=override_session,
+        db_object=sotw,
+        object_in={"master_playlist_id": "master", "soty_playlist_id": "soty"},
+    )
+    spotify_client = override_get_spotify_client()
+    spotify_client.create_playlist.side_effect = [
+        {"id": "week", "external_urls": {"spotify": "www.example.com"}}
+    ]
+    client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+
+    # When
+    assert run_due_rollovers(override_session, spotify_client) == 1
+
+    # Then
+    additions = {
+        call.args[0]: (call.args[1], call.args[3])
+        for call in spotify_client.add_songs_to_playlist_in_chunks.call_args_list
+    }
+    assert (
+        spotify_client.add_songs_to_playlist_in_chunks.call_count
+        == len(additions)
+        == 6
+    )
+    # each submitter's playlist gets the song they submitted the week before
+    assert additions["abc123"] == (["spotify:track:6OmApaLQPqHZL3iI78FOUR"], 1)
+    assert additions["abc456"] == (["spotify:track:5mqceEgI5vhogd5pOAlwUO"], 2)
+    assert additions["xyz123"] == (["spotify:track:4JfpJrrGNXRj2yXm1fYV23"], 3)
+    # all three songs tied for first place
+    assert sorted(additions["soty"][0]) == sorted(
+        additions["abc123"][0] + additions["abc456"][0] + additions["xyz123"][0]
+    )
+    assert additions["week"] == additions["master"]
+    assert len(additions["week"][0]) == 3
+    assert additions["week"][1] == 1
+    assert crud.results.get_results_by_week(
+        session=override_session, week_id="1+123456789", sotw_id=1
+    )
+
+
+def _skip_retry_wait(job):
+    crud.job.update(
+        session=override_session,
+        db_object=job,
+        object_in={"run_at": job.run_at - cfg.ROLLOVER_RETRY_SECONDS * 1000},
+    )
+
+
+def test_rollover_hands_off_failed_playlist_additions(
+    client, current_week_new_week_new_results
+):
+    # Given
+    def add_songs_to_playlist_in_chunks(playlist_id, uris, session, user_id, start):
+        if playlist_id == "abc456":
+            return PlaylistWrite(added=0, error=Exception("Spotify API Error"))
+        if playlist_id == "week":
+            return PlaylistWrite(added=2, error=Exception("Spotify API Error"))
+        return PlaylistWrite(added=len(uris))
+
+    spotify_client = override_get_spotify_client()
+    spotify_client.create_playlist.side_effect = [
+        {"id": "week", "external_urls": {"spotify": "www.example.com"}}
+    ]
+    spotify_client.add_songs_to_playlist_in_chunks.side_effect = (
+        add_songs_to_playlist_in_chunks
+    )
+    client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+
+    # When
+    rolled_over = run_due_rollovers(override_session, spotify_client)
+    override_session.expire_all()
+    week_uris = {
+        call.args[0]: call.args[1]
+        for call in spotify_client.add_songs_to_playlist_in_chunks.call_args_list
+    }["week"]
+    job = crud.job.get_active_job_for_sotw(
+        session=override_session, sotw_id=1, job_type=PLAYLIST_ADD
+    )
+
+    # Then
+    # the week moves on without the playlists that failed
+    assert rolled_over == 1
+    assert crud.results.get_results_by_week(
+        session=override_session, week_id="1+123456789", sotw_id=1
+    )
+    assert job.status == "pending"
+    assert job.last_error == "abc456: Spotify API Error\nweek: Spotify API Error"
+    # only the songs that were not added are handed off
+    progress = json.loads(job.progress)
+    assert [
+        (addition["playlist_id"], addition["uris"])
+        for addition in progress["additions"]
+    ] == [
+        ("abc456", ["spotify:track:5mqceEgI5vhogd5pOAlwUO"]),
+        ("week", week_uris[2:]),
+    ]
+
+    # When
+    _skip_retry_wait(job)
+    spotify_client.add_songs_to_playlist_in_chunks.reset_mock()
+    spotify_client.add_songs_to_playlist_in_chunks.side_effect = (
+        lambda playlist_id, uris, *args, **kwargs: PlaylistWrite(added=len(uris))
+    )
+    done = run_due_playlist_additions(override_session, spotify_client)
+    override_session.expire_all()
+
+    # Then
+    assert done == 1
+    assert sorted(
+        (call.args[0], call.args[1], call.kwargs["start"])
+        for call in spotify_client.add_songs_to_playlist_in_chunks.call_args_list
+    ) == [
+        ("abc456", ["spotify:track:5mqceEgI5vhogd5pOAlwUO"], 0),
+        ("week", week_uris[2:], 0),
+    ]
+    assert job.status == "done"
+
+
+def test_playlist_addition_job_that_raises_is_retried(
+    client, current_week_new_week_new_results
+):
+    # Given
+    spotify_client = override_get_spotify_client()
+    spotify_client.add_songs_to_playlist_in_chunks.side_effect = (
+        lambda playlist_id, uris, *args, **kwargs: PlaylistWrite(
+            added=0, error=Exception("Spotify API Error")
+        )
+    )
+    client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    run_due_rollovers(override_session, spotify_client)
+    job = crud.job.get_active_job_for_sotw(
+        session=override_session, sotw_id=1, job_type=PLAYLIST_ADD
+    )
+    _skip_retry_wait(job)
+
+    # When
+    with patch(
+        "app.core.scheduler.add_songs_to_playlists",
+        side_effect=Exception("Database Error"),
+    ):
+        done = run_due_playlist_additions(override_session, spotify_client)
+    override_session.expire_all()
+
+    # Then
+    # the job is released to be retried instead of being left running
+    assert done == 0
+    assert job.status == "pending"
+    assert job.attempts == 1
+    assert job.last_error == "Database Error"
+
+
+def test_rollover_retry_reuses_weekly_playlist(
+    client, current_week_new_week_new_results
+):
+    # Given
+    spotify_client = override_get_spotify_client()
+    spotify_client.create_playlist.side_effect = [
+        {"id": "week", "external_urls": {"spotify": "www.example.com"}}
+    ]
+    client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    with patch(
+        "app.core.rollover.create_results", side_effect=Exception("Database Error")
+    ):
+        assert run_due_rollovers(override_session, spotify_client) == 0
+    job = crud.job.get_active_job_for_sotw(
+        session=override_session, sotw_id=1, job_type=WEEK_ROLLOVER
+    )
+    _skip_retry_wait(job)
+    week_uris = {
+        call.args[0]: call.args[1]
+        for call in spotify_client.add_songs_to_playlist_in_chunks.call_args_list
+    }["week"]
+    spotify_client.add_songs_to_playlist_in_chunks.reset_mock()
+
+    # When
+    rolled_over = run_due_rollovers(override_session, spotify_client)
+    override_session.expire_all()
+    current_week = crud.week.get_current_week(session=override_session, sotw_id=1)
+
+    # Then
+    assert rolled_over == 1
+    # the weekly playlist is not created again and no song is added twice
+    assert spotify_client.create_playlist.call_count == 1
+    spotify_client.add_songs_to_playlist_in_chunks.assert_not_called()
+    assert current_week.playlist_link == "www.example.com"
+    # the new week's survey lists the songs in the order they were added to the playlist
+    survey = json.loads(current_week.survey)
+    assert [
+        "spotify:track:"
+        + crud.song.get(session=override_session, id=int(song["id"])).spotify_id
+        for song in survey["songs"]
+    ] == week_uris
+
+
+def test_rollover_stops_once_claimed_by_another_worker(
+    client, current_week_new_week_new_results
+):
+    # Given
+    client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    job = crud.job.get_active_job_for_sotw(
+        session=override_session, sotw_id=1, job_type=WEEK_ROLLOVER
+    )
+    spotify_client = override_get_spotify_client()
+    leases = []
+
+    def create_playlist_and_stall(*args, **kwargs):
+        # the worker stalls for so long that another worker claims the job
+        with patch.object(cfg, "ROLLOVER_LOCK_TIMEOUT_SECONDS", -1):
+            leases.append(crud.job.claim(session=override_session, job_id=job.id))
+        return {"id": "week", "external_urls": {"spotify": "www.example.com"}}
+
+    spotify_client.create_playlist.side_effect = create_playlist_and_stall
+
+    # When
+    rolled_over = run_due_rollovers(override_session, spotify_client)
+    override_session.expire_all()
+
+    # Then
+    assert rolled_over == 0
+    assert leases[0] is not None
+    spotify_client.add_songs_to_playlist_in_chunks.assert_not_called()
+    assert job.status == "running"
+    assert job.lease == leases[0]
+    assert len(crud.week.get_all_weeks_in_sotw(session=override_session, sotw_id=1)) == 2
+
+
+@patch.object(cfg, "ROLLOVER_MAX_ATTEMPTS", 2)
+def test_rollover_fails_after_max_attempts(client, current_week_new_week_new_results):
+    # Given
+    spotify_client = override_get_spotify_client()
+    spotify_client.create_playlist.side_effect = Exception("Spotify API Error")
+    client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    run_due_rollovers(override_session, spotify_client)
+    job = crud.job.get_active_job_for_sotw(
+        session=override_session, sotw_id=1, job_type=WEEK_ROLLOVER
+    )
+    assert job.status == "pending"
+    _skip_retry_wait(job)
+
+    # When
+    rolled_over = run_due_rollovers(override_session, spotify_client)
+    client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    override_session.expire_all()
+    jobs = override_session.query(crud.job.model).all()
+
+    # Then
+    assert rolled_over == 0
+    # requesting the week again does not schedule another attempt
+    assert len(jobs) == 1
+    assert jobs[0].status == "failed"
+    assert jobs[0].attempts == 2
+    assert jobs[0].last_error == "Spotify API Error"
+
+
+def test_get_current_week_reports_failed_rollover(
+    client, current_week_new_week_new_results
+):
+    # Given
+    spotify_client = override_get_spotify_client()
+    spotify_client.create_playlist.side_effect = Exception("Spotify API Error")
+    client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    for _ in range(cfg.ROLLOVER_MAX_ATTEMPTS):
+        run_due_rollovers(override_session, spotify_client)
+        job = crud.job.get_latest_job_for_sotw(
+            session=override_session, sotw_id=1, job_type=WEEK_ROLLOVER
+        )
+        _skip_retry_wait(job)
+    assert job.status == "failed"
+
+    # When
+    response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
+    data = response.json()
+
+    # Then
+    assert data["status"] == 500
+    assert "Spotify API Error" in data["message"]
+    assert "Please ask an admin to retry the rollover." in data["message"]
+
+
 def test_get_current_week_success_week_n_new_week(client, current_week_new_week):
     # When
+    assert kick_off_new_week(client) == 1
+    assert kick_off_new_week(client) == 0
     response = client.get(f"{cfg.API_V1_STR}/week/1/current_week")
     data = response.json()
 
@@ -0,0 +1,131 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import json
+from unittest.mock import patch
+
+import httpx
+
+from app import crud
+from app import schemas
+from app.clients.spotify import AsyncSpotifyClient
+from app.clients.spotify import SpotifyClient
+from app.clients.spotify import spotify_token_cache
+from app.tests.conftest import override_get_current_user
+from app.tests.conftest import override_session
+
+
+URIS = [f"spotify:track:{number}" for number in range(250)]
+
+
+def _link_spotify(accessed_date=None):
+    crud.user.update(
+        session=override_session,
+        db_object=override_get_current_user(),
+        object_in=schemas.UserUpdate(
+            spotify_linked=True,
+            spotify_access_token="token",
+            spotify_refresh_token="refresh",
+            spotify_accessed_date=accessed_date or datetime.now(timezone.utc),
+            spotify_token_expires_in=3600,
+        ),
+    )
+
+
+def _http_client(handler):
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def test_add_songs_to_playlist_in_chunks():
+    # Given
+    _link_spotify()
+    bodies = []
+
+    def handler(request):
+        bodies.append(json.loads(request.content))
+        return httpx.Response(201, json={"snapshot_id": f"snapshot{len(bodies)}"})
+
+    # When
+    with patch.object(SpotifyClient, "http_client", new=_http_client(handler)):
+        write = SpotifyClient("id", "secret").add_songs_to_playlist_in_chunks(
+            "playlist", URIS, override_session, 1, position=10
+        )
+
+    # Then
+    assert write.added == 250
+    assert write.snapshot_id == "snapshot3"
+    assert write.error is None
+    assert [len(body["uris"]) for body in bodies] == [100, 100, 50]
+    assert [body["position"] for body in bodies] == [10, 110, 210]
+    assert [uri for body in bodies for uri in body["uris"]] == URIS
+
+
+def test_add_songs_to_playlist_in_chunks_resumes_after_failure():
+    # Given
+    _link_spotify()
+    bodies = []
+
+    def failing_handler(request):
+        bodies.append(json.loads(request.content))
+        if len(bodies) == 2:
+            return httpx.Response(400, json={"error": "bad request"})
+        return httpx.Response(201, json={"snapshot_id": "snapshot"})
+
+    def handler(request):
+        bodies.append(json.loads(request.content))
+        return httpx.Response(201, json={"snapshot_id": "snapshot"})
+
+    spotify_client = SpotifyClient("id", "secret")
+
+    # When
+    with patch.object(SpotifyClient, "http_client", new=_http_client(failing_handler)):
+        failed = spotify_client.add_songs_to_playlist_in_chunks(
+            "playlist", URIS, override_session, 1
+        )
+    with patch.object(SpotifyClient, "http_client", new=_http_client(handler)):
+        resumed = spotify_client.add_songs_to_playlist_in_chunks(
+            "playlist", URIS, override_session, 1, start=failed.added
+        )
+
+    # Then
+    assert failed.added == 100
+    assert isinstance(failed.error, httpx.HTTPStatusError)
+    assert resumed.added == 250
+    assert resumed.error is None
+    assert "position" not in bodies[0]
+    added = bodies[0]["uris"] + bodies[2]["uris"] + bodies[3]["uris"]
+    assert added == URIS
+
+
+def test_async_get_user_access_token_refreshes_once():
+    # Given
+    _link_spotify(datetime.now(timezone.utc) - timedelta(hours=2))
+    spotify_token_cache.invalidate(1)
+    requested = []
+
+    async def handler(request):
+        requested.append(str(request.url))
+        # keep the refresh in flight while the other requests ask for the token
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"access_token": "new", "expires_in": 3600})
+
+    async def get_tokens():
+        return await asyncio.gather(
+            *[
+                spotify_client.get_user_access_token(override_session, 1)
+                for _ in range(3)
+            ]
+        )
+
+    spotify_client = AsyncSpotifyClient("id", "secret")
+
+    # When
+    with patch.object(
+        AsyncSpotifyClient,
+        "http_client",
+        new=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    ):
+        users = asyncio.run(get_tokens())
+
+    # Then
+    assert requested == ["https://accounts.spotify.com/api/token"]
+    assert [user.spotify_access_token for user in users] == ["new", "new", "new"]
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+from unittest.mock import patch
+
+import httpx
+
+from app.clients.spotify_link import SpotifyLinkResolver
+from app.shared.config import cfg
+
+
+SHORT_LINK = "https://spotify.link/AbCdEf123"
+TRACK_URL = "https://open.spotify.com/track/1auuYcOrua5hrsGCS7idun?si=3ff1ee3bab954296"
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_resolve_follows_redirects_without_reading_bodies():
+    # Given
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(302, headers={"location": TRACK_URL})
+
+    # When
+    track_id = asyncio.run(SpotifyLinkResolver().resolve(SHORT_LINK, _client(handler)))
+
+    # Then
+    assert track_id == "1auuYcOrua5hrsGCS7idun"
+    assert requested == [SHORT_LINK]
+
+
+def test_resolve_reads_landing_page():
+    # Given
+    def handler(request):
+        return httpx.Response(
+            200, html=f'<html><meta property="og:url" content="{TRACK_URL}"></html>'
+        )
+
+    # When
+    track_id = asyncio.run(SpotifyLinkResolver().resolve(SHORT_LINK, _client(handler)))
+
+    # Then
+    assert track_id == "1auuYcOrua5hrsGCS7idun"
+
+
+def test_resolve_not_a_track():
+    # Given
+    def handler(request):
+        return httpx.Response(200, html="<html>not a track</html>")
+
+    # When
+    track_id = asyncio.run(SpotifyLinkResolver().resolve(SHORT_LINK, _client(handler)))
+
+    # Then
+    assert track_id is None
+
+
+def test_resolve_uses_cache():
+    # Given
+    resolver = SpotifyLinkResolver()
+    resolver.set(SHORT_LINK, "cached")
+
+    def handler(request):
+        raise AssertionError("a cached link should not be requested")
+
+    # When
+    track_id = asyncio.run(
+        resolver.resolve(f"{SHORT_LINK}?si=tracking", _client(handler))
+    )
+
+    # Then
+    assert track_id == "cached"
+
+
+def test_resolve_redirect_without_location():
+    # Given
+    def handler(request):
+        return httpx.Response(302)
+
+    # When
+    track_id = asyncio.run(SpotifyLinkResolver().resolve(SHORT_LINK, _client(handler)))
+
+    # Then
+    assert track_id is None
+
+
+def test_resolved_links_are_persisted(tmp_path):
+    # Given
+    path = str(tmp_path / "spotify_links.json")
+    resolver = SpotifyLinkResolver(path)
+    resolver.set(SHORT_LINK, "persisted")
+    assert not os.path.exists(path)
+
+    # When
+    resolver.flush()
+
+    # Then
+    assert SpotifyLinkResolver(path).get(SHORT_LINK) == "persisted"
+    with open(path) as file:
+        assert json.load(file) == {SHORT_LINK: "persisted"}
+
+
+@patch.object(cfg, "SPOTIFY_LINK_FLUSH_INTERVAL_SECONDS", 0)
+def test_resolve_flushes_when_due(tmp_path):
+    # Given
+    path = str(tmp_path / "spotify_links.json")
+
+    def handler(request):
+        return httpx.Response(302, headers={"location": TRACK_URL})
+
+    # When
+    asyncio.run(SpotifyLinkResolver(path).resolve(SHORT_LINK, _client(handler)))
+
+    # Then
+    with open(path) as file:
+        assert json.load(file) == {SHORT_LINK: "1auuYcOrua5hrsGCS7idun"}
+
+
+def test_resolve_does_not_flush_before_due(tmp_path):
+    # Given
+    path = str(tmp_path / "spotify_links.json")
+
+    def handler(request):
+        return httpx.Response(302, headers={"location": TRACK_URL})
+
+    # When
+    asyncio.run(SpotifyLinkResolver(path).resolve(SHORT_LINK, _client(handler)))
+
+    # Then
+    assert not os.path.exists(path)
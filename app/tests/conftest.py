@@ -1,23 +1,37 @@
 from datetime import datetime
 import json
 from typing import Generator
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import StaticPool, create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app import crud
+from app.clients.spotify import PlaylistWrite
+from app.core.auth_cache import token_cache
+from app.core.auth_cache import user_cache
+from app.core.membership import membership_cache
+from app.core.results_cache import results_cache
+from app.core.scheduler import run_due_rollovers
 from app.db.base_class import Base
 from app.main import app
 from app.api import deps
 from app.models.user import User
 from app import schemas
+from app.shared.config import cfg
 from app.shared.utils import get_next_datetime
 
 
+# weeks are rolled over explicitly in tests with `kick_off_new_week`
+cfg.ROLLOVER_SCHEDULER_ENABLED = False
+
+
 TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+TEST_SQLALCHEMY_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 engine = create_engine(
     TEST_SQLALCHEMY_DATABASE_URL,
@@ -26,6 +40,14 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# the async endpoints read the same database file the fixtures write with `override_session`
+async_engine = create_async_engine(
+    TEST_SQLALCHEMY_ASYNC_DATABASE_URL, poolclass=StaticPool
+)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def memory_session():
     try:
@@ -43,13 +65,29 @@ def override_get_session():
     return override_session
 
 
+def override_get_session_factory():
+    return TestingSessionLocal
+
+
+async def override_get_async_session():
+    async with TestingAsyncSessionLocal() as session:
+        yield session
+
+
 def override_get_current_user() -> User:
     return override_session.query(User).filter(User.id == 1).scalar()
 
 
 def override_get_spotify_client() -> MagicMock:
-    mock = MagicMock()
-    mock.get_access_refresh_tokens.return_value = "access", "refresh", "user"
+    return _mock_spotify_client(MagicMock())
+
+
+def override_get_async_spotify_client() -> AsyncMock:
+    return _mock_spotify_client(AsyncMock())
+
+
+def _mock_spotify_client(mock):
+    mock.get_access_refresh_tokens.return_value = "access", "refresh", "user", 3600
     mock.create_playlist.side_effect = [
         {"id": "abc123", "external_urls": {"spotify": "www.example1.com"}},
         {"id": "abc456", "external_urls": {"spotify": "www.example2.com"}},
@@ -58,6 +96,9 @@ def override_get_spotify_client() -> MagicMock:
     ]
     mock.update_playlist_details.return_value = {}
     mock.add_songs_to_playlist.return_value = {}
+    mock.add_songs_to_playlist_in_chunks.side_effect = (
+        lambda playlist_id, uris, *args, **kwargs: PlaylistWrite(added=len(uris))
+    )
     mock.get_track_info.return_value = {
         "album": {
             "album_type": "album",
@@ -506,6 +547,14 @@ def override_get_spotify_client() -> MagicMock:
     return mock
 
 
+def kick_off_new_week(client: TestClient, sotw_id: int = 1) -> int:
+    """
+    Request the current week so a due rollover gets scheduled, then run the scheduler the way the background task would.
+    """
+    client.get(f"{cfg.API_V1_STR}/week/{sotw_id}/current_week")
+    return run_due_rollovers(override_session, override_get_spotify_client())
+
+
 def override_get_email_client() -> MagicMock:
     mock = MagicMock()
     mock.send_verification_email.return_value = {"MessageId": "test-id"}
@@ -516,9 +565,19 @@ def override_get_email_client() -> MagicMock:
 def client() -> Generator:
     with TestClient(app) as client:
         app.dependency_overrides[deps.get_spotify_client] = override_get_spotify_client
+        app.dependency_overrides[deps.get_async_spotify_client] = (
+            override_get_async_spotify_client
+        )
         app.dependency_overrides[deps.get_email_client] = override_get_email_client
         app.dependency_overrides[deps.get_current_user] = override_get_current_user
+        app.dependency_overrides[deps.get_current_user_with_memberships] = (
+            override_get_current_user
+        )
         app.dependency_overrides[deps.get_session] = override_get_session
+        app.dependency_overrides[deps.get_async_session] = override_get_async_session
+        app.dependency_overrides[deps.get_session_factory] = (
+            override_get_session_factory
+        )
         yield client
         app.dependency_overrides = {}
 
@@ -542,7 +601,13 @@ def run_around_tests():
     yield
 
     # After
+    # forget this test's objects so ids reused by the next test don't collide in the identity map
+    override_session.close()
     Base.metadata.drop_all(bind=engine)
+    membership_cache.clear()
+    token_cache.clear()
+    user_cache.clear()
+    results_cache.clear()
 
 
 def _create_song_response(
@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+
+from app import crud
+from app import schemas
+from app.crud.crud_base import get_column_keys
+from app.models.song import Song
+from app.models.user import User
+from app.tests.conftest import override_session
+
+
+def _linked_user():
+    user = crud.user.get(session=override_session, id=1)
+    return crud.user.update(
+        session=override_session,
+        db_object=user,
+        object_in=schemas.UserUpdate(
+            spotify_linked=True,
+            spotify_access_token="access" * 20,
+            spotify_refresh_token="refresh" * 20,
+            spotify_user_id="spotify-user",
+            spotify_accessed_date=datetime.now(timezone.utc),
+            spotify_token_expires_in=3600,
+        ),
+    )
+
+
+def test_get_column_keys():
+    # When
+    column_keys = get_column_keys(User)
+
+    # Then
+    assert "spotify_access_token" in column_keys
+    assert "playlists" not in column_keys
+    assert get_column_keys(User) is column_keys
+
+
+def test_update_only_sets_given_columns():
+    # Given
+    user = _linked_user()
+
+    # When
+    user = crud.user.update(
+        session=override_session,
+        db_object=user,
+        object_in={"name": "renamed", "not_a_column": "ignored"},
+    )
+
+    # Then
+    assert user.name == "renamed"
+    assert user.email == "admin@admin.admin"
+    assert user.spotify_user_id == "spotify-user"
+    assert not hasattr(user, "not_a_column")
+
+
+def test_update_expired_object():
+    # Given
+    user = crud.user.get(session=override_session, id=1)
+    override_session.expire(user)
+
+    # When
+    crud.user.update(
+        session=override_session,
+        db_object=user,
+        object_in=schemas.UserUpdate(name="renamed"),
+    )
+
+    # Then
+    override_session.expire_all()
+    assert crud.user.get(session=override_session, id=1).name == "renamed"
+
+
+def test_create_without_commit():
+    # Given
+    song_in = schemas.SongCreate(
+        spotify_id="spotify-id",
+        spotify_link="https://open.spotify.com/track/spotify-id",
+        name="song - artist",
+        submitter_id=1,
+    )
+
+    # When
+    songs = [
+        crud.song.create(session=override_session, object_in=song_in, commit=False)
+        for _ in range(3)
+    ]
+    override_session.rollback()
+    rolled_back = override_session.query(Song).count()
+    songs = [
+        crud.song.create(session=override_session, object_in=song_in, commit=False)
+        for _ in range(3)
+    ]
+    override_session.commit()
+
+    # Then
+    assert rolled_back == 0
+    assert all(song.id is not None for song in songs)
+    assert all(song.name == "song - artist" for song in songs)
+    assert override_session.query(Song).count() == 3
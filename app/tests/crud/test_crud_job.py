@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from app import crud
+from app import schemas
+from app.crud.crud_job import DONE, RUNNING, WEEK_ROLLOVER
+from app.shared.config import cfg
+from app.tests.conftest import override_session
+
+
+def _schedule(sotw):
+    return crud.job.schedule(
+        session=override_session, sotw_id=sotw.id, job_type=WEEK_ROLLOVER, run_at=0
+    )
+
+
+def test_claim_running_job_only_once_its_lock_is_stale(sotw):
+    # Given
+    job = _schedule(sotw)
+    lease = crud.job.claim(session=override_session, job_id=job.id)
+
+    # When
+    renewed = crud.job.update_claimed(
+        session=override_session,
+        job_id=job.id,
+        lease=lease,
+        object_in=schemas.JobUpdate(),
+    )
+    claimed = crud.job.claim(session=override_session, job_id=job.id)
+
+    # Then
+    assert lease is not None
+    assert renewed
+    assert claimed is None
+
+
+def test_update_claimed_refused_once_claimed_again(sotw):
+    # Given
+    job = _schedule(sotw)
+    stale_lease = crud.job.claim(session=override_session, job_id=job.id)
+    with patch.object(cfg, "ROLLOVER_LOCK_TIMEOUT_SECONDS", -1):
+        lease = crud.job.claim(session=override_session, job_id=job.id)
+
+    # When
+    refused = crud.job.update_claimed(
+        session=override_session,
+        job_id=job.id,
+        lease=stale_lease,
+        object_in=schemas.JobUpdate(status=DONE),
+    )
+    updated = crud.job.update_claimed(
+        session=override_session,
+        job_id=job.id,
+        lease=lease,
+        object_in=schemas.JobUpdate(last_error="still going"),
+    )
+    override_session.refresh(job)
+
+    # Then
+    assert lease not in (None, stale_lease)
+    assert not refused
+    assert updated
+    assert job.status == RUNNING
+    assert job.attempts == 2
+    assert job.last_error == "still going"
+
+
+def test_job_timestamps_are_set_when_written(sotw):
+    # Given
+    started = datetime.now(timezone.utc).replace(tzinfo=None)
+    job = _schedule(sotw)
+    created_at = job.created_at
+
+    # When
+    crud.job.update(
+        session=override_session, db_object=job, object_in={"last_error": "error"}
+    )
+
+    # Then
+    assert created_at.replace(tzinfo=None) >= started
+    assert job.updated_at > created_at
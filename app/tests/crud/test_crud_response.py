@@ -0,0 +1,53 @@
+from app import crud
+from app import schemas
+from app.tests.conftest import override_session
+
+
+def _submit(name, spotify_id, week_id):
+    song = crud.song.create(
+        session=override_session,
+        object_in=schemas.SongCreate(
+            spotify_id=spotify_id,
+            spotify_link=f"https://open.spotify.com/track/{spotify_id}",
+            name=name,
+            submitter_id=1,
+        ),
+    )
+    return crud.response.create(
+        session=override_session,
+        object_in=schemas.ResponseCreate(
+            next_song_id=song.id, sotw_id=1, week_id=week_id, submitter_id=1
+        ),
+    )
+
+
+def _is_repeat(name, spotify_id, week_id="1+1"):
+    return crud.response.is_repeat(
+        session=override_session,
+        sotw_id=1,
+        week_id=week_id,
+        spotify_id=spotify_id,
+        name=name,
+    )
+
+
+def test_create_indexes_song(sotw):
+    # When
+    response = _submit("Beyoncé - Halo", "halo", "1+0")
+
+    # Then
+    assert response.next_song_spotify_id == "halo"
+    assert response.next_song_fingerprint == "beyonce halo"
+
+
+def test_is_repeat(sotw):
+    # Given
+    _submit("Take Me to the River - Talking Heads", "river", "1+0")
+
+    # Then
+    assert _is_repeat("Take Me to the River - Talking Heads", "other")
+    assert _is_repeat("take me to the river  -  TALKING HEADS!", "other")
+    assert _is_repeat("Some Other Name", "river")
+    assert not _is_repeat("Psycho Killer - Talking Heads", "other")
+    # songs submitted in the week being answered are not repeats
+    assert not _is_repeat("Take Me to the River - Talking Heads", "river", "1+0")